@@ -0,0 +1,426 @@
+# ===============================================================
+# 🚨 ALERT ENGINE - PRICE-LEVEL & INDICATOR-THRESHOLD EVALUATION
+# ===============================================================
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+import numpy as np
+import config
+from bar_store import bar_store
+from pyramid_engine import pyramid_engine
+from storage_manager import storage_layer
+
+PRICE_DIRECTIONS = ('above', 'below', 'cross')
+THRESHOLD_OPERATORS = ('>', '>=', '<', '<=')
+
+# ===============================================================
+# 📏 SORTED LEVELS
+# ===============================================================
+class LevelIndex:
+    """Alert ids sorted by level, kept in chunks of at most 2 * CHUNK entries.
+
+    A lookup bisects the chunk maxima, then one chunk; inserts and deletes shift only
+    inside one chunk. pop_range is O(log n + k) plus at most two chunk shifts, so the
+    cost of a crossing does not grow with the number of alerts that were not crossed.
+    """
+    CHUNK = 512
+
+    def __init__(self):
+        self.chunks = []   # (levels, ids) list pairs, each sorted, chunks in level order
+        self.maxes = []    # highest level of each chunk
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def levels(self) -> List[float]:
+        return [level for levels, _ in self.chunks for level in levels]
+
+    @property
+    def ids(self) -> List[int]:
+        return [alert_id for _, ids in self.chunks for alert_id in ids]
+
+    def add(self, level: float, alert_id: int):
+        self.size += 1
+        if not self.chunks:
+            self.chunks.append(([level], [alert_id]))
+            self.maxes.append(level)
+            return
+        chunk = min(bisect_right(self.maxes, level), len(self.chunks) - 1)
+        levels, ids = self.chunks[chunk]
+        position = bisect_right(levels, level)
+        levels.insert(position, level)
+        ids.insert(position, alert_id)
+        self.maxes[chunk] = levels[-1]
+
+        if len(levels) > 2 * self.CHUNK:
+            half = len(levels) // 2
+            self.chunks.insert(chunk + 1, (levels[half:], ids[half:]))
+            self.maxes.insert(chunk + 1, levels[-1])
+            del levels[half:]
+            del ids[half:]
+            self.maxes[chunk] = levels[-1]
+
+    def remove(self, level: float, alert_id: int) -> bool:
+        """Drop one alert - False if it is not indexed here"""
+        chunk = bisect_left(self.maxes, level)
+        while chunk < len(self.chunks):
+            levels, ids = self.chunks[chunk]
+            position = bisect_left(levels, level)
+            while position < len(levels) and levels[position] == level:
+                if ids[position] == alert_id:
+                    del levels[position]
+                    del ids[position]
+                    self.size -= 1
+                    self._settle(chunk, chunk + 1)
+                    return True
+                position += 1
+            if position < len(levels):
+                return False
+            chunk += 1     # equal levels may continue in the next chunk
+        return False
+
+    def pop_range(self, low: float, high: float, include_low: bool, include_high: bool) -> List[int]:
+        """Remove and return the ids with levels between low and high - O(log n + k)"""
+        lower = bisect_left if include_low else bisect_right
+        upper = bisect_right if include_high else bisect_left
+        first = lower(self.maxes, low)
+        last = min(upper(self.maxes, high), len(self.chunks) - 1)
+        popped = []
+        for chunk in range(first, last + 1):
+            levels, ids = self.chunks[chunk]
+            start = lower(levels, low) if chunk == first else 0
+            end = upper(levels, high) if chunk == last else len(levels)
+            if start < end:
+                popped += ids[start:end]
+                del levels[start:end]
+                del ids[start:end]
+        self.size -= len(popped)
+        self._settle(first, last + 1)
+        return popped
+
+    def _settle(self, first: int, end: int):
+        """Refresh the maxima of chunks first..end-1 and drop the emptied ones"""
+        kept = [chunk for chunk in self.chunks[first:end] if chunk[0]]
+        self.chunks[first:end] = kept
+        self.maxes[first:end] = [levels[-1] for levels, _ in kept]
+
+
+# ===============================================================
+# 🚨 ENGINE
+# ===============================================================
+class AlertEngine:
+    """Active alerts held in sorted indexes, evaluated on every price and indicator update.
+
+    Price alerts fire when the price moves through their level between two updates - the
+    base-timeframe highs and lows reached since the previous update count, so a wick that
+    crosses a level and comes back fires it too; only the crossed range of levels is visited. Indicator alerts are sorted by threshold per
+    (symbol, timeframe, indicator, operator), so the alerts whose condition now holds are
+    one bisect away. Alerts are one-shot: a fired alert leaves the index and is stored as
+    triggered.
+    """
+    def __init__(self):
+        self.base_tf = min(config.ALL_TIMEFRAMES, key=lambda tf: config.TIMEFRAME_DURATIONS[tf])
+        self.alerts = {}               # id -> indexed (active) alert
+        self.price_up = {}             # symbol -> LevelIndex, fired by price rising through the level
+        self.price_down = {}           # symbol -> LevelIndex, fired by price falling through the level
+        self.thresholds = {}           # (symbol, timeframe, indicator, operator) -> LevelIndex
+        self.last_price = {}           # symbol -> price at the previous evaluation
+        self.last_bar = {}             # symbol -> (time, high, low) of the forming bar at the previous evaluation
+        self.recent = deque(maxlen=50) # newest triggered alerts
+        self._lock = threading.Lock()
+        self.stats = {'evaluations': 0, 'triggered': 0, 'expired': 0, 'last_eval_us': 0, 'max_eval_us': 0}
+        storage_layer.alert_store.add_compact_listener(self.purge)
+
+        print("🚨 Alert Engine initialized")
+
+    # ===========================================================
+    # 📥 LOADING & MANAGEMENT
+    # ===========================================================
+    def load_active(self) -> int:
+        """Index every active alert from the store"""
+        loaded = 0
+        for alert in storage_layer.alert_store.iter_alerts(status='active'):
+            if alert.get('type') not in ('price', 'indicator'):
+                continue           # plain notices (e.g. migrated from alerts.json) have nothing to watch
+            try:
+                self._index(self._normalize(alert))
+                loaded += 1
+            except ValueError as e:
+                print(f"⚠️ Skipping alert #{alert.get('id')}: {e}")
+        print(f"🚨 {loaded} active alerts indexed")
+        return loaded
+
+    def add_alert(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate, store and index a new alert - raises ValueError on a bad spec"""
+        alert = storage_layer.alert_store.add(self._normalize(spec))
+        self._index(alert)
+        print(f"🔔 Alert #{alert['id']} armed: {alert['message']}")
+        return alert
+
+    def dismiss(self, alert_id: int) -> Dict[str, Any]:
+        """Stop watching an active alert and store it as dismissed.
+
+        Raises KeyError for an unknown id and ValueError if the alert is no longer active.
+        """
+        with self._lock:
+            alert = self.alerts.get(alert_id)
+            if alert is not None:
+                self._unindex(alert)
+        if storage_layer.alert_store.set_status(alert_id, 'dismissed', expected='active'):
+            return {**(alert or {}), 'id': alert_id, 'status': 'dismissed'}
+
+        stored = storage_layer.alert_store.get(alert_id)
+        if stored is None:
+            raise KeyError(alert_id)
+        raise ValueError(f"alert {alert_id} is {stored['status']}, only active alerts can be dismissed")
+
+    def purge(self, alert_ids: List[int]):
+        """Alert store compaction listener - drop deleted (expired) alerts from the indexes"""
+        with self._lock:
+            for alert_id in alert_ids:
+                alert = self.alerts.get(alert_id)
+                if alert is not None:
+                    self._unindex(alert)
+                    self.stats['expired'] += 1
+
+    def _normalize(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Checked, typed copy of an alert spec with a default message"""
+        alert = dict(spec)
+        alert['symbol'] = str(alert.get('symbol') or '').replace('/', '').strip()
+        if not alert['symbol']:
+            raise ValueError("alert needs a symbol")
+
+        if alert.get('expires') not in (None, ''):
+            expires = alert['expires']
+            if isinstance(expires, (int, float)):
+                expires = datetime.fromtimestamp(expires)
+            elif not isinstance(expires, datetime):
+                expires = datetime.fromisoformat(str(expires))
+            alert['expires'] = expires.isoformat()
+
+        kind = alert.get('type')
+        if kind == 'price':
+            alert['level'] = float(alert['level']) if 'level' in alert else None
+            alert['direction'] = alert.get('direction', 'cross')
+            if alert['level'] is None or alert['direction'] not in PRICE_DIRECTIONS:
+                raise ValueError(f"price alert needs a level and a direction in {PRICE_DIRECTIONS}")
+            alert.setdefault('message', f"{alert['symbol']} price {alert['direction']} {alert['level']}")
+        elif kind == 'indicator':
+            alert['indicator'] = str(alert.get('indicator', '')).lower()
+            alert['value'] = float(alert['value']) if 'value' in alert else None
+            if (alert.get('timeframe') not in config.ALL_TIMEFRAMES or not alert['indicator']
+                    or alert.get('operator') not in THRESHOLD_OPERATORS or alert['value'] is None):
+                raise ValueError(f"indicator alert needs a timeframe, an indicator, an operator in "
+                                 f"{THRESHOLD_OPERATORS} and a value")
+            alert.setdefault('message', f"{alert['symbol']} {alert['timeframe']} {alert['indicator']} "
+                                        f"{alert['operator']} {alert['value']}")
+        else:
+            raise ValueError("alert type must be 'price' or 'indicator'")
+        return alert
+
+    def _index(self, alert: Dict[str, Any]):
+        with self._lock:
+            self.alerts[alert['id']] = alert
+            symbol = alert['symbol']
+            if alert['type'] == 'price':
+                if alert['direction'] in ('above', 'cross'):
+                    self.price_up.setdefault(symbol, LevelIndex()).add(alert['level'], alert['id'])
+                if alert['direction'] in ('below', 'cross'):
+                    self.price_down.setdefault(symbol, LevelIndex()).add(alert['level'], alert['id'])
+            else:
+                key = (symbol, alert['timeframe'], alert['indicator'], alert['operator'])
+                self.thresholds.setdefault(key, LevelIndex()).add(alert['value'], alert['id'])
+
+    def _unindex(self, alert: Dict[str, Any]):
+        """Remove an alert from every index it is in - caller holds the lock"""
+        self.alerts.pop(alert['id'], None)
+        if alert['type'] == 'price':
+            for indexes in (self.price_up, self.price_down):
+                if alert['symbol'] in indexes:
+                    indexes[alert['symbol']].remove(alert['level'], alert['id'])
+        else:
+            key = (alert['symbol'], alert['timeframe'], alert['indicator'], alert['operator'])
+            if key in self.thresholds:
+                self.thresholds[key].remove(alert['value'], alert['id'])
+
+    # ===========================================================
+    # ⚡ EVALUATION
+    # ===========================================================
+    def on_update(self, symbol: str, version: int = 0, pyramid_data: Optional[Dict[str, Any]] = None):
+        """Pyramid engine update listener - base-timeframe close and range plus indicator values"""
+        ring = bar_store.get(symbol, self.base_tf)
+        if ring is not None and len(ring):
+            bars = ring.to_frame(('time', 'high', 'low', 'close'))
+            low, high = self._excursion(symbol, bars)
+            self.on_price(symbol, float(bars['close'].iloc[0]), low, high)
+        self.check_indicators(symbol)
+
+    def _excursion(self, symbol: str, bars) -> tuple:
+        """(low, high) reached since the previous evaluation - None where nothing new was reached.
+
+        Of the bar that was forming then only the part of its range added since counts; bars
+        opened after it count whole.
+        """
+        times = bars['time'].values.astype('int64')
+        highs, lows = bars['high'].values, bars['low'].values
+        with self._lock:
+            seen = self.last_bar.get(symbol)
+            self.last_bar[symbol] = (times[0], highs[0], lows[0])
+        if seen is None:
+            return None, None
+
+        seen_time, seen_high, seen_low = seen
+        newer = int(np.count_nonzero(times > seen_time))   # newest first, so these lead the frame
+        low = lows[:newer].min() if newer else None
+        high = highs[:newer].max() if newer else None
+        if newer < len(times) and times[newer] == seen_time:
+            if highs[newer] > seen_high and (high is None or highs[newer] > high):
+                high = highs[newer]
+            if lows[newer] < seen_low and (low is None or lows[newer] < low):
+                low = lows[newer]
+        return (None if low is None else float(low)), (None if high is None else float(high))
+
+    def on_price(self, symbol: str, price: float, low: Optional[float] = None, high: Optional[float] = None):
+        """Fire price alerts whose level lies between the previous price and this one.
+
+        low/high widen the move to the extremes reached in between; the previous price
+        still decides which side a level was approached from.
+        """
+        started = time.perf_counter()
+        fired = []
+        with self._lock:
+            previous = self.last_price.get(symbol)
+            self.last_price[symbol] = price
+            if previous is not None:
+                top = price if high is None else max(price, high)
+                bottom = price if low is None else min(price, low)
+                if top > previous and symbol in self.price_up:
+                    fired += self._take(self.price_up[symbol].pop_range(previous, top, False, True), top)
+                if bottom < previous and symbol in self.price_down:
+                    fired += self._take(self.price_down[symbol].pop_range(bottom, previous, True, False), bottom)
+        self._finish(started, fired)
+
+    def check_indicators(self, symbol: str):
+        """Fire indicator alerts whose condition holds for the latest values"""
+        started = time.perf_counter()
+        with self._lock:
+            keys = [key for key, index in self.thresholds.items() if key[0] == symbol and len(index)]
+        if not keys:
+            return
+
+        values_by_tf = {}
+        for timeframe in {key[1] for key in keys}:
+            values = pyramid_engine.get_live_indicator_values(symbol, timeframe)
+            ring = bar_store.get(symbol, timeframe)
+            if ring is not None and len(ring):
+                values = {**values, 'close': ring.newest('close'), 'tick_volume': ring.newest('tick_volume')}
+            values_by_tf[timeframe] = values
+
+        fired = []
+        with self._lock:
+            for key in keys:
+                value = values_by_tf[key[1]].get(key[2])
+                index = self.thresholds.get(key)
+                if value is None or index is None:
+                    continue
+                operator = key[3]
+                if operator in ('>', '>='):
+                    ids = index.pop_range(float('-inf'), value, True, operator == '>')
+                else:
+                    ids = index.pop_range(value, float('inf'), operator == '<', True)
+                fired += self._take(ids, value)
+        self._finish(started, fired)
+
+    def _take(self, ids: List[int], value: float) -> List[tuple]:
+        """Unindex popped alerts (a cross alert sits in both price indexes) - caller holds the lock"""
+        taken = []
+        for alert_id in ids:
+            alert = self.alerts.get(alert_id)
+            if alert is not None:
+                self._unindex(alert)
+                taken.append((alert, value))
+        return taken
+
+    def _finish(self, started: float, fired: List[tuple]):
+        """Store fired alerts as triggered (or expired) in one transaction, update timing.
+
+        Only alerts still active in the store change - one dismissed after it was popped
+        from the index keeps its dismissal and is not reported as triggered.
+        """
+        if fired:
+            now = datetime.now()
+            changes = []
+            for alert, value in fired:
+                expires = alert.get('expires')
+                if expires and datetime.fromisoformat(str(expires)) < now:
+                    changes.append((alert['id'], 'expired', None))
+                else:
+                    changes.append((alert['id'], 'triggered', {'triggered_at': now.isoformat(), 'trigger_value': value}))
+            try:
+                applied = set(storage_layer.alert_store.set_status_many(changes, expected='active'))
+            except Exception as e:
+                print(f"❌ Error storing triggered alerts: {e}")
+                applied = set()
+
+            triggered = []
+            with self._lock:
+                for (alert, value), (_, status, _) in zip(fired, changes):
+                    if alert['id'] not in applied:
+                        continue
+                    if status == 'expired':
+                        self.stats['expired'] += 1
+                        continue
+                    self.recent.appendleft({**alert, 'status': 'triggered', 'triggered_at': now.isoformat(),
+                                            'trigger_value': value})
+                    self.stats['triggered'] += 1
+                    triggered.append((alert, value))
+            for alert, value in triggered:
+                print(f"🚨 Alert #{alert['id']} triggered: {alert['message']} ({value})")
+
+        elapsed_us = round((time.perf_counter() - started) * 1e6)
+        with self._lock:
+            self.stats['evaluations'] += 1
+            self.stats['last_eval_us'] = elapsed_us
+            self.stats['max_eval_us'] = max(self.stats['max_eval_us'], elapsed_us)
+
+    # ===========================================================
+    # 📊 STATUS
+    # ===========================================================
+    def get_recent(self) -> List[Dict[str, Any]]:
+        """Newest triggered alerts since startup"""
+        with self._lock:
+            return list(self.recent)
+
+    def get_settings(self) -> Dict[str, Any]:
+        """What the engine evaluates - alert kinds, their options and how many of each are armed"""
+        with self._lock:
+            armed_price = sum(1 for alert in self.alerts.values() if alert['type'] == 'price')
+            armed = {'price': armed_price, 'indicator': len(self.alerts) - armed_price}
+        return {
+            'price_alerts': True,
+            'indicator_alerts': True,
+            'price_directions': list(PRICE_DIRECTIONS),
+            'threshold_operators': list(THRESHOLD_OPERATORS),
+            'price_timeframe': self.base_tf,
+            'armed': armed
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Indexed alert counts and evaluation timing"""
+        with self._lock:
+            return {
+                'active': len(self.alerts),
+                'price_levels': sum(len(index) for index in self.price_up.values())
+                                + sum(len(index) for index in self.price_down.values()),
+                'thresholds': sum(len(index) for index in self.thresholds.values()),
+                **self.stats
+            }
+
+# Singleton instance
+alert_engine = AlertEngine()
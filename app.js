@@ -23,6 +23,16 @@ const NORMAL_POLL_INTERVAL = 30000; // 30 seconds during normal mode
 const ACTIVE_POLL_DURATION = 10000; // 10 seconds active window
 let activePollCount = 0;
 const MAX_ACTIVE_POLLS = 5; // Maximum 5 polls during active mode
+// Server-Sent Events push stream - polling only runs while it is down
+let eventSource = null;
+let isStreamConnected = false;
+// Delta pyramid state - flat block records keyed by getBlockId(), children as key lists
+let pyramidVersion = null;
+let pyramidRecords = new Map();
+let pyramidRoots = [];
+// Conditional GET cache - url -> { etag, data } for If-None-Match revalidation
+const etagCache = new Map();
+const ETAG_CACHE_LIMIT = 20;
 // Loading states
 let isLoadingNewPair = false;
 let currentLiveIcon = null;
@@ -153,6 +163,45 @@ function initializeSmartPolling() {
     console.log("🔄 Initializing Smart Polling System...");
     startPolling();
     setupUserActivityListeners();
+    startEventStream();
+}
+// ==================== SERVER-SENT EVENTS ====================
+function startEventStream() {
+    if (!window.EventSource) {
+        console.log("📡 EventSource not supported - staying on polling");
+        return;
+    }
+    if (eventSource) eventSource.close();
+   
+    // EventSource reconnects by itself and resends Last-Event-ID
+    eventSource = new EventSource(`/api/stream?pair=${encodeURIComponent(currentPair)}`);
+   
+    eventSource.onopen = () => {
+        console.log(`📡 Stream connected: ${currentPair}`);
+        isStreamConnected = true;
+        if (pollingInterval) {
+            clearInterval(pollingInterval);
+            pollingInterval = null;
+        }
+        // Catch up on anything missed while disconnected
+        updateDashboard();
+    };
+   
+    eventSource.addEventListener('update', (event) => {
+        // Events carry the delta from the previous version - apply it when we are exactly there
+        const update = JSON.parse(event.data);
+        if (update.delta && pyramidVersion !== null && update.delta.since === pyramidVersion) {
+            applyPyramidPayload(update.delta);
+        } else {
+            updateDashboard();
+        }
+    });
+   
+    eventSource.onerror = () => {
+        if (isStreamConnected) console.log("📡 Stream lost - falling back to polling");
+        isStreamConnected = false;
+        if (!pollingInterval) startPolling();
+    };
 }
 function onUserAction(actionType = 'unknown') {
     console.log(`🎯 User action detected: ${actionType}`);
@@ -163,6 +212,12 @@ function onUserAction(actionType = 'unknown') {
         return;
     }
    
+    // Stream pushes the new pair's data as soon as it is installed
+    if (isStreamConnected) {
+        updateDashboard();
+        return;
+    }
+   
     // Set active polling state
     isActivePollingMode = true;
     activePollCount = 0;
@@ -190,8 +245,12 @@ function startPolling() {
     // Clear existing interval
     if (pollingInterval) {
         clearInterval(pollingInterval);
+        pollingInterval = null;
     }
    
+    // Live stream replaces polling while connected
+    if (isStreamConnected) return;
+   
     // Start new interval based on current mode
     const interval = isActivePollingMode ? ACTIVE_POLL_INTERVAL : NORMAL_POLL_INTERVAL;
     console.log(`📡 Starting ${isActivePollingMode ? 'ACTIVE' : 'NORMAL'} mode polling: ${interval/1000}s interval`);
@@ -539,15 +598,20 @@ function render(data) {
     window.scrollTo(0, scrollPos);
 }
 // UPDATED: Better error handling in updateDashboard
-function updateDashboard() {
-    fetch(`/api/pyramid?pair=${currentPair}&pyramid_style=${currentPyramidStyle}`)
-        .then(response => {
-            if (!response.ok) {
-                throw new Error(`HTTP ${response.status}`);
+function updateDashboard(forceRender = false) {
+    // Ask only for blocks changed since the version we hold (0 = none -> full snapshot)
+    const since = pyramidVersion !== null ? pyramidVersion : 0;
+    fetchWithETag(`/api/pyramid?pair=${currentPair}&pyramid_style=${currentPyramidStyle}&since=${since}`, response => response.json())
+        .then(result => {
+            if (!result.notModified) {
+                applyPyramidPayload(result.data, forceRender);
+            } else if (pyramidVersion === null) {
+                // 304 on a snapshot URL - the cached snapshot is still current
+                applyPyramidPayload(result.data, true);
+            } else if (forceRender) {
+                render(buildPyramidTree());
             }
-            return response.json();
         })
-        .then(render)
         .catch(error => {
             console.error('Dashboard update error:', error);
             if (status) status.textContent = '🔄 Updating market data...';
@@ -563,6 +627,80 @@ function updateDashboard() {
             hideReloadingSign();
         });
 }
+// ==================== PYRAMID DELTA UPDATES ====================
+function applyPyramidPayload(data, forceRender = false) {
+    if (data.mode !== 'delta') {
+        loadPyramidSnapshot(data);
+        render(data);
+        return;
+    }
+    if (data.since !== pyramidVersion) {
+        // Out of sync - start over from a snapshot
+        pyramidVersion = null;
+        updateDashboard(true);
+        return;
+    }
+   
+    const rootsChanged = data.roots.join('|') !== pyramidRoots.join('|');
+    data.removed.forEach(key => pyramidRecords.delete(key));
+    data.upserts.forEach(record => pyramidRecords.set(record.key, record));
+    pyramidRoots = data.roots;
+    pyramidVersion = data.version;
+   
+    if (!forceRender && data.upserts.length === 0 && data.removed.length === 0) return;
+   
+    const tree = buildPyramidTree();
+    if (forceRender || rootsChanged || !patchPyramidRoots(tree, data.upserts)) render(tree);
+}
+function loadPyramidSnapshot(data) {
+    pyramidRecords = new Map();
+    const visit = (block) => {
+        const children = block.children || [];
+        pyramidRecords.set(getBlockId(block), { ...block, children: children.map(getBlockId) });
+        children.forEach(visit);
+    };
+    (data.blocks || []).forEach(visit);
+    pyramidRoots = (data.blocks || []).map(getBlockId);
+    pyramidVersion = data.version !== undefined ? data.version : null;
+}
+function buildPyramidTree() {
+    const build = (key) => {
+        const record = pyramidRecords.get(key);
+        if (!record) return null;
+        return { ...record, children: record.children.map(build).filter(Boolean) };
+    };
+    return { blocks: pyramidRoots.map(build).filter(Boolean) };
+}
+// Replace only the top-level blocks whose subtree changed - false when a full render is needed
+function patchPyramidRoots(tree, upserts) {
+    const parents = new Map();
+    pyramidRecords.forEach((record, key) => record.children.forEach(child => parents.set(child, key)));
+   
+    const dirtyRoots = new Set();
+    upserts.forEach(record => {
+        let key = record.key;
+        while (parents.has(key)) key = parents.get(key);
+        dirtyRoots.add(key);
+    });
+   
+    const elements = new Map();
+    Array.from(pyramidDiv.children).forEach(element => {
+        if (element.dataset.id) elements.set(element.dataset.id, element);
+    });
+   
+    for (const block of tree.blocks) {
+        const blockId = getBlockId(block);
+        if (!dirtyRoots.has(blockId)) continue;
+        const element = elements.get(blockId);
+        const replacement = createBlock(block);
+        if (!element || !replacement) return false;
+        element.replaceWith(replacement);
+    }
+   
+    if (updateInfo) updateInfo.textContent = `Last Updated: ${new Date().toLocaleString()}`;
+    showLiveIcon();
+    return true;
+}
 function changePyramidStyle(style) {
     currentPyramidStyle = style;
    
@@ -575,7 +713,8 @@ function changePyramidStyle(style) {
     if (dropdown) dropdown.value = style;
    
     updateBackendSettings();
-    updateDashboard();
+    // Visibility changed client-side - re-render even if the data did not
+    updateDashboard(true);
 }
 function updateBackendSettings() {
     const settings = {
@@ -608,8 +747,16 @@ function changePair(pair) {
     const pairsSelect = document.getElementById('pairsSelect');
     if (pairsSelect) pairsSelect.value = pair;
    
+    // Resubscribe the push stream to the new pair
+    if (eventSource) startEventStream();
+   
+    // Delta state belongs to the old pair
+    pyramidVersion = null;
+    pyramidRecords = new Map();
+    pyramidRoots = [];
+   
     updateBackendSettings();
-    updateDashboard();
+    updateDashboard(true);
    
     if (currentTimeframe) {
         loadChart(currentTimeframe);
@@ -682,17 +829,23 @@ function loadChart(timeframe = 'H1') {
     chartStatus.textContent = '🔄 Loading...';
    
     const indicatorParams = buildIndicatorParameters();
+    const parseChartResponse = response => {
+        // Errors still come back as JSON
+        if ((response.headers.get('Content-Type') || '').startsWith('application/octet-stream')) {
+            return response.arrayBuffer().then(decodeBinaryChartData);
+        }
+        return response.json();
+    };
    
-    fetch(`/api/chart-data/${timeframe}?pair=${currentPair}&pyramid_style=${currentPyramidStyle}${indicatorParams}`)
-        .then(response => {
-            if (!response.ok) throw new Error(`HTTP ${response.status}`);
-            return response.json();
-        })
-        .then(data => {
+    fetchWithETag(`/api/chart-data/${timeframe}?pair=${currentPair}&pyramid_style=${currentPyramidStyle}&format=binary${indicatorParams}`, parseChartResponse)
+        .then(result => {
+            // A 304 hands back the cached payload - still re-render (chart type or view may have changed)
+            let data = result.data;
             if (data.error) {
                 chartStatus.textContent = `❌ ${data.error}`;
                 return;
             }
+            if (data.format === 'columnar') data = expandColumnarChartData(data);
            
             renderProfessionalChart(data.data, timeframe, currentPair, data.indicators, data.indicators_data);
             chartStatus.textContent = `✅ ${currentPair} ${timeframe}`;
@@ -710,6 +863,96 @@ function loadChart(timeframe = 'H1') {
             chartStatus.textContent = '❌ Failed to load chart data';
         });
 }
+// Fetch with If-None-Match; resolves to { data, notModified } and reuses the cached payload on 304
+function fetchWithETag(url, parse) {
+    const cached = etagCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+   
+    // no-store: revalidation is handled here, not by the browser HTTP cache
+    return fetch(url, { headers: headers, cache: 'no-store' }).then(response => {
+        if (response.status === 304 && cached) return { data: cached.data, notModified: true };
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+       
+        return parse(response).then(data => {
+            const etag = response.headers.get('ETag');
+            etagCache.delete(url);
+            if (etag && !data.error) {
+                etagCache.set(url, { etag: etag, data: data });
+                if (etagCache.size > ETAG_CACHE_LIMIT) etagCache.delete(etagCache.keys().next().value);
+            }
+            return { data: data, notModified: false };
+        });
+    });
+}
+// Columnar payload -> the {x, y} point shape the dataset creators expect
+function expandColumnarChartData(data) {
+    const time = data.time;
+    const cols = data.columns;
+    const chartData = new Array(time.length);
+    for (let i = 0; i < time.length; i++) {
+        chartData[i] = { x: time[i], y: cols.close[i], o: cols.open[i], h: cols.high[i], l: cols.low[i], c: cols.close[i], volume: cols.volume[i] };
+    }
+   
+    const toPoints = (values) => {
+        const points = [];
+        for (let i = 0; i < values.length; i++) {
+            // null (JSON) or NaN (binary) marks a missing value
+            if (values[i] !== null && !Number.isNaN(values[i])) points.push({ x: time[i], y: values[i] });
+        }
+        return points;
+    };
+   
+    const indicators_data = {};
+    Object.entries(data.indicators_data || {}).forEach(([key, value]) => {
+        if (Array.isArray(value) || ArrayBuffer.isView(value)) {
+            indicators_data[key] = toPoints(value);
+        } else if (key === 'bollinger') {
+            indicators_data[key] = { upper: toPoints(value.upper), middle: toPoints(value.middle), lower: toPoints(value.lower) };
+        } else {
+            indicators_data[key] = value;
+        }
+    });
+   
+    return { ...data, data: chartData, indicators_data: indicators_data };
+}
+// Binary payload -> columnar shape: "MFCB", uint32 header length, JSON header, little-endian buffers
+function decodeBinaryChartData(buffer) {
+    const view = new DataView(buffer);
+    const headerLength = view.getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    const dataStart = 8 + headerLength;
+   
+    const arrays = {};
+    header.series.forEach(series => {
+        const offset = dataStart + series.offset;
+        arrays[series.name] = series.dtype === 'int64'
+            ? Float64Array.from(new BigInt64Array(buffer, offset, series.length), Number)
+            : new Float64Array(buffer, offset, series.length);
+    });
+   
+    const indicators_data = {};
+    Object.entries(arrays).forEach(([name, values]) => {
+        if (['time', 'open', 'high', 'low', 'close', 'volume'].includes(name)) return;
+        if (name.startsWith('bollinger.')) {
+            indicators_data.bollinger = indicators_data.bollinger || {};
+            indicators_data.bollinger[name.split('.')[1]] = values;
+        } else {
+            indicators_data[name] = values;
+        }
+    });
+    if (header.support_resistance) indicators_data.support_resistance = header.support_resistance;
+   
+    return {
+        symbol: header.symbol,
+        timeframe: header.timeframe,
+        format: 'columnar',
+        time: arrays.time || [],
+        columns: { open: arrays.open || [], high: arrays.high || [], low: arrays.low || [], close: arrays.close || [], volume: arrays.volume || [] },
+        total_candles: header.count,
+        indicators: header.indicators,
+        indicators_data: indicators_data
+    };
+}
 function buildIndicatorParameters() {
     let params = '';
     activeIndicators.forEach((config, indicatorId) => {
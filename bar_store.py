@@ -0,0 +1,220 @@
+# ===============================================================
+# 🧮 BAR STORE - FIXED-CAPACITY ARRAY RING BUFFERS PER SERIES
+# ===============================================================
+
+import threading
+from typing import Dict, Any, Optional, Iterable
+import numpy as np
+import pandas as pd
+
+# Per-field storage - MT5 rate fields plus a direction code (1 up, -1 down, 0 flat)
+BAR_FIELDS = {
+    'time': np.int64,            # bar open in display time, epoch milliseconds
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'tick_volume': np.int64,
+    'spread': np.int32,
+    'real_volume': np.int64,
+    'dir': np.int8
+}
+
+# DataFrame adapter columns - same as a frame built from MT5 rates
+FRAME_FIELDS = ('time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume')
+
+# ===============================================================
+# 🔁 ONE SERIES
+# ===============================================================
+class BarRing:
+    """Last `capacity` bars of one (symbol, timeframe), oldest first, one array per field.
+
+    New bars go into slack space after the live window; when the slack is used up the
+    window moves to a fresh buffer. The forming bar is written in place, so readers never
+    get the buffers themselves: they share a snapshot copied under the ring lock once per
+    write, which no later write touches. `version` counts writes, so anything derived from
+    the bars can be keyed on it - snapshot() hands out the version its arrays belong to.
+    """
+    def __init__(self, capacity: int, slack: Optional[int] = None):
+        self.capacity = capacity
+        self.slack = slack or max(16, capacity // 4)
+        self.buffers = self._allocate()
+        self.start = 0
+        self.end = 0
+        self.compactions = 0
+        self.version = 0
+        self._snapshot = None        # (version, read-only copies of the live window)
+        self._lock = threading.Lock()
+
+    def _allocate(self) -> Dict[str, np.ndarray]:
+        size = self.capacity + self.slack
+        return {field: np.zeros(size, dtype=dtype) for field, dtype in BAR_FIELDS.items()}
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    # ===========================================================
+    # ✏️ WRITES
+    # ===========================================================
+    def load_rates(self, rates, offset_ms: int):
+        """Replace the series with MT5 rates (any order), keeping the newest `capacity` bars"""
+        rates = np.sort(rates, order='time')[-self.capacity:]
+        buffers = self._allocate()
+        count = len(rates)
+        for field in BAR_FIELDS:
+            if field in rates.dtype.names:
+                buffers[field][:count] = rates[field]
+        buffers['time'][:count] = (rates['time'].astype(np.int64) * 1000) + offset_ms
+        buffers['dir'][:count] = np.sign(buffers['close'][:count] - buffers['open'][:count])
+        with self._lock:
+            self.buffers, self.start, self.end = buffers, 0, count
+            self.version += 1
+
+    def merge_rates(self, rates, offset_ms: int) -> int:
+        """Merge MT5 rates starting at the forming bar - returns the number of new bars"""
+        appended = 0
+        for rate in np.sort(rates, order='time'):
+            bar = {field: rate[field] for field in rates.dtype.names if field in BAR_FIELDS}
+            bar['time'] = int(rate['time']) * 1000 + offset_ms
+            newest = self.newest_time()
+            if newest is not None and bar['time'] == newest:
+                self.update_forming(**bar)
+            elif newest is None or bar['time'] > newest:
+                self._append(bar)
+                appended += 1
+        return appended
+
+    def update_forming(self, **values):
+        """Overwrite fields of the newest bar in place"""
+        with self._lock:
+            if self.end == self.start:
+                return
+            position = self.end - 1
+            for field, value in values.items():
+                self.buffers[field][position] = value
+            self.buffers['dir'][position] = np.sign(self.buffers['close'][position] - self.buffers['open'][position])
+            self.version += 1
+
+    def _append(self, bar: Dict[str, Any]):
+        """Add a bar after the newest one, dropping the oldest past capacity"""
+        with self._lock:
+            if self.end == self.capacity + self.slack:
+                # Slack used up - move the window to a fresh buffer, old views keep theirs
+                keep = self.capacity - 1
+                buffers = self._allocate()
+                for field, buffer in self.buffers.items():
+                    buffers[field][:keep] = buffer[self.end - keep:self.end]
+                self.buffers, self.start, self.end = buffers, 0, keep
+                self.compactions += 1
+
+            position = self.end
+            for field in BAR_FIELDS:
+                self.buffers[field][position] = bar.get(field, 0)
+            self.buffers['dir'][position] = np.sign(self.buffers['close'][position] - self.buffers['open'][position])
+            self.end += 1
+            if self.end - self.start > self.capacity:
+                self.start += 1
+            self.version += 1
+
+    # ===========================================================
+    # 👀 SNAPSHOT READS
+    # ===========================================================
+    def snapshot(self) -> tuple:
+        """(version, read-only oldest-first arrays of every field) as of one write.
+
+        Copied under the lock the first time it is asked for after a write, then shared by
+        every reader until the next write - a reader never sees a half-updated forming bar.
+        """
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self.version:
+                arrays = {}
+                for field, buffer in self.buffers.items():
+                    array = buffer[self.start:self.end].copy()
+                    array.flags.writeable = False
+                    arrays[field] = array
+                self._snapshot = (self.version, arrays)
+            return self._snapshot
+
+    def views(self, fields: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Read-only oldest-first arrays of the live window, from the current snapshot"""
+        arrays = self.snapshot()[1]
+        return {field: arrays[field] for field in fields or BAR_FIELDS}
+
+    def newest_time(self) -> Optional[int]:
+        """Open time (epoch ms) of the forming bar, None when empty"""
+        with self._lock:
+            return int(self.buffers['time'][self.end - 1]) if self.end > self.start else None
+
+    def newest(self, field: str, back: int = 0):
+        """Scalar of the newest bar (back=1 for the one before), None when out of range"""
+        with self._lock:
+            position = self.end - 1 - back
+            return self.buffers[field][position].item() if position >= self.start else None
+
+    def to_frame(self, fields: Iterable[str] = FRAME_FIELDS) -> pd.DataFrame:
+        """Newest-first DataFrame over the reversed snapshot - for code that still wants pandas"""
+        return self.versioned_frame(fields)[1]
+
+    def versioned_frame(self, fields: Iterable[str] = FRAME_FIELDS) -> tuple:
+        """(version, to_frame()) - the version the frame's bars belong to"""
+        version, arrays = self.snapshot()
+        data = {field: arrays[field][::-1] for field in fields}
+        if 'time' in data:
+            data['time'] = data['time'].view('datetime64[ms]')
+        return version, pd.DataFrame(data, copy=False)
+
+
+# ===============================================================
+# 🗄️ STORE
+# ===============================================================
+class BarStore:
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.rings = {}              # (symbol, timeframe) -> BarRing
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, timeframe: str) -> Optional[BarRing]:
+        """Ring for a series, None if it was never loaded"""
+        return self.rings.get((symbol, timeframe))
+
+    def ring(self, symbol: str, timeframe: str) -> BarRing:
+        """Ring for a series, created empty on first use"""
+        with self._lock:
+            ring = self.rings.get((symbol, timeframe))
+            if ring is None:
+                ring = self.rings[(symbol, timeframe)] = BarRing(self.capacity)
+            return ring
+
+    def symbol_rings(self, symbol: str) -> Dict[str, BarRing]:
+        """Loaded rings of one symbol by timeframe"""
+        with self._lock:
+            return {key[1]: ring for key, ring in self.rings.items() if key[0] == symbol and len(ring)}
+
+    def drop(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Forget rings - all, one symbol, or one series"""
+        with self._lock:
+            for key in [k for k in self.rings
+                        if (symbol is None or k[0] == symbol) and (timeframe is None or k[1] == timeframe)]:
+                del self.rings[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ring count, bytes per symbol and compactions"""
+        with self._lock:
+            rings = list(self.rings.items())
+        per_symbol = {}
+        for (symbol, _), ring in rings:
+            per_symbol[symbol] = per_symbol.get(symbol, 0) + ring.nbytes
+        return {
+            'rings': len(rings),
+            'capacity': self.capacity,
+            'bytes': sum(per_symbol.values()),
+            'symbol_bytes': per_symbol,
+            'compactions': sum(ring.compactions for _, ring in rings)
+        }
+
+# Singleton instance
+bar_store = BarStore()
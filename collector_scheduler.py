@@ -0,0 +1,352 @@
+# ===============================================================
+# ⏱️ COLLECTOR SCHEDULER - BAR-CLOSE ALIGNED ASYNCIO REFRESHES
+# ===============================================================
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, List
+import pandas as pd
+
+import config
+from mt5_connector import mt5_connector
+
+class CollectorScheduler:
+    def __init__(self):
+        # Cadence - forming bar polls fast, closed bars are fetched at their boundary
+        self.forming_interval = config.DEFAULT_SETTINGS['fetch_interval']
+        self.tick_interval = 0.25                  # tick polls between bar fetches, 0 turns them off
+        self.tick_publish_interval = 1.0           # tick-only moves rebuild and publish at most this often
+        self.close_jitter = (0.2, 1.0)             # seconds after the boundary, spreads tasks apart
+        self.retry_delays = (1, 2, 4, 8, 15)       # broker may open the new bar late (or not at all)
+        self.offset_refresh = 600                  # re-estimate broker time offset every 10 minutes
+        self.coalesce_window = 0.25                # batch refreshes landing together into one publish
+        self.error_backoff = 60
+        self.base_tf = min(config.ALL_TIMEFRAMES, key=lambda tf: config.TIMEFRAME_DURATIONS[tf])
+
+        # Watchlist - other symbols kept warm on a slower rotation behind the active one
+        self.watchlist = []
+        self.watchlist_interval = 60               # seconds for one pass over the watchlist
+        self.watchlist_refreshed = {}              # symbol -> last refresh timestamp
+        self._watchlist_failed = set()
+
+        # Active symbol - its bars live in the connector's bar store
+        self.symbol = None
+        self._lock = threading.Lock()              # guards fetches and in-place bar edits
+        self._publish_lock = threading.Lock()      # one pyramid build at a time, any symbol
+        self._dirty = None
+        self._ticks_pending = False                # ticks landed since the last publish
+        self._last_publish = 0.0
+        self._symbol_getter = None
+        self._publish = None
+        self._loop = None
+        self._wake = None                          # set to run the forming task before its interval is up
+
+        self.stats = {
+            'boundary_fetches': 0, 'forming_fetches': 0, 'retries': 0,
+            'missed_boundaries': 0, 'publishes': 0, 'watchlist_refreshes': 0, 'tick_updates': 0,
+            'new_bar_latency_ms': {}
+        }
+
+        print("⏱️ Collector Scheduler initialized")
+
+    # ===========================================================
+    # ⚙️ CONFIGURATION
+    # ===========================================================
+    def configure(self, settings: dict):
+        """Apply cadence settings - forming_interval falls back to fetch_interval"""
+        self.forming_interval = settings.get('forming_interval') or settings.get('fetch_interval', self.forming_interval)
+        self.tick_interval = settings.get('tick_interval', self.tick_interval)
+        self.tick_publish_interval = settings.get('tick_publish_interval', self.tick_publish_interval)
+        self.watchlist = self._normalize_watchlist(settings.get('watchlist', []))
+        self.watchlist_interval = settings.get('watchlist_interval', self.watchlist_interval)
+
+    def _normalize_watchlist(self, symbols: List[str]) -> List[str]:
+        """Dashboard pair names ("EUR/USD") to cache symbols, duplicates dropped"""
+        normalized = []
+        for symbol in symbols or []:
+            symbol = str(symbol).replace('/', '').strip()
+            if symbol and symbol not in normalized:
+                normalized.append(symbol)
+        return normalized
+
+    # ===========================================================
+    # 🚀 EVENT LOOP
+    # ===========================================================
+    def run(self, symbol_getter: Callable[[], str], publish: Callable[[str, Dict[str, pd.DataFrame]], Any],
+            stop_event: threading.Event):
+        """Run the scheduler on this thread until stop_event is set"""
+        self._symbol_getter = symbol_getter
+        self._publish = publish
+        asyncio.run(self._main(stop_event))
+
+    async def _main(self, stop_event: threading.Event):
+        """Start one task per timeframe plus the forming, watchlist, offset and publish tasks"""
+        self._dirty = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if not await self._start(stop_event):
+            return
+
+        tasks = [asyncio.create_task(self._bar_close_task(tf)) for tf in config.ALL_TIMEFRAMES]
+        tasks.append(asyncio.create_task(self._forming_task()))
+        if self.tick_interval > 0:
+            tasks.append(asyncio.create_task(self._tick_task()))
+        tasks.append(asyncio.create_task(self._watchlist_task()))
+        tasks.append(asyncio.create_task(self._offset_task()))
+        tasks.append(asyncio.create_task(self._publish_task()))
+
+        await asyncio.to_thread(stop_event.wait)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        print("⏹️ Collector scheduler stopped")
+
+    async def _start(self, stop_event: threading.Event) -> bool:
+        """Seed the active symbol and the broker time offset, retrying every error_backoff.
+
+        False if stop_event was set before the seed succeeded.
+        """
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self._seed, self._symbol_getter())
+                await asyncio.to_thread(mt5_connector.estimate_server_offset, self.symbol)
+                return True
+            except Exception as e:
+                print(f"❌ Collector seed error: {e} - retrying in {self.error_backoff}s")
+                if await asyncio.to_thread(stop_event.wait, self.error_backoff):
+                    break
+        print("⏹️ Collector scheduler stopped")
+        return False
+
+    def _request_publish(self):
+        """Mark frames dirty - the publish task coalesces requests"""
+        self._dirty.set()
+
+    def request_refresh(self):
+        """Run the forming task now - a symbol switch is loaded and published without waiting
+        out forming_interval. Safe from any thread; a no-op until the scheduler runs"""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            loop.call_soon_threadsafe(wake.set)
+
+    # ===========================================================
+    # 🕯️ BAR-CLOSE TASKS
+    # ===========================================================
+    async def _bar_close_task(self, timeframe: str):
+        """Sleep to each bar-close boundary in broker time, then fetch the closed bar"""
+        duration = config.TIMEFRAME_DURATIONS[timeframe] * 60
+        while True:
+            try:
+                server_now = mt5_connector.server_now()
+                boundary = (int(server_now) // duration + 1) * duration
+                await asyncio.sleep(boundary - server_now + random.uniform(*self.close_jitter))
+
+                for delay in (0,) + self.retry_delays:
+                    if delay:
+                        await asyncio.sleep(delay)
+                        self.stats['retries'] += 1
+                    if await asyncio.to_thread(self._refresh_timeframe, timeframe, boundary):
+                        latency = (mt5_connector.server_now() - boundary) * 1000
+                        self.stats['new_bar_latency_ms'][timeframe] = round(latency)
+                        self._request_publish()
+                        break
+                else:
+                    # No new bar - market closed or no ticks since the boundary
+                    self.stats['missed_boundaries'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ {timeframe} refresh error: {e}")
+                await asyncio.sleep(self.error_backoff)
+
+    def _refresh_timeframe(self, timeframe: str, boundary: int) -> bool:
+        """Fetch one timeframe; True once its newest bar opened at or after the boundary"""
+        with self._lock:
+            df = mt5_connector.fetch_timeframe_data(self.symbol, timeframe)
+            self.stats['boundary_fetches'] += 1
+            if df is None or df.empty:
+                return False
+            if timeframe == self.base_tf:
+                mt5_connector.roll_up_forming_bar(self.symbol, timeframe)
+            # Raw MT5 bar time - same server clock as the boundary
+            return mt5_connector.last_bar_time.get((self.symbol, timeframe), 0) >= boundary
+
+    # ===========================================================
+    # 🔥 FORMING BAR TASK
+    # ===========================================================
+    async def _forming_task(self):
+        """Poll the smallest timeframe and roll its forming bar into the higher timeframes"""
+        while True:
+            try:
+                symbol = self._symbol_getter()
+                if symbol != self.symbol:
+                    await asyncio.to_thread(self._seed, symbol)
+                    self._request_publish()
+                elif await asyncio.to_thread(self._refresh_forming, self.base_tf):
+                    self._request_publish()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Forming bar refresh error: {e}")
+                await asyncio.sleep(self.error_backoff)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.forming_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _refresh_forming(self, base_tf: str) -> bool:
+        """Fetch the base timeframe; True if its forming bar changed"""
+        with self._lock:
+            previous = self._forming_signature(base_tf)
+            df = mt5_connector.fetch_timeframe_data(self.symbol, base_tf)
+            self.stats['forming_fetches'] += 1
+            if df is None or df.empty:
+                return False
+            if self._forming_signature(base_tf) == previous:
+                return False
+            mt5_connector.roll_up_forming_bar(self.symbol, base_tf)
+            return True
+
+    def _forming_signature(self, timeframe: str) -> Optional[tuple]:
+        """What a forming-bar change looks like - time, close and tick volume"""
+        ring = mt5_connector.bar_store.get(self.symbol, timeframe)
+        if ring is None or not len(ring):
+            return None
+        return (ring.newest('time'), ring.newest('close'), ring.newest('tick_volume'))
+
+    # ===========================================================
+    # 🧷 TICK TASK
+    # ===========================================================
+    async def _tick_task(self):
+        """Fold new ticks into the forming bars between fetches - published every tick_publish_interval"""
+        while True:
+            try:
+                if await asyncio.to_thread(self._refresh_ticks):
+                    self._ticks_pending = True
+                # Each publish is a full rebuild - tick moves alone don't get one per pass
+                if self._ticks_pending and time.monotonic() - self._last_publish >= self.tick_publish_interval:
+                    self._request_publish()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Tick ingestion error: {e}")
+                await asyncio.sleep(self.error_backoff)
+            await asyncio.sleep(self.tick_interval)
+
+    def _refresh_ticks(self) -> bool:
+        """Apply ticks to the base timeframe's forming bar and roll it up; True if any landed"""
+        with self._lock:
+            if self.symbol is None or not mt5_connector.ingest_ticks(self.symbol, self.base_tf):
+                return False
+            mt5_connector.roll_up_forming_bar(self.symbol, self.base_tf)
+            self.stats['tick_updates'] += 1
+            return True
+
+    def _seed(self, symbol: str):
+        """Load every timeframe for a (new) symbol"""
+        with self._lock:
+            mt5_connector.fetch_all_timeframes(symbol)
+            self.symbol = symbol
+
+    # ===========================================================
+    # 👀 WATCHLIST ROTATION
+    # ===========================================================
+    async def _watchlist_task(self):
+        """Refresh the other watchlist symbols one at a time, spread over watchlist_interval"""
+        while True:
+            symbols = [symbol for symbol in self.watchlist if symbol != self.symbol]
+            if not symbols:
+                await asyncio.sleep(self.watchlist_interval)
+                continue
+
+            pause = self.watchlist_interval / len(symbols)
+            for symbol in symbols:
+                # Became the active symbol meanwhile - the fast tasks own it now
+                if symbol != self.symbol:
+                    try:
+                        await asyncio.to_thread(self._refresh_watchlist_symbol, symbol)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        print(f"❌ Watchlist refresh error for {symbol}: {e}")
+                await asyncio.sleep(pause)
+
+    def _refresh_watchlist_symbol(self, symbol: str):
+        """Fetch every timeframe of a background symbol and publish it"""
+        with self._lock:
+            # Checked again under the lock - a switch may have made it active since
+            if symbol == self.symbol:
+                return
+            raw_data = mt5_connector.fetch_all_timeframes(symbol)
+        if all(df.empty for df in raw_data.values()):
+            if symbol not in self._watchlist_failed:
+                print(f"⚠️ Watchlist symbol {symbol} returned no data - is it available at this broker?")
+                self._watchlist_failed.add(symbol)
+            return
+
+        self._watchlist_failed.discard(symbol)
+        with self._publish_lock:
+            self._publish(symbol, dict(raw_data))
+        self.watchlist_refreshed[symbol] = datetime.now().isoformat()
+        self.stats['watchlist_refreshes'] += 1
+
+    # ===========================================================
+    # 🕐 BROKER TIME & PUBLISHING
+    # ===========================================================
+    async def _offset_task(self):
+        """Keep the broker time offset estimate fresh (DST switches)"""
+        while True:
+            await asyncio.sleep(self.offset_refresh)
+            try:
+                await asyncio.to_thread(mt5_connector.estimate_server_offset, self.symbol)
+            except Exception as e:
+                print(f"⚠️ Server offset estimate failed: {e}")
+
+    async def _publish_task(self):
+        """Rebuild and publish once per burst of refreshes"""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.coalesce_window)
+            self._dirty.clear()
+            try:
+                await asyncio.to_thread(self._publish_frames)
+            except Exception as e:
+                print(f"❌ Update error: {e}")
+
+    def _publish_frames(self):
+        """Hand a consistent set of frames (views over the stored bars) to the publish callback"""
+        with self._lock, self._publish_lock:
+            # These frames carry every tick applied so far
+            self._ticks_pending = False
+            self._last_publish = time.monotonic()
+            frames = mt5_connector.get_frames(self.symbol)
+            if not frames:
+                return
+            self._publish(self.symbol, frames)
+            self.stats['publishes'] += 1
+
+    # ===========================================================
+    # 📊 STATUS
+    # ===========================================================
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler counters and timing"""
+        return {
+            'symbol': self.symbol,
+            'forming_interval': self.forming_interval,
+            'tick_interval': self.tick_interval,
+            'tick_publish_interval': self.tick_publish_interval,
+            'watchlist': list(self.watchlist),
+            'watchlist_refreshed': dict(self.watchlist_refreshed),
+            'watchlist_failed': sorted(self._watchlist_failed),
+            'server_offset': mt5_connector.server_offset,
+            **self.stats,
+            'new_bar_latency_ms': dict(self.stats['new_bar_latency_ms']),
+            'checked_at': datetime.now().isoformat()
+        }
+
+# Singleton instance
+collector_scheduler = CollectorScheduler()
@@ -0,0 +1,280 @@
+# ===============================================================
+# 📡 INDICATOR ENGINE - STREAMING O(1)-PER-BAR INDICATORS
+# ===============================================================
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Any
+import pandas as pd
+
+# Same zero-denominator guard as the batch calculations
+ZERO_GUARD = 0.00001
+
+# ===============================================================
+# 🧱 RUNNING WINDOW PRIMITIVES
+# ===============================================================
+# Each primitive holds state over COMMITTED (closed) bars. value(x) evaluates
+# the indicator with x as the forming bar without changing state; commit(x)
+# folds a closed bar in. Both are O(1) (amortized for min/max).
+
+class RollingMean:
+    """Rolling mean over the last `window` values (min_periods=1)"""
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def value(self, x: float) -> float:
+        return (self.total + x) / (len(self.values) + 1)
+
+    def commit(self, x: float):
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window - 1:
+            self.total -= self.values.popleft()
+
+
+class RollingStd:
+    """Rolling sample standard deviation (ddof=1), 0 where undefined"""
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def value(self, x: float) -> float:
+        count = len(self.values) + 1
+        if count < 2:
+            return 0.0
+        total = self.total + x
+        variance = (self.total_sq + x * x - total * total / count) / (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def commit(self, x: float):
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if len(self.values) > self.window - 1:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+
+class RollingExtreme:
+    """Rolling min or max via a monotonic deque"""
+    def __init__(self, window: int, mode: str):
+        self.window = window
+        self.better = (lambda a, b: a <= b) if mode == 'min' else (lambda a, b: a >= b)
+        self.items = deque()   # (sequence, value), best first
+        self.sequence = 0
+
+    def value(self, x: float) -> float:
+        # Oldest committed value that still shares a window with the forming bar
+        while self.items and self.items[0][0] <= self.sequence - self.window:
+            self.items.popleft()
+        if not self.items or self.better(x, self.items[0][1]):
+            return x
+        return self.items[0][1]
+
+    def commit(self, x: float):
+        while self.items and self.better(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.sequence, x))
+        self.sequence += 1
+
+
+class EMA:
+    """Exponential moving average, adjust=False, seeded with the first value"""
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.current = None
+
+    def value(self, x: float) -> float:
+        if self.current is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self.current
+
+    def commit(self, x: float):
+        self.current = self.value(x)
+
+
+# ===============================================================
+# 📈 PER-SERIES INDICATOR STATE
+# ===============================================================
+class IndicatorState:
+    """Running state of every indicator for one (symbol, timeframe, period set)"""
+    def __init__(self, periods: Dict[str, Any], bar_count: int):
+        # Windows are capped by the history length, like the batch calculation
+        cap = lambda period: max(1, min(period, bar_count))
+
+        self.sma = {p: RollingMean(cap(p)) for p in periods['sma_periods']}
+        self.ema = {p: EMA(cap(p)) for p in periods['ema_periods']}
+        self.macd_fast = EMA(cap(periods['macd_fast']))
+        self.macd_slow = EMA(cap(periods['macd_slow']))
+        self.macd_signal = EMA(cap(periods['macd_signal']))
+        self.rsi_gain = RollingMean(cap(periods['rsi_period']))
+        self.rsi_loss = RollingMean(cap(periods['rsi_period']))
+        self.bb_mean = RollingMean(cap(periods['bb_period']))
+        self.bb_std = RollingStd(cap(periods['bb_period']))
+        self.stoch_low = RollingExtreme(cap(periods['stoch_k']), 'min')
+        self.stoch_high = RollingExtreme(cap(periods['stoch_k']), 'max')
+        self.stoch_d = RollingMean(cap(periods['stoch_d']))
+        self.atr = RollingMean(14)
+
+        self.prev_close = None       # last committed close
+        self.forming_time = None
+        self.forming_bar = None
+        self.values = {}
+
+    def _evaluate(self, bar: tuple, commit: bool) -> Dict[str, float]:
+        """Indicator values with `bar` as the newest bar, optionally folding it in"""
+        high, low, close = bar
+        values = {}
+
+        for period, sma in self.sma.items():
+            values[f'sma_{period}'] = sma.value(close)
+        for period, ema in self.ema.items():
+            values[f'ema_{period}'] = ema.value(close)
+
+        macd = self.macd_fast.value(close) - self.macd_slow.value(close)
+        values['macd'] = macd
+        values['macd_signal'] = self.macd_signal.value(macd)
+        values['macd_histogram'] = macd - values['macd_signal']
+
+        # First bar has no delta - batch treats it as zero gain and loss
+        delta = close - self.prev_close if self.prev_close is not None else 0.0
+        gain = self.rsi_gain.value(max(delta, 0.0))
+        loss = self.rsi_loss.value(max(-delta, 0.0))
+        values['rsi'] = 100 - (100 / (1 + gain / (loss if loss != 0 else ZERO_GUARD)))
+
+        middle = self.bb_mean.value(close)
+        std = self.bb_std.value(close)
+        values['bb_middle'] = middle
+        values['bb_upper'] = middle + std * 2
+        values['bb_lower'] = middle - std * 2
+
+        low_min = self.stoch_low.value(low)
+        high_max = self.stoch_high.value(high)
+        span = high_max - low_min
+        stoch_k = 100 * ((close - low_min) / (span if span != 0 else ZERO_GUARD))
+        values['stoch_%k'] = stoch_k
+        values['stoch_%d'] = self.stoch_d.value(stoch_k)
+
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        values['atr'] = self.atr.value(true_range)
+
+        if commit:
+            for period, sma in self.sma.items():
+                sma.commit(close)
+            for period, ema in self.ema.items():
+                ema.commit(close)
+            self.macd_fast.commit(close)
+            self.macd_slow.commit(close)
+            self.macd_signal.commit(macd)
+            self.rsi_gain.commit(max(delta, 0.0))
+            self.rsi_loss.commit(max(-delta, 0.0))
+            self.bb_mean.commit(close)
+            self.bb_std.commit(close)
+            self.stoch_low.commit(low)
+            self.stoch_high.commit(high)
+            self.stoch_d.commit(stoch_k)
+            self.atr.commit(true_range)
+            self.prev_close = close
+
+        return values
+
+    def close_bar(self, bar: tuple):
+        """Fold a closed bar into the running state"""
+        self._evaluate(bar, commit=True)
+
+    def set_forming(self, bar_time, bar: tuple) -> Dict[str, float]:
+        """Evaluate the forming bar on top of the committed state"""
+        self.forming_time = bar_time
+        self.forming_bar = bar
+        self.values = self._evaluate(bar, commit=False)
+        return self.values
+
+
+# ===============================================================
+# 🧠 INDICATOR ENGINE
+# ===============================================================
+class IndicatorEngine:
+    def __init__(self):
+        self.states = {}             # (symbol, timeframe, periods key) -> IndicatorState
+        self.stats = {'rebuilds': 0, 'closed_bars': 0, 'forming_updates': 0}
+        self._lock = threading.Lock()
+
+        print("📡 Indicator Engine initialized")
+
+    # ===========================================================
+    # 🔄 STATE UPDATES
+    # ===========================================================
+    def update(self, symbol: str, timeframe: str, df: pd.DataFrame, periods: Dict[str, Any],
+               periods_key: tuple) -> Dict[str, float]:
+        """Bring the state for a newest-first bar frame up to date and return latest values.
+
+        O(1) when only the forming bar changed or exactly one bar closed; a gap or
+        any other mismatch rebuilds the state from the frame.
+        """
+        if df.empty or len(df) < 2:
+            return {}
+
+        key = (symbol, timeframe, periods_key)
+        with self._lock:
+            state = self.states.get(key)
+            newest_time = df["time"].iloc[0]
+
+            if state is not None and newest_time == state.forming_time:
+                self.stats['forming_updates'] += 1
+            elif state is not None and df["time"].iloc[1] == state.forming_time:
+                # Previous forming bar closed - commit its final values
+                state.close_bar(self._bar(df, 1))
+                self.stats['closed_bars'] += 1
+            else:
+                state = self._rebuild(df, periods)
+                self.states[key] = state
+                self.stats['rebuilds'] += 1
+                return state.values
+
+            return state.set_forming(newest_time, self._bar(df, 0))
+
+    def _rebuild(self, df: pd.DataFrame, periods: Dict[str, Any]) -> IndicatorState:
+        """Full recompute: replay the frame oldest-first"""
+        state = IndicatorState(periods, len(df))
+        highs = df["high"].to_numpy(dtype=float)[::-1]
+        lows = df["low"].to_numpy(dtype=float)[::-1]
+        closes = df["close"].to_numpy(dtype=float)[::-1]
+
+        for bar in zip(highs[:-1].tolist(), lows[:-1].tolist(), closes[:-1].tolist()):
+            state.close_bar(bar)
+        state.set_forming(df["time"].iloc[0], (float(highs[-1]), float(lows[-1]), float(closes[-1])))
+        return state
+
+    def _bar(self, df: pd.DataFrame, position: int) -> tuple:
+        """(high, low, close) of one row"""
+        return (float(df["high"].iat[position]), float(df["low"].iat[position]), float(df["close"].iat[position]))
+
+    # ===========================================================
+    # 📊 STATE ACCESS
+    # ===========================================================
+    def get_values(self, symbol: str, timeframe: str, periods_key: tuple) -> Dict[str, float]:
+        """Latest values for a series, empty if it was never updated"""
+        state = self.states.get((symbol, timeframe, periods_key))
+        return dict(state.values) if state else {}
+
+    def drop_symbol(self, symbol: str):
+        """Forget all state for a symbol"""
+        with self._lock:
+            for key in [k for k in self.states if k[0] == symbol]:
+                del self.states[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters"""
+        return {'series': len(self.states), **self.stats}
+
+# Singleton instance
+indicator_engine = IndicatorEngine()
@@ -8,14 +8,16 @@ import atexit
 from datetime import datetime
 import signal
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Import our modules
 import config
 from mt5_connector import mt5_connector
 from pyramid_engine import pyramid_engine
 from web_dashboard import web_dashboard
-from storage_manager import storage_layer  # ← ADDED STORAGE
+from storage_manager import storage_layer, snapshot_writer  # ← ADDED STORAGE
+from collector_scheduler import collector_scheduler
+from alert_engine import alert_engine
 
 class MainLauncher:
     def __init__(self):
@@ -94,6 +96,16 @@ class MainLauncher:
             # Configure MT5 connector with settings
             self.pyramid_structure, self.pyramid_style = mt5_connector.configure_from_settings(settings)
             self.symbol = mt5_connector.symbol
+            web_dashboard.configure_server(settings)
+            collector_scheduler.configure(settings)
+            pyramid_engine.configure_symbol_cache(settings.get('symbol_cache_mb', 256))
+            if settings.get('bar_history', True):
+                # Closed bars go to disk (on the writer thread), restarts resume from the last stored bar
+                mt5_connector.history_loader = storage_layer.load_bars
+                mt5_connector.add_bar_listener(storage_layer.bar_writer.submit)
+            if settings.get('mapped_bars', True):
+                # This process is the only writer of the shared mapped bar files
+                mt5_connector.add_bar_listener(storage_layer.append_mapped_bars)
             self.fetch_interval = settings['fetch_interval']
             
             print(f"✅ Auto-configured: {self.symbol}, {self.pyramid_style}, {self.fetch_interval}s interval")
@@ -111,6 +123,12 @@ class MainLauncher:
             pyramid_style=self.pyramid_style,
             utc_offset=mt5_connector.utc_offset
         )
+        # Evicted symbols release their bars in the connector too
+        pyramid_engine.add_eviction_listener(mt5_connector.reset_bar_cache)
+        
+        # Alerts are evaluated on every data install
+        alert_engine.load_active()
+        pyramid_engine.add_update_listener(alert_engine.on_update)
 
     def _initialize_web_dashboard(self):
         """Initialize web dashboard and inject dependencies"""
@@ -131,23 +149,11 @@ class MainLauncher:
                 print("❌ No data fetched")
                 return False
             
-            # Calculate momentum analysis for all timeframes
-            pyramid_data = {}
             for tf in raw_data:
-                if not raw_data[tf].empty:
-                    pyramid_data[tf] = pyramid_engine.calculate_momentum_analysis(raw_data[tf])
-                else:
+                if raw_data[tf].empty:
                     print(f"⚠️  No data for {tf}")
-                    pyramid_data[tf] = raw_data[tf]
-            
-            # Build pyramid JSON (uses only pyramid structure for display)
-            pyramid_json = pyramid_engine.build_pyramid_json(pyramid_data)
-            
-            # Save pyramid data to storage
-            storage_layer.save_pyramid_data(pyramid_json)
             
-            # Update dashboard with ALL data
-            web_dashboard.update_dashboard_data(raw_data, pyramid_json)
+            pyramid_json = self._process_market_data(raw_data)
             
             print(f"✅ Initial data loaded: {len(pyramid_json.get('blocks', []))} blocks, {len(raw_data)} timeframes")
             return True
@@ -156,58 +162,54 @@ class MainLauncher:
             print(f"❌ Initial data loading failed: {e}")
             return False
 
+    def _process_market_data(self, raw_data: Dict, symbol: Optional[str] = None) -> Dict:
+        """Momentum analysis, pyramid build, storage and dashboard update for one symbol's data"""
+        # Calculate momentum analysis for all timeframes
+        pyramid_data = {}
+        for tf in raw_data:
+            if not raw_data[tf].empty:
+                pyramid_data[tf] = pyramid_engine.calculate_momentum_analysis(raw_data[tf])
+            else:
+                pyramid_data[tf] = raw_data[tf]
+        
+        # Build pyramid JSON (uses only pyramid structure for display)
+        pyramid_json = pyramid_engine.build_pyramid_json(pyramid_data, symbol or self.symbol)
+        
+        # Save pyramid data to storage
+        storage_layer.save_pyramid_data(pyramid_json)
+        
+        # Update dashboard with ALL data
+        web_dashboard.update_dashboard_data(raw_data, pyramid_json)
+        return pyramid_json
+
     # ===========================================================
-    # 🔄 MAIN COLLECTOR LOOP - FIXED VERSION
+    # 🔄 MAIN COLLECTOR LOOP - BAR-CLOSE SCHEDULER
     # ===========================================================
     def collector_loop(self):
-        """Main data collection and processing loop - FIXED: Dynamic symbol support"""
+        """Run the bar-close aligned collector until shutdown - symbol changes are picked up live"""
         print(f"\n🚀 Starting MEGA FLOWZ Data Collector...")
         print(f"   Symbol: {self.symbol}")
         print(f"   Pyramid: {self.pyramid_style} → {' → '.join(self.pyramid_structure)}")
         print(f"   All Timeframes: {', '.join(config.ALL_TIMEFRAMES)}")
-        print(f"   Fetch interval: {self.fetch_interval}s")
+        print(f"   Forming bar interval: {collector_scheduler.forming_interval}s, closed bars at bar close")
+        if collector_scheduler.tick_interval > 0:
+            print(f"   Ticks: every {collector_scheduler.tick_interval}s into the forming bars")
+        if collector_scheduler.watchlist:
+            print(f"   Watchlist: {', '.join(collector_scheduler.watchlist)} (every {collector_scheduler.watchlist_interval}s)")
         print(f"   Dashboard URL: http://127.0.0.1:{web_dashboard.dashboard_port}")
         print(f"   Press Ctrl+C to stop\n")
         
         # Open browser after a short delay
         threading.Timer(2, web_dashboard.open_browser).start()
         
-        iteration = 1
-        while not self.stop_event.is_set():
-            # Wait for next cycle
-            time.sleep(self.fetch_interval)
-            if self.stop_event.is_set():
-                break
-                
-            try:
-                # FIXED: Use current symbol dynamically (supports symbol changes)
-                current_symbol = self.symbol
-                raw_data = mt5_connector.fetch_all_timeframes(current_symbol)
-                
-                if raw_data:
-                    # Process data through pyramid engine
-                    pyramid_data = {}
-                    for tf in raw_data:
-                        if not raw_data[tf].empty:
-                            pyramid_data[tf] = pyramid_engine.calculate_momentum_analysis(raw_data[tf])
-                    
-                    # Build pyramid JSON (only shows pyramid structure)
-                    pyramid_json = pyramid_engine.build_pyramid_json(pyramid_data)
-                    
-                    # Save to storage
-                    storage_layer.save_pyramid_data(pyramid_json)
-                    
-                    # Update dashboard with ALL data
-                    web_dashboard.update_dashboard_data(raw_data, pyramid_json)
-                    
-                    print(f"✅ Update #{iteration} @ {datetime.now().strftime('%H:%M:%S')} - {len(pyramid_json.get('blocks', []))} blocks, {len(raw_data)} TFs")
-                    iteration += 1
-                else:
-                    print(f"❌ Update #{iteration} failed - no data")
-                    
-            except Exception as e:
-                print(f"❌ Update error: {e}")
-                time.sleep(60)  # Wait longer on error
+        iteration = [1]
+        def publish(symbol: str, raw_data: Dict):
+            # Active and watchlist symbols alike - each lands in its own cache entry
+            pyramid_json = self._process_market_data(raw_data, symbol)
+            print(f"✅ Update #{iteration[0]} @ {datetime.now().strftime('%H:%M:%S')} - {symbol}: {len(pyramid_json.get('blocks', []))} blocks, {len(raw_data)} TFs")
+            iteration[0] += 1
+        
+        collector_scheduler.run(lambda: self.symbol, publish, self.stop_event)
 
     # ===========================================================
     # 🎮 SYSTEM CONTROL
@@ -252,6 +254,12 @@ class MainLauncher:
         
         self._shutdown_system()
 
+    def switch_symbol(self, symbol: str):
+        """Make symbol the active one - the collector loads and publishes it right away"""
+        self.symbol = symbol
+        collector_scheduler.request_refresh()
+        print(f"🔄 Main launcher symbol updated to: {symbol}")
+
     def _start_health_monitoring(self):
         """Start background health monitoring"""
         def health_monitor():
@@ -280,9 +288,16 @@ class MainLauncher:
         
         # Shutdown MT5
         mt5_connector.safe_shutdown()
+        storage_layer.close_mapped_bars()
+        
+        # Write out snapshots and closed bars still queued
+        snapshot_writer.stop()
+        storage_layer.bar_writer.stop()
+        storage_layer.alert_store.close()
         
-        # Cleanup dashboard
+        # Cleanup dashboard - closes SSE streams first so the server can stop
         web_dashboard.cleanup()
+        web_dashboard.stop_flask_server()
         
         print("✅ System shutdown complete")
         print("👋 MEGA FLOWZ terminated successfully")
@@ -298,6 +313,11 @@ class MainLauncher:
             'pyramid_style': self.pyramid_style,
             'pyramid_structure': self.pyramid_structure,
             'fetch_interval': self.fetch_interval,
+            'scheduler': collector_scheduler.get_stats(),
+            'bar_history': storage_layer.get_bar_history_stats(),
+            'snapshots': snapshot_writer.get_stats(),
+            'alerts': storage_layer.alert_store.get_stats(),
+            'alert_engine': alert_engine.get_stats(),
             'mt5_connected': mt5_connector.connected,
             'dashboard_running': web_dashboard.setup_done,
             'latest_blocks': len(pyramid_engine.latest_pyramid.get('blocks', [])),
@@ -317,6 +337,8 @@ def safe_shutdown():
     """Safe shutdown procedure"""
     try:
         mt5_connector.safe_shutdown()
+        snapshot_writer.stop()
+        storage_layer.bar_writer.stop()
         print("🔌 Safe shutdown completed")
     except:
         pass
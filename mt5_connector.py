@@ -3,11 +3,24 @@
 # ===============================================================
 
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left
+import threading
 import time
 from typing import Dict, List, Optional
 import config
+from bar_store import bar_store
+
+class FetchResult(dict):
+    """Timeframe -> DataFrame mapping that also carries per-timeframe fetch timings"""
+    def __init__(self, data: Dict[str, pd.DataFrame], timings: Dict[str, float], wall_ms: float, mode: str):
+        super().__init__(data)
+        self.timings = timings      # timeframe -> milliseconds
+        self.wall_ms = wall_ms      # whole fetch, wall clock
+        self.mode = mode            # 'parallel' or 'serialized'
 
 class MT5Connector:
     def __init__(self):
@@ -22,6 +35,49 @@ class MT5Connector:
         self.connected = False
         self.available_symbols = []
         
+        # Symbol lookup index - rebuilt whenever available_symbols reloads
+        self._symbol_set = set()
+        self._symbol_keys = []        # sorted upper-case names for prefix search
+        self._symbol_names = []       # broker names aligned with _symbol_keys
+        self._resolved_symbols = {}   # base symbol -> broker symbol
+        
+        # Bars live in array ring buffers per (symbol, timeframe); last raw MT5 bar time per series
+        self.incremental_fetch = True
+        self.bar_count = 200
+        self.bar_store = bar_store
+        self.bar_store.capacity = self.bar_count
+        self.last_bar_time = {}
+        self.fetch_stats = {'full': 0, 'incremental': 0, 'in_place': 0, 'history_loads': 0}
+
+        # On-disk history - loader seeds empty series, listeners receive newly closed bars
+        self.history_loader = None    # (symbol, timeframe, count) -> MT5 rates oldest first, or None
+        self.bar_listeners = []       # (symbol, timeframe, closed rates)
+        
+        # Multi-timeframe fetch - bounded worker pool or serialized for single-client terminals
+        self.fetch_mode = 'parallel'
+        self.fetch_workers = 4
+        self._fetch_pool = None
+        self.last_fetch_timings = {}
+        
+        # Global MT5 call budget - token bucket shared by every caller; background symbols
+        # only spend tokens above the reserve kept for the active symbol
+        self.calls_per_second = 20.0
+        self.background_share = 0.5
+        self._call_tokens = self.calls_per_second
+        self._call_refill_at = time.monotonic()
+        self._call_lock = threading.Lock()
+        self.call_stats = {'calls': 0, 'background_calls': 0, 'waited_ms': 0.0}
+        
+        # Broker clock - server time minus UTC in seconds, estimated from tick times
+        self.server_offset = 0
+        self._rollup_marks = {}       # (symbol, timeframe) -> (source timeframe, time, tick_volume) of the
+                                      # source bar as already counted in that timeframe's forming bar
+        
+        # Tick ingestion - forming bar moved by ticks between bar fetches
+        self.tick_batch = 1000        # ticks per copy_ticks_from call, the rest follow on the next poll
+        self._tick_marks = {}         # (symbol, timeframe) -> time_msc of the newest tick in its forming bar
+        self.tick_stats = {'polls': 0, 'ticks': 0, 'outside_bar': 0, 'crowded_seconds': 0}
+        
         print("🔌 MT5 Connector initialized")
 
     # ===========================================================
@@ -42,12 +98,24 @@ class MT5Connector:
         try:
             symbols = mt5.symbols_get()
             self.available_symbols = [s.name for s in symbols] if symbols else []
+            self._build_symbol_index()
             print(f"📋 Loaded {len(self.available_symbols)} available symbols")
         except Exception as e:
             print(f"❌ Error loading symbols: {e}")
 
+    def _build_symbol_index(self):
+        """Build hash and sorted prefix index over available symbols, reset resolved names"""
+        self._symbol_set = set(self.available_symbols)
+        indexed = sorted((name.upper(), name) for name in self._symbol_set)
+        self._symbol_keys = [key for key, _ in indexed]
+        self._symbol_names = [name for _, name in indexed]
+        self._resolved_symbols = {}
+
     def safe_shutdown(self):
         """Safely shutdown MT5 connection"""
+        if self._fetch_pool:
+            self._fetch_pool.shutdown(wait=False)
+            self._fetch_pool = None
         if self.connected:
             mt5.shutdown()
             self.connected = False
@@ -57,19 +125,28 @@ class MT5Connector:
     # 🎯 SYMBOL MANAGEMENT - FIXED VERSION
     # ===========================================================
     def detect_symbol_suffix(self, base_symbol: str) -> str:
-        """Detect correct symbol suffix for broker"""
+        """Detect correct symbol suffix for broker - memoized per base symbol"""
         # Remove any slashes for MT5 symbol format
         base_symbol = base_symbol.replace('/', '')
         
-        if base_symbol in self.available_symbols:
+        resolved = self._resolved_symbols.get(base_symbol)
+        if resolved is None:
+            resolved = self._resolve_symbol(base_symbol)
+            self._resolved_symbols[base_symbol] = resolved
+        return resolved
+
+    def _resolve_symbol(self, base_symbol: str) -> str:
+        """Resolve base symbol to broker symbol: exact, known suffix, then similar name"""
+        if base_symbol in self._symbol_set:
             return base_symbol
             
         for suffix in config.SYMBOL_SUFFIXES:
             test_symbol = base_symbol + suffix
-            if test_symbol in self.available_symbols:
+            if test_symbol in self._symbol_set:
                 print(f"🔍 Detected symbol: {base_symbol} → {test_symbol}")
                 return test_symbol
                 
+        # One-off scan in broker order, result is memoized by the caller
         for symbol in self.available_symbols:
             if base_symbol in symbol:
                 print(f"🔍 Found similar: {base_symbol} → {symbol}")
@@ -77,6 +154,18 @@ class MT5Connector:
                 
         return base_symbol
 
+    def search_symbols(self, query: str, limit: int = 20) -> List[str]:
+        """Case-insensitive prefix search over broker symbols"""
+        prefix = query.replace('/', '').upper()
+        matches = []
+        position = bisect_left(self._symbol_keys, prefix)
+        while position < len(self._symbol_keys) and len(matches) < limit:
+            if not self._symbol_keys[position].startswith(prefix):
+                break
+            matches.append(self._symbol_names[position])
+            position += 1
+        return matches
+
     def verify_symbol(self, symbol: str) -> bool:
         """Verify symbol exists and is selected in MT5"""
         if not self.connected:
@@ -127,7 +216,14 @@ class MT5Connector:
         for tf in pyramid_structure:
             self.timeframes[tf] = getattr(mt5, f"TIMEFRAME_{tf}")
     
-        self.utc_offset = settings.get('utc_offset', 0)
+        # Cached bar times carry the old offset - drop them if it changes
+        utc_offset = settings.get('utc_offset', 0)
+        if utc_offset != self.utc_offset:
+            self.reset_bar_cache()
+        self.utc_offset = utc_offset
+        self.incremental_fetch = settings.get('incremental_fetch', True)
+        self.configure_fetch_pool(settings.get('fetch_mode', 'parallel'), settings.get('fetch_workers', 4))
+        self.configure_rate_limit(settings.get('mt5_calls_per_second', 20), settings.get('background_call_share', 0.5))
     
         print(f"✅ Auto-configured: {self.symbol}, {pyramid_name}")
         return pyramid_structure, pyramid_name
@@ -136,7 +232,7 @@ class MT5Connector:
     # 📊 DATA FETCHING - UNIVERSAL SYMBOL SUPPORT
     # ===========================================================
     def fetch_timeframe_data(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
-        """Fetch 200 candles for timeframe using the symbol parameter"""
+        """Fetch candles for timeframe - incremental from the last cached bar when possible"""
         if not self.connected:
             print("❌ MT5 not connected")
             return None
@@ -148,44 +244,371 @@ class MT5Connector:
 
         # Use detected symbol for MT5 API calls
         actual_symbol = self.detect_symbol_suffix(symbol)
-        print(f"📥 Fetching {actual_symbol} {timeframe} (200 candles)...")
+        cache_key = (symbol, timeframe)
+
+        # Warm restart - seed from disk so only the gap since the last stored bar is fetched
+        if self.incremental_fetch and cache_key not in self.last_bar_time and self.history_loader:
+            self._load_history(cache_key)
+
+        df = None
+        if self.incremental_fetch and cache_key in self.last_bar_time and self.bar_store.get(symbol, timeframe):
+            df = self._fetch_incremental(cache_key, actual_symbol, mt5_tf)
+        if df is None:
+            df = self._fetch_full(cache_key, actual_symbol, mt5_tf)
+        if df is not None:
+            self._rebase_forming(cache_key, actual_symbol)
+        return df
+
+    def _fetch_full(self, cache_key: tuple, actual_symbol: str, mt5_tf: int) -> Optional[pd.DataFrame]:
+        """Fetch the full candle window and (re)seed the incremental cache"""
+        timeframe = cache_key[1]
+        print(f"📥 Fetching {actual_symbol} {timeframe} ({self.bar_count} candles)...")
 
-        rates = mt5.copy_rates_from_pos(actual_symbol, mt5_tf, 0, 200)
+        self._acquire_call(cache_key[0])
+        rates = mt5.copy_rates_from_pos(actual_symbol, mt5_tf, 0, self.bar_count)
         if rates is None or len(rates) == 0:
             print(f"⚠️ Primary method failed, trying fallback for {actual_symbol}/{timeframe}")
             current_time = datetime.now()
-            rates = mt5.copy_rates_from(actual_symbol, mt5_tf, current_time, 200)
+            self._acquire_call(cache_key[0])
+            rates = mt5.copy_rates_from(actual_symbol, mt5_tf, current_time, self.bar_count)
 
         if rates is None or len(rates) == 0:
             print(f"❌ Failed to fetch data for {actual_symbol}/{timeframe}")
             return None
 
-        df = pd.DataFrame(rates)
-        df["time"] = pd.to_datetime(df["time"], unit='s') + timedelta(hours=self.utc_offset)
-        df = df.sort_values("time", ascending=False).reset_index(drop=True)
-        print(f"✅ Fetched {len(df)} candles for {timeframe}")
-        return df
+        ring = self.bar_store.ring(*cache_key)
+        ring.load_rates(rates, self._offset_ms())
+        self.fetch_stats['full'] += 1
+        self.last_bar_time[cache_key] = int(rates['time'].max())
+        self._notify_closed_bars(cache_key, rates)
+        print(f"✅ Fetched {len(ring)} candles for {timeframe}")
+        return ring.to_frame()
 
-    def fetch_unified_data(self, symbol: str, pyramid_structure: List[str]) -> Dict[str, pd.DataFrame]:
-        """Fetch 200 candles for all timeframes in pyramid structure using symbol parameter"""
-        data = {}
-        for tf_name in pyramid_structure:
-            df = self.fetch_timeframe_data(symbol, tf_name)
-            data[tf_name] = df if df is not None else pd.DataFrame()
+    def _fetch_incremental(self, cache_key: tuple, actual_symbol: str, mt5_tf: int) -> Optional[pd.DataFrame]:
+        """Fetch only bars from the last cached bar on and merge them into the cached series.
+
+        Returns None when a full refetch is needed (no data or a gap wider than the window).
+        """
+        # MT5 bar times are broker server time expressed as epoch seconds
+        date_from = datetime.fromtimestamp(self.last_bar_time[cache_key], tz=timezone.utc)
+        date_to = datetime.now(timezone.utc) + timedelta(days=2)  # Server time can run ahead of UTC
+        self._acquire_call(cache_key[0])
+        rates = mt5.copy_rates_range(actual_symbol, mt5_tf, date_from, date_to)
+
+        if rates is None or len(rates) == 0 or len(rates) >= self.bar_count:
+            return None
+
+        # Forming bar overwritten in place, closed bars appended - the ring drops the oldest
+        ring = self.bar_store.get(*cache_key)
+        appended = ring.merge_rates(rates, self._offset_ms())
+        self.last_bar_time[cache_key] = int(rates['time'].max())
+
+        if appended:
+            self.fetch_stats['incremental'] += 1
+            self._notify_closed_bars(cache_key, rates)
+            print(f"🔁 {actual_symbol} {cache_key[1]}: +{appended} closed bar(s)")
+        else:
+            self.fetch_stats['in_place'] += 1
+        return ring.to_frame()
+
+    def _load_history(self, cache_key: tuple):
+        """Seed an empty series from the history loader - last_bar_time marks where fetching resumes"""
+        try:
+            rates = self.history_loader(cache_key[0], cache_key[1], self.bar_count)
+        except Exception as e:
+            print(f"⚠️ History load failed for {cache_key[0]} {cache_key[1]}: {e}")
+            return
+        if rates is None or len(rates) == 0:
+            return
+
+        self.bar_store.ring(*cache_key).load_rates(rates, self._offset_ms())
+        self.last_bar_time[cache_key] = int(rates['time'].max())
+        self.fetch_stats['history_loads'] += 1
+
+    def add_bar_listener(self, listener):
+        """Register listener(symbol, timeframe, rates) for bars that just closed"""
+        if listener not in self.bar_listeners:
+            self.bar_listeners.append(listener)
+
+    def _notify_closed_bars(self, cache_key: tuple, rates):
+        """Pass fetched rates minus the forming (newest) bar to the bar listeners"""
+        if not self.bar_listeners:
+            return
+        rates = np.sort(rates, order='time')[:-1]
+        if not len(rates):
+            return
+        for listener in self.bar_listeners:
+            try:
+                listener(cache_key[0], cache_key[1], rates)
+            except Exception as e:
+                print(f"⚠️ Bar listener error for {cache_key[0]} {cache_key[1]}: {e}")
+
+    def _rebase_forming(self, cache_key: tuple, actual_symbol: str):
+        """A fetched bar replaced the forming one and counts every tick so far - tick ingestion
+        and roll-ups into this series continue from now instead of adding those ticks again"""
+        if cache_key in self._tick_marks:
+            self._acquire_call(cache_key[0])
+            tick = mt5.symbol_info_tick(actual_symbol)
+            if tick and tick.time_msc:
+                self._tick_marks[cache_key] = int(tick.time_msc)
+            else:
+                self._tick_marks.pop(cache_key, None)
+
+        mark = self._rollup_marks.get(cache_key)
+        source = self.bar_store.get(cache_key[0], mark[0]) if mark else None
+        if source is not None and len(source):
+            self._rollup_marks[cache_key] = (mark[0], source.newest('time'), source.newest('tick_volume'))
+
+    def _offset_ms(self) -> int:
+        """Display offset added to MT5 bar times, in milliseconds"""
+        return int(round(self.utc_offset * 3600 * 1000))
+
+    def get_frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        """Newest-first frames over the stored bars of every loaded timeframe (no fetch)"""
+        rings = self.bar_store.symbol_rings(symbol)
+        return {tf: rings[tf].to_frame() for tf in config.ALL_TIMEFRAMES if tf in rings}
+
+    def reset_bar_cache(self, symbol: Optional[str] = None):
+        """Drop stored bars (all symbols or one)"""
+        self.bar_store.drop(symbol)
+        for key in [k for k in self.last_bar_time if symbol is None or k[0] == symbol]:
+            self.last_bar_time.pop(key, None)
+        for marks in (self._tick_marks, self._rollup_marks):
+            for key in [k for k in marks if symbol is None or k[0] == symbol]:
+                marks.pop(key, None)
+
+    def fetch_unified_data(self, symbol: str, pyramid_structure: List[str]) -> FetchResult:
+        """Fetch candles for all timeframes in pyramid structure using symbol parameter"""
+        return self._fetch_many(symbol, pyramid_structure)
+
+    def fetch_all_timeframes(self, symbol: str) -> FetchResult:
+        """Fetch candles for all timeframes using symbol parameter"""
+        data = self._fetch_many(symbol, config.ALL_TIMEFRAMES)
+        print(f"📊 Fetched all timeframes for {symbol} in {data.wall_ms:.0f}ms ({data.mode})")
         return data
 
-    def fetch_all_timeframes(self, symbol: str) -> Dict[str, pd.DataFrame]:
-        """Fetch 200 candles for all timeframes using symbol parameter"""
-        data = {}
-        for tf_name in config.ALL_TIMEFRAMES:
+    # ===========================================================
+    # ⚡ PARALLEL MULTI-TIMEFRAME FETCH
+    # ===========================================================
+    def configure_fetch_pool(self, fetch_mode: str = 'parallel', fetch_workers: int = 4):
+        """Set fetch mode ('parallel' or 'serialized') and worker pool size"""
+        fetch_mode = fetch_mode if fetch_mode in ('parallel', 'serialized') else 'parallel'
+        fetch_workers = max(1, int(fetch_workers))
+        
+        # Pool is sized at creation - recreate lazily when the size changes
+        if self._fetch_pool and fetch_workers != self.fetch_workers:
+            self._fetch_pool.shutdown(wait=False)
+            self._fetch_pool = None
+        
+        self.fetch_mode = fetch_mode
+        self.fetch_workers = fetch_workers
+
+    def _get_fetch_pool(self) -> ThreadPoolExecutor:
+        """Lazily create the bounded fetch worker pool"""
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="mt5-fetch")
+        return self._fetch_pool
+
+    def _fetch_many(self, symbol: str, timeframes: List[str]) -> FetchResult:
+        """Fetch several timeframes - concurrently unless serialized - timing each one"""
+        timings = {}
+
+        def fetch_one(tf_name: str) -> pd.DataFrame:
+            started = time.perf_counter()
             df = self.fetch_timeframe_data(symbol, tf_name)
-            data[tf_name] = df if df is not None else pd.DataFrame()
-        print(f"📊 Fetched all timeframes for {symbol}")
-        return data
+            timings[tf_name] = round((time.perf_counter() - started) * 1000, 2)
+            return df if df is not None else pd.DataFrame()
+
+        started = time.perf_counter()
+        serialized = self.fetch_mode == 'serialized' or self.fetch_workers == 1 or len(timeframes) < 2
+        if serialized:
+            frames = [fetch_one(tf_name) for tf_name in timeframes]
+        else:
+            frames = list(self._get_fetch_pool().map(fetch_one, timeframes))
+        wall_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        result = FetchResult(dict(zip(timeframes, frames)), timings, wall_ms,
+                             'serialized' if serialized else 'parallel')
+        self.last_fetch_timings = {
+            'symbol': symbol,
+            'mode': result.mode,
+            'wall_ms': wall_ms,
+            'sum_ms': round(sum(timings.values()), 2),
+            'timeframes': timings
+        }
+        return result
+
+    # ===========================================================
+    # 🚦 MT5 CALL BUDGET
+    # ===========================================================
+    def configure_rate_limit(self, calls_per_second: float = 20, background_share: float = 0.5):
+        """Set the global MT5 call rate (0 disables) and the share background symbols may burst into"""
+        with self._call_lock:
+            self.calls_per_second = max(0.0, float(calls_per_second))
+            self.background_share = min(1.0, max(0.0, float(background_share)))
+            self._call_tokens = min(self._call_tokens, self.calls_per_second)
+
+    def _acquire_call(self, symbol: Optional[str] = None):
+        """Block until the budget allows one MT5 call.
+
+        Calls for the active symbol may drain the bucket; other symbols must leave
+        (1 - background_share) of a full bucket untouched so they never delay it.
+        """
+        if self.calls_per_second <= 0:
+            return
+        background = symbol is not None and symbol != self.symbol
+        started = time.monotonic()
+        while True:
+            with self._call_lock:
+                rate = self.calls_per_second
+                reserve = rate * (1 - self.background_share) if background else 0.0
+                now = time.monotonic()
+                self._call_tokens = min(rate, self._call_tokens + (now - self._call_refill_at) * rate)
+                self._call_refill_at = now
+                if self._call_tokens >= min(1 + reserve, rate):
+                    self._call_tokens -= 1
+                    self.call_stats['calls'] += 1
+                    self.call_stats['background_calls'] += background
+                    self.call_stats['waited_ms'] += (now - started) * 1000
+                    return
+                wait = (min(1 + reserve, rate) - self._call_tokens) / rate
+            time.sleep(wait)
+
+    # ===========================================================
+    # 🔥 FORMING BAR ROLL-UP
+    # ===========================================================
+    def roll_up_forming_bar(self, symbol: str, source_tf: str = 'M1') -> List[str]:
+        """Fold the source timeframe's forming bar into the cached forming bars above it.
+
+        Lets one small fetch keep every timeframe's forming bar live; closed bars still
+        come from the broker at their boundary, which also overwrites these estimates.
+        """
+        source = self.bar_store.get(symbol, source_tf)
+        if source is None or not len(source):
+            return []
+
+        bar_time = source.newest('time')
+        volume = source.newest('tick_volume')
+        previous_time = source.newest('time', back=1)
+        previous_volume = source.newest('tick_volume', back=1)
+
+        high, low, close = (source.newest(field) for field in ("high", "low", "close"))
+        updated = []
+        for timeframe, minutes in config.TIMEFRAME_DURATIONS.items():
+            ring = self.bar_store.get(symbol, timeframe)
+            if timeframe == source_tf or ring is None or not len(ring):
+                continue
+            # Source volume added since this series last counted it - each series has its own
+            # mark, since a fetch of that series alone already counts everything before it
+            mark = self._rollup_marks.get((symbol, timeframe))
+            if mark and mark[0] == source_tf and mark[1] == bar_time:
+                volume_delta = volume - mark[2]
+            elif mark and mark[0] == source_tf and previous_time == mark[1]:
+                # Source bar rolled over - count the rest of the closed one plus the new one
+                volume_delta = previous_volume - mark[2] + volume
+            else:
+                volume_delta = 0
+            self._rollup_marks[(symbol, timeframe)] = (source_tf, bar_time, volume)
+
+            start = ring.newest('time')
+            # Source bar belongs to a higher bar we have not fetched yet - leave it to the boundary fetch
+            if not start <= bar_time < start + minutes * 60_000:
+                continue
+            ring.update_forming(high=max(ring.newest('high'), high), low=min(ring.newest('low'), low), close=close,
+                                tick_volume=ring.newest('tick_volume') + max(volume_delta, 0))
+            updated.append(timeframe)
+        return updated
+
+    # ===========================================================
+    # 🧷 TICK INGESTION
+    # ===========================================================
+    def ingest_ticks(self, symbol: str, timeframe: str) -> int:
+        """Fold ticks since the last call into the timeframe's forming bar in place - returns ticks applied.
+
+        Bid ticks only (bars are bid based). The first call just marks the current tick, since
+        the fetched forming bar already counts everything before it. Ticks past the forming
+        bar's end are left to the boundary fetch, which opens the next bar from broker data.
+        """
+        cache_key = (symbol, timeframe)
+        ring = self.bar_store.get(*cache_key)
+        if not self.connected or ring is None or not len(ring):
+            self._tick_marks.pop(cache_key, None)
+            return 0
+
+        actual_symbol = self.detect_symbol_suffix(symbol)
+        mark = self._tick_marks.get(cache_key)
+        self._acquire_call(symbol)
+        self.tick_stats['polls'] += 1
+        if mark is None:
+            tick = mt5.symbol_info_tick(actual_symbol)
+            if tick and tick.time_msc:
+                self._tick_marks[cache_key] = int(tick.time_msc)
+            return 0
+
+        # Tick times are broker server time as epoch, like bar times. copy_ticks_from starts at
+        # a whole second: a full batch that is all at or before the mark means more ticks share
+        # the mark's second than one batch holds. Page by time instead of by count - the whole
+        # second by range (no count cap), then the ticks after it
+        second = mark // 1000
+        date_from = datetime.fromtimestamp(second, tz=timezone.utc)
+        ticks = mt5.copy_ticks_from(actual_symbol, date_from, self.tick_batch, mt5.COPY_TICKS_INFO)
+        if ticks is not None and len(ticks) >= self.tick_batch and ticks['time_msc'].max() <= mark:
+            self.tick_stats['crowded_seconds'] += 1
+            next_second = datetime.fromtimestamp(second + 1, tz=timezone.utc)
+            self._acquire_call(symbol)
+            ticks = mt5.copy_ticks_range(actual_symbol, date_from, next_second, mt5.COPY_TICKS_INFO)
+            if ticks is not None and not (ticks['time_msc'] > mark).any():
+                self._acquire_call(symbol)
+                ticks = mt5.copy_ticks_from(actual_symbol, next_second, self.tick_batch, mt5.COPY_TICKS_INFO)
+        if ticks is None or len(ticks) == 0:
+            return 0
+        ticks = ticks[ticks['time_msc'] > mark]
+        if not len(ticks):
+            return 0
+        self._tick_marks[cache_key] = int(ticks['time_msc'].max())
+
+        start = ring.newest('time')
+        end = start + config.TIMEFRAME_DURATIONS[timeframe] * 60_000
+        tick_times = ticks['time_msc'].astype(np.int64) + self._offset_ms()
+        inside = (tick_times >= start) & (tick_times < end) & (ticks['bid'] > 0)
+        self.tick_stats['outside_bar'] += int(len(ticks) - inside.sum())
+        bids = ticks['bid'][inside]
+        if not len(bids):
+            return 0
+
+        ring.update_forming(high=max(ring.newest('high'), float(bids.max())),
+                            low=min(ring.newest('low'), float(bids.min())),
+                            close=float(bids[-1]),
+                            tick_volume=ring.newest('tick_volume') + len(bids))
+        self.tick_stats['ticks'] += len(bids)
+        return len(bids)
 
     # ===========================================================
     # 📈 REAL-TIME DATA
     # ===========================================================
+    def estimate_server_offset(self, symbol: str) -> int:
+        """Estimate broker server time minus UTC from the last tick, in seconds.
+
+        Rounded to 15 minutes; a stale tick (market closed) keeps the previous estimate.
+        """
+        if not self.connected or not symbol:
+            return self.server_offset
+        self._acquire_call(symbol)
+        tick = mt5.symbol_info_tick(self.detect_symbol_suffix(symbol))
+        if not tick or not tick.time:
+            return self.server_offset
+        raw = tick.time - time.time()
+        rounded = int(round(raw / 900) * 900)
+        if abs(raw - rounded) <= 120:
+            if rounded != self.server_offset:
+                print(f"🕐 Broker server offset: {rounded / 3600:+.2f}h")
+            self.server_offset = rounded
+        return self.server_offset
+
+    def server_now(self) -> float:
+        """Current broker server time as epoch seconds (same clock as bar times)"""
+        return time.time() + self.server_offset
+
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Get current bid price for any symbol"""
         if not self.connected:
@@ -222,6 +645,16 @@ class MT5Connector:
             'connected': self.connected,
             'symbols_loaded': len(self.available_symbols),
             'current_symbol': self.symbol,
+            'incremental_fetch': self.incremental_fetch,
+            'fetch_stats': dict(self.fetch_stats),
+            'fetch_mode': self.fetch_mode,
+            'fetch_workers': self.fetch_workers,
+            'last_fetch_timings': self.last_fetch_timings,
+            'server_offset': self.server_offset,
+            'tick_stats': dict(self.tick_stats),
+            'bar_store': self.bar_store.get_stats(),
+            'calls_per_second': self.calls_per_second,
+            'call_stats': {**self.call_stats, 'waited_ms': round(self.call_stats['waited_ms'], 1)},
             'last_check': datetime.now().isoformat()
         }
 
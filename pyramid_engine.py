@@ -3,11 +3,181 @@
 # ===============================================================
 
 import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
+import threading
 import json
 import os
+import re
+import struct
 from typing import Dict, List, Any, Optional
 import config
+from indicator_engine import indicator_engine
+from bar_store import bar_store, BarRing
+from storage_manager import snapshot_writer
+
+# Minutes added to a block start for the end of its display range
+RANGE_END_MINUTES = {"M1": 0, "M5": 4, "M15": 14, "H1": 59, "H4": 239}
+
+# Rows from here on (newest first) no longer feed the forming bar into their
+# momentum fields - the 14-bar ATR window plus the close it shifts in from a newer row
+SETTLED_ROW = 15
+
+# Block fields are formatted in vectorized chunks of rows, only where a block gets built
+FIELD_CHUNK_ROWS = 16
+
+# Symbol cache pyramid size estimate - blocks encoded per estimate, plus symbol/style/structure keys
+PYRAMID_SIZE_SAMPLES = 8
+PYRAMID_BASE_BYTES = 256
+
+# Binary chart payload: magic, uint32 header length, JSON header, then 8-byte aligned little-endian buffers
+BINARY_CHART_MAGIC = b"MFCB"
+
+# strftime directives that can be sliced straight out of "YYYY-MM-DDTHH:MM:SS"
+ISO_SLICES = {"%Y": (0, 4), "%m": (5, 7), "%d": (8, 10), "%H": (11, 13), "%M": (14, 16), "%S": (17, 19)}
+
+# ===============================================================
+# 🗃️ SYMBOL CACHE - BYTE-BUDGETED LRU
+# ===============================================================
+class SymbolCache:
+    """Per-symbol pyramid and raw data, least recently used symbols evicted over the byte budget.
+
+    Sizes are estimates: ring buffer bytes (DataFrame memory_usage for plain frames) and the
+    pyramid's block count times the compact JSON size of a few sampled blocks.
+    The active symbol is never evicted, even if it alone exceeds the budget.
+    """
+    def __init__(self, budget_bytes: int, on_evict=None):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()   # symbol -> {'pyramid', 'raw_data', 'pyramid_bytes', 'raw_bytes'}, oldest first
+        self.total_bytes = 0
+        self.active = None
+        self.on_evict = on_evict       # callback(symbol) for state kept outside the cache
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.RLock()
+
+    def get_pyramid(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached pyramid or None - never creates an entry"""
+        return self._get(symbol, 'pyramid')
+
+    def get_raw_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached bar series (rings or frames) or None - never creates an entry"""
+        return self._get(symbol, 'raw_data')
+
+    def _get(self, symbol: str, field: str):
+        with self._lock:
+            entry = self.entries.get(symbol)
+            if entry is None or entry[field] is None:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(symbol)
+            self.stats['hits'] += 1
+            return entry[field]
+
+    def put_pyramid(self, symbol: str, pyramid: Dict[str, Any]):
+        """Store a symbol's pyramid and evict down to the budget"""
+        self._put(symbol, 'pyramid', pyramid, self._pyramid_bytes)
+
+    def put_raw_data(self, symbol: str, raw_data: Dict[str, Any]):
+        """Store a symbol's bar series and evict down to the budget"""
+        self._put(symbol, 'raw_data', raw_data, self._raw_bytes)
+
+    def _put(self, symbol: str, field: str, value, measure):
+        with self._lock:
+            entry = self.entries.setdefault(symbol, {'pyramid': None, 'raw_data': None, 'pyramid_bytes': 0, 'raw_bytes': 0})
+            self.entries.move_to_end(symbol)
+            size_field = 'pyramid_bytes' if field == 'pyramid' else 'raw_bytes'
+            # Same object stored again (save after update) - size unchanged
+            if entry[field] is not value:
+                size = measure(value)
+                self.total_bytes += size - entry[size_field]
+                entry[field] = value
+                entry[size_field] = size
+            evicted = self._evict()
+
+        for evicted_symbol in evicted:
+            if self.on_evict:
+                self.on_evict(evicted_symbol)
+
+    def _evict(self) -> List[str]:
+        """Drop least recently used symbols until under budget - caller holds the lock"""
+        evicted = []
+        for symbol in list(self.entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if symbol == self.active:
+                continue
+            self._remove(symbol)
+            self.stats['evictions'] += 1
+            evicted.append(symbol)
+        if evicted:
+            print(f"🗃️ Symbol cache evicted {', '.join(evicted)} ({self.total_bytes / 1e6:.1f}MB used)")
+        return evicted
+
+    def _remove(self, symbol: str):
+        entry = self.entries.pop(symbol, None)
+        if entry:
+            self.total_bytes -= entry['pyramid_bytes'] + entry['raw_bytes']
+
+    def pop(self, symbol: str):
+        """Remove a symbol without calling on_evict"""
+        with self._lock:
+            self._remove(symbol)
+
+    def set_active(self, symbol: str):
+        """Pin the active symbol"""
+        with self._lock:
+            self.active = symbol
+
+    def set_budget(self, budget_bytes: int):
+        """Change the byte budget, evicting immediately if it shrank"""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            evicted = self._evict()
+        for symbol in evicted:
+            if self.on_evict:
+                self.on_evict(symbol)
+
+    def symbols(self) -> List[str]:
+        """Cached symbols, least recently used first"""
+        with self._lock:
+            return list(self.entries)
+
+    def _pyramid_bytes(self, pyramid: Dict[str, Any]) -> int:
+        """Block count times the mean encoded size of the first few blocks - no full dump per put"""
+        count = 0
+        samples = []
+        pending = list(pyramid.get("blocks") or [])
+        while pending:
+            block = pending.pop()
+            count += 1
+            if len(samples) < PYRAMID_SIZE_SAMPLES:
+                samples.append({key: value for key, value in block.items() if key != "children"})
+            pending.extend(block.get("children") or [])
+        if not samples:
+            return PYRAMID_BASE_BYTES
+        sampled = sum(len(json.dumps(sample, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8"))
+                      for sample in samples)
+        return PYRAMID_BASE_BYTES + int(count * (sampled / len(samples) + len(',"children":[]')))
+
+    def _raw_bytes(self, raw_data: Dict[str, Any]) -> int:
+        return int(sum(series.nbytes if isinstance(series, BarRing) else series.memory_usage(index=True, deep=True).sum()
+                       for series in raw_data.values() if isinstance(series, (BarRing, pd.DataFrame))))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Occupancy per symbol and counters"""
+        with self._lock:
+            return {
+                'budget_bytes': self.budget_bytes,
+                'used_bytes': self.total_bytes,
+                'occupancy': round(self.total_bytes / self.budget_bytes, 3) if self.budget_bytes else None,
+                'active': self.active,
+                'symbols': {symbol: entry['pyramid_bytes'] + entry['raw_bytes'] for symbol, entry in self.entries.items()},
+                **self.stats
+            }
+
 
 class PyramidEngine:
     def __init__(self):
@@ -19,9 +189,9 @@ class PyramidEngine:
         self.extract_count = config.DEFAULT_SETTINGS['extract_count']
         self.utc_offset = 0
         
-        # Multi-symbol cache - NEW
-        self.pyramid_cache = {}      # symbol -> pyramid_data
-        self.raw_data_cache = {}     # symbol -> raw_data
+        # Multi-symbol cache - byte-budgeted LRU of pyramid + raw data per symbol
+        self.symbol_cache = SymbolCache(256 * 1024 * 1024, on_evict=self._on_symbol_evicted)
+        self.eviction_listeners = []  # callback(symbol) - e.g. the connector's bar cache holds the same frames
         self.current_symbol = None
         
         # Legacy single-symbol state (for backward compatibility)
@@ -29,6 +199,25 @@ class PyramidEngine:
         self.latest_raw_data = {}
         self.json_filename = "latest_pyramid.json"
         
+        # Settled pyramid blocks reused between builds - symbol -> {(tf, time_ns): (coverage, block)}
+        self.block_cache = {}
+        self.last_build_stats = {'reused': 0, 'built': 0}
+        
+        # Chart indicator results - LRU keyed by (symbol, timeframe, bar version, last bar, periods)
+        self.data_versions = {}      # symbol -> bumped whenever new bars are installed
+        self.indicator_cache = OrderedDict()
+        self.indicator_cache_size = 64
+        self.indicator_cache_stats = {'hits': 0, 'misses': 0}
+        self._indicator_lock = threading.Lock()
+        
+        # Installed pyramids per symbol for delta updates - deque of (version, pyramid, {block key: block})
+        self.pyramid_history = {}
+        self.pyramid_history_size = 16
+        self._history_lock = threading.Lock()
+        
+        # Callbacks fired whenever new data is installed - callback(symbol, version, pyramid_data)
+        self.update_listeners = []
+        
         print("🏗️ Pyramid Engine initialized with multi-symbol cache")
 
     # ===========================================================
@@ -36,63 +225,176 @@ class PyramidEngine:
     # ===========================================================
     def configure_pyramid(self, symbol: str, pyramid_structure: List[str], pyramid_style: str, utc_offset: int):
         """Configure pyramid parameters"""
+        # Cached subtrees hang off the old structure
+        if pyramid_structure != self.pyramid_structure or utc_offset != self.utc_offset:
+            self.block_cache.clear()
         self.symbol = symbol
         self.pyramid_structure = pyramid_structure
         self.pyramid_style = pyramid_style
         self.base_tf = pyramid_structure[0]
         self.utc_offset = utc_offset
         self.current_symbol = symbol
+        self.symbol_cache.set_active(symbol)
         print(f"✅ Pyramid configured: {symbol}, {pyramid_style}")
 
+    def configure_symbol_cache(self, budget_mb: float):
+        """Set the symbol cache byte budget in megabytes"""
+        self.symbol_cache.set_budget(int(budget_mb * 1024 * 1024))
+
     # ===========================================================
     # 🔄 MULTI-SYMBOL CACHE MANAGEMENT - NEW
     # ===========================================================
     def get_pyramid_for_symbol(self, symbol: str) -> Dict[str, Any]:
-        """Get cached pyramid for specific symbol - lazy initialization"""
-        if symbol in self.pyramid_cache:
-            return self.pyramid_cache[symbol]
-        else:
-            # Lazy initialization - create empty pyramid for new symbol
-            print(f"🆕 First request for {symbol}, creating empty pyramid cache")
-            empty_pyramid = self._create_empty_pyramid()
-            empty_pyramid['symbol'] = symbol
-            self.pyramid_cache[symbol] = empty_pyramid
-            return empty_pyramid
+        """Get cached pyramid for specific symbol - empty pyramid (not cached) if unknown"""
+        pyramid = self.symbol_cache.get_pyramid(symbol)
+        if pyramid is not None:
+            return pyramid
+        return self._create_empty_pyramid(symbol)
 
     def get_raw_data_for_symbol(self, symbol: str) -> Dict[str, pd.DataFrame]:
-        """Get cached raw data for specific symbol"""
-        if symbol in self.raw_data_cache:
-            return self.raw_data_cache[symbol]
-        else:
-            # Create empty raw data structure
-            empty_data = {tf: pd.DataFrame() for tf in config.ALL_TIMEFRAMES}
-            self.raw_data_cache[symbol] = empty_data
-            return empty_data
+        """Get cached raw data for specific symbol - empty frames (not cached) if unknown"""
+        series = self.symbol_cache.get_raw_data(symbol)
+        if series is not None:
+            return {tf: bars.to_frame() if isinstance(bars, BarRing) else bars for tf, bars in series.items()}
+        return {tf: pd.DataFrame() for tf in config.ALL_TIMEFRAMES}
+
+    def get_bar_series(self, symbol: str) -> Dict[str, Any]:
+        """Cached bar series per timeframe - rings for snapshot reads, empty if unknown"""
+        return self.symbol_cache.get_raw_data(symbol) or {}
+
+    def has_warm_data(self, symbol: str) -> bool:
+        """True if the symbol has a cached pyramid built with the current structure"""
+        pyramid = self.symbol_cache.get_pyramid(symbol)
+        return bool(pyramid and pyramid.get('blocks') and pyramid.get('structure') == self.pyramid_structure)
 
     def update_symbol_data(self, symbol: str, raw_data: Dict[str, pd.DataFrame], pyramid_data: Dict[str, Any]):
         """Update cache for specific symbol"""
         # Update multi-symbol cache
-        self.pyramid_cache[symbol] = pyramid_data
-        self.raw_data_cache[symbol] = raw_data
+        self.symbol_cache.put_pyramid(symbol, pyramid_data)
+        # Keep the array rings, not the analysed frames - charts read views straight from them
+        self.symbol_cache.put_raw_data(symbol, bar_store.symbol_rings(symbol) or raw_data)
+        self.data_versions[symbol] = self.data_versions.get(symbol, 0) + 1
+        self._record_pyramid_version(symbol, self.data_versions[symbol], pyramid_data)
+        self.invalidate_indicator_cache(symbol)
+        self.update_live_indicators(symbol, raw_data)
         
         # Update current symbol for backward compatibility
         if symbol == self.current_symbol:
             self.latest_pyramid = pyramid_data
             self.latest_raw_data = raw_data
             
-        print(f"💾 Updated cache for {symbol}: {len(pyramid_data.get('blocks', []))} blocks")
+        self._notify_update_listeners(symbol, pyramid_data)
+
+    def add_update_listener(self, callback):
+        """Register a callback(symbol, version, pyramid_data) for every data install"""
+        if callback not in self.update_listeners:
+            self.update_listeners.append(callback)
+
+    def _notify_update_listeners(self, symbol: str, pyramid_data: Dict[str, Any]):
+        """Fire update listeners - a failing listener never breaks the update"""
+        version = self.data_versions.get(symbol, 0)
+        for callback in list(self.update_listeners):
+            try:
+                callback(symbol, version, pyramid_data)
+            except Exception as e:
+                print(f"⚠️ Update listener error: {e}")
 
     def clear_symbol_cache(self, symbol: str):
         """Clear cache for specific symbol"""
-        if symbol in self.pyramid_cache:
-            del self.pyramid_cache[symbol]
-        if symbol in self.raw_data_cache:
-            del self.raw_data_cache[symbol]
+        self.symbol_cache.pop(symbol)
+        self._drop_symbol_state(symbol)
         print(f"🧹 Cleared cache for {symbol}")
 
+    def add_eviction_listener(self, callback):
+        """Register callback(symbol) fired when the symbol cache evicts a symbol"""
+        self.eviction_listeners.append(callback)
+
+    def _on_symbol_evicted(self, symbol: str):
+        """Symbol fell out of the cache - drop everything derived from it"""
+        self._drop_symbol_state(symbol)
+        for callback in self.eviction_listeners:
+            try:
+                callback(symbol)
+            except Exception as e:
+                print(f"⚠️ Eviction listener error: {e}")
+
+    def _drop_symbol_state(self, symbol: str):
+        """Forget derived per-symbol state - block cache, history, indicators"""
+        self.block_cache.pop(symbol, None)
+        with self._history_lock:
+            self.pyramid_history.pop(symbol, None)
+        self.invalidate_indicator_cache(symbol)
+        indicator_engine.drop_symbol(symbol)
+
     def get_cached_symbols(self) -> List[str]:
         """Get list of all symbols with cached data"""
-        return list(self.pyramid_cache.keys())
+        return self.symbol_cache.symbols()
+
+    def get_symbol_cache_stats(self) -> Dict[str, Any]:
+        """Symbol cache budget, occupancy and counters"""
+        return self.symbol_cache.get_stats()
+
+    # ===========================================================
+    # 🔀 PYRAMID DELTA UPDATES
+    # ===========================================================
+    def _record_pyramid_version(self, symbol: str, version: int, pyramid_data: Dict[str, Any]):
+        """Keep a flat block-key view of each installed pyramid so later versions can be diffed"""
+        flat = {}
+        stack = list(pyramid_data.get('blocks', []))
+        while stack:
+            block = stack.pop()
+            flat[self._block_key(block)] = block
+            stack.extend(block.get('children', []))
+        
+        with self._history_lock:
+            history = self.pyramid_history.setdefault(symbol, deque(maxlen=self.pyramid_history_size))
+            history.append((version, pyramid_data, flat))
+
+    def get_pyramid_delta(self, symbol: str, since: int) -> Optional[Dict[str, Any]]:
+        """Blocks added, changed and removed after version `since` - None if it is no longer in history"""
+        with self._history_lock:
+            history = list(self.pyramid_history.get(symbol, ()))
+        if not history:
+            return None
+        
+        version, pyramid, current = history[-1]
+        base = next((flat for v, _, flat in history if v == since), None)
+        if base is None:
+            return None
+        
+        upserts = []
+        for key, block in current.items():
+            previous = base.get(key)
+            # Settled blocks are shared between builds - same object means same subtree
+            if previous is block:
+                continue
+            record = self._block_record(block)
+            if previous is None or record != self._block_record(previous):
+                upserts.append(record)
+        
+        return {
+            "mode": "delta",
+            "symbol": pyramid.get('symbol', symbol),
+            "style": pyramid.get('style'),
+            "structure": pyramid.get('structure'),
+            "generated": pyramid.get('generated'),
+            "version": version,
+            "since": since,
+            "roots": [self._block_key(block) for block in pyramid.get('blocks', [])],
+            "upserts": upserts,
+            "removed": [key for key in base if key not in current]
+        }
+
+    def _block_key(self, block: Dict[str, Any]) -> str:
+        """Block identity across builds - matches getBlockId() in app.js"""
+        return f"{block['tf']}_{block['time']}"
+
+    def _block_record(self, block: Dict[str, Any]) -> Dict[str, Any]:
+        """Block fields with children replaced by their keys"""
+        record = {name: value for name, value in block.items() if name != 'children'}
+        record['key'] = self._block_key(block)
+        record['children'] = [self._block_key(child) for child in block.get('children', [])]
+        return record
 
     # ===========================================================
     # 📊 MOMENTUM & CANDLE ANALYSIS CALCULATIONS
@@ -155,76 +457,109 @@ class PyramidEngine:
         if tf == "D1": 
             return f"[{start}]"
             
-        end_min = {"M1": 0, "M5": 4, "M15": 14, "H1": 59, "H4": 239}.get(tf, 0)
+        end_min = RANGE_END_MINUTES.get(tf, 0)
         end = (t + timedelta(minutes=end_min)).strftime("%H:%M")
         return f"[{start}-{end}]" if tf != "M1" else f"[{start}]"
 
     # ===========================================================
     # 🧩 PYRAMID JSON CONSTRUCTION - ENHANCED WITH VOLUME
     # ===========================================================
-    def build_pyramid_json(self, data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
-        """Build complete pyramid JSON structure with volume"""
+    def build_pyramid_json(self, data: Dict[str, pd.DataFrame], symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Build complete pyramid JSON structure with volume - reuses settled blocks from the last build"""
+        symbol = symbol or self.symbol
         if self.base_tf not in data or data[self.base_tf].empty:
-            return self._create_empty_pyramid()
+            return self._create_empty_pyramid(symbol)
             
         base_df = data[self.base_tf].iloc[:self.extract_count]
-        blocks = []
+        indexes = {self.base_tf: self._index_timeframe(base_df, self.base_tf)}
+        previous_blocks = self.block_cache.get(symbol, {})
+        settled_blocks = {}
+        stats = {'reused': 0, 'built': 0}
+
+        def get_index(tf: str) -> Optional[Dict[str, Any]]:
+            """Per-timeframe index, built once per pyramid"""
+            if tf not in indexes:
+                if tf not in data or data[tf].empty:
+                    indexes[tf] = None
+                else:
+                    indexes[tf] = self._index_timeframe(data[tf], tf)
+            return indexes[tf]
+
+        def settled_coverage(index: Dict[str, Any], pos: int, level: int) -> Optional[tuple]:
+            """Per deeper timeframe: block inside (True) or before (False) its bar window.
+
+            None while the block can still change - fields fed by the forming bar, or a
+            deeper window straddling the block so children drop off as it slides.
+            """
+            if pos < SETTLED_ROW:
+                return None
+                
+            start = index["times"][pos]
+            end = start + index["duration_ns"]
+            coverage = []
+            for tf in self.pyramid_structure[level + 1:]:
+                deeper = get_index(tf)
+                if deeper is None:
+                    return None
+                oldest = deeper["sorted_times"][0]
+                if start < oldest < end:
+                    return None
+                coverage.append(bool(start >= oldest))
+            return tuple(coverage)
 
-        def get_children(parent_time: datetime, parent_tf: str, level: int = 0) -> List[Dict]:
-            """Recursively get child blocks for parent timeframe"""
+        def make_blocks(index: Dict[str, Any], positions, level: int):
+            """Create blocks for rows of one timeframe - returns (blocks, all settled)"""
+            blocks = []
+            all_settled = True
+            for pos in positions:
+                key = (index["tf"], int(index["times"][pos]))
+                coverage = settled_coverage(index, pos, level)
+                cached = previous_blocks.get(key)
+                
+                # Reuse only while the block sees the same deeper windows as when cached
+                if coverage is not None and cached is not None and cached[0] == coverage:
+                    block = cached[1]
+                    settled = True
+                    stats['reused'] += 1
+                else:
+                    children, children_settled = get_children(index, pos, level)
+                    settled = coverage is not None and children_settled
+                    block = {**self._block_fields(index, pos), "children": children}
+                    stats['built'] += 1
+                    
+                # Settled blocks are shared, immutable subtrees in the next build
+                if settled:
+                    settled_blocks[key] = (coverage, block)
+                all_settled = all_settled and settled
+                blocks.append(block)
+            return blocks, all_settled
+
+        def get_children(parent: Dict[str, Any], pos: int, level: int):
+            """Child blocks inside the parent time range via binary search on sorted times"""
             if level + 1 >= len(self.pyramid_structure): 
-                return []
+                return [], True
                 
-            child_tf = self.pyramid_structure[level + 1]
-            if child_tf not in data or data[child_tf].empty:
-                return []
+            child = get_index(self.pyramid_structure[level + 1])
+            if child is None:
+                return [], False
                 
-            df = data[child_tf]
-            start = parent_time
-            end = parent_time + timedelta(minutes=config.TIMEFRAME_DURATIONS[parent_tf])
+            start = parent["times"][pos]
+            end = start + parent["duration_ns"]
+            lo = np.searchsorted(child["sorted_times"], start, side="left")
+            hi = np.searchsorted(child["sorted_times"], end, side="left")
             
-            # Filter children within parent time range
-            children_df = df[(df["time"] >= start) & (df["time"] < end)]
-            children = []
-            
-            for _, row in children_df.iterrows():
-                child_index = df[df["time"] == row["time"]].index[0]
-                child = {
-                    "tf": child_tf,
-                    "time": row["time"].isoformat(),
-                    "range": self.get_time_range(row["time"], child_tf),
-                    "O": round(row["open"], 5),
-                    "H": round(row["high"], 5),
-                    "L": round(row["low"], 5),
-                    "C": round(row["close"], 5),
-                    "volume": int(row.get("tick_volume", 0)),  # ADDED: Volume data
-                    "dir": row["Dir"],
-                    "momentum_summary": self.get_momentum_summary(df, child_index),
-                    "children": get_children(row["time"], child_tf, level + 1)
-                }
-                children.append(child)
-            return children
-
-        # Build base blocks with volume
-        for _, row in base_df.iterrows():
-            block_index = base_df[base_df["time"] == row["time"]].index[0]
-            block = {
-                "tf": self.base_tf,
-                "time": row["time"].isoformat(),
-                "range": self.get_time_range(row["time"], self.base_tf),
-                "O": round(row["open"], 5),
-                "H": round(row["high"], 5),
-                "L": round(row["low"], 5),
-                "C": round(row["close"], 5),
-                "volume": int(row.get("tick_volume", 0)),  # ADDED: Volume data
-                "dir": row["Dir"],
-                "momentum_summary": self.get_momentum_summary(base_df, block_index),
-                "children": get_children(row["time"], self.base_tf)
-            }
-            blocks.append(block)
+            # Back to frame order (newest first) like the old boolean filter
+            positions = np.sort(child["order"][lo:hi]).tolist()
+            return make_blocks(child, positions, level + 1)
+
+        blocks, _ = make_blocks(indexes[self.base_tf], range(len(base_df)), 0)
+        
+        # Only keep what this build used - blocks that slid out are dropped
+        self.block_cache[symbol] = settled_blocks
+        self.last_build_stats = stats
 
         pyramid = {
-            "symbol": self.symbol,
+            "symbol": symbol,
             "style": self.pyramid_style,
             "structure": self.pyramid_structure,
             "generated": datetime.now().isoformat(),
@@ -233,10 +568,129 @@ class PyramidEngine:
         
         return pyramid
 
-    def _create_empty_pyramid(self) -> Dict[str, Any]:
+    def _index_timeframe(self, df: pd.DataFrame, tf: str) -> Dict[str, Any]:
+        """Sorted-time lookup arrays for one timeframe - block fields are formatted on demand"""
+        times = df["time"].to_numpy(dtype="datetime64[ns]").view("int64")
+        order = np.argsort(times, kind="stable")
+        sorted_times = times[order]
+        
+        # Momentum summary row as the old code found it: first row with the same time, by index label
+        is_group_start = np.r_[True, sorted_times[1:] != sorted_times[:-1]]
+        group_start = np.flatnonzero(is_group_start)
+        first_pos = np.empty_like(order)
+        first_pos[order] = order[group_start[np.cumsum(is_group_start) - 1]]
+        
+        columns = {
+            name: df[name].to_numpy() for name in
+            ["open", "high", "low", "close", "tick_volume", "Dir",
+             "Momentum_Acceleration", "Wick_Ratio", "Body_Strength", "ATR"]
+            if name in df.columns
+        }
+        
+        return {
+            "tf": tf,
+            "times": times,
+            "order": order,
+            "sorted_times": sorted_times,
+            "summary_rows": df.index.to_numpy()[first_pos],
+            "columns": columns,
+            "duration_ns": config.TIMEFRAME_DURATIONS.get(tf, 0) * 60 * 1_000_000_000,
+            "chunks": {}
+        }
+
+    def _block_fields(self, index: Dict[str, Any], pos: int) -> Dict[str, Any]:
+        """Block fields for one row, formatted vectorized per chunk of rows on first use"""
+        chunk = pos // FIELD_CHUNK_ROWS
+        rows = index["chunks"].get(chunk)
+        if rows is None:
+            start = chunk * FIELD_CHUNK_ROWS
+            rows = self._format_block_rows(index, start, min(start + FIELD_CHUNK_ROWS, len(index["times"])))
+            index["chunks"][chunk] = rows
+        return rows[pos - chunk * FIELD_CHUNK_ROWS]
+
+    def _format_block_rows(self, index: Dict[str, Any], start: int, stop: int) -> List[Dict[str, Any]]:
+        """Vectorized block fields (everything but children) for rows start:stop"""
+        tf = index["tf"]
+        columns = index["columns"]
+        times = index["times"][start:stop]
+        summaries = self._momentum_summaries(columns, index["summary_rows"][start:stop])
+        
+        # Full-second bar times format identically to Timestamp.isoformat()
+        if (times % 1_000_000_000 == 0).all():
+            time_text = np.datetime_as_string(times.view("datetime64[ns]"), unit="s").tolist()
+        else:
+            time_text = [pd.Timestamp(t).isoformat() for t in times]
+        
+        volume = columns["tick_volume"][start:stop].astype("int64").tolist() if "tick_volume" in columns else [0] * len(times)
+        
+        # Python round() on native floats keeps the exact values the row-wise builder produced
+        rows = zip(
+            time_text,
+            self._time_ranges(times, tf),
+            [round(v, 5) for v in columns["open"][start:stop].tolist()],
+            [round(v, 5) for v in columns["high"][start:stop].tolist()],
+            [round(v, 5) for v in columns["low"][start:stop].tolist()],
+            [round(v, 5) for v in columns["close"][start:stop].tolist()],
+            volume,
+            columns["Dir"][start:stop].tolist(),
+            summaries
+        )
+        return [
+            {
+                "tf": tf,
+                "time": time_text_,
+                "range": time_range,
+                "O": o,
+                "H": h,
+                "L": l,
+                "C": c,
+                "volume": vol,  # ADDED: Volume data
+                "dir": direction,
+                "momentum_summary": summary
+            }
+            for time_text_, time_range, o, h, l, c, vol, direction, summary in rows
+        ]
+
+    def _time_ranges(self, times_ns: np.ndarray, tf: str) -> List[str]:
+        """Vectorized get_time_range for an array of bar times"""
+        fmt = config.CHART_CONFIG['time_range_formats'].get(tf, "%H:%M")
+        starts = self._format_times(times_ns, fmt)
+        if starts is None:
+            starts = pd.Series(times_ns.view("datetime64[ns]")).dt.strftime(fmt).tolist()
+        
+        if tf in ("D1", "M1"):
+            return [f"[{start}]" for start in starts]
+            
+        end_ns = times_ns + RANGE_END_MINUTES.get(tf, 0) * 60 * 1_000_000_000
+        ends = self._format_times(end_ns, "%H:%M")
+        return [f"[{start}-{end}]" for start, end in zip(starts, ends)]
+
+    def _format_times(self, times_ns: np.ndarray, fmt: str) -> Optional[List[str]]:
+        """strftime via slices of NumPy ISO strings - None if fmt needs other directives"""
+        parts = [part for part in re.split(r"(%.)", fmt) if part]
+        if any(part.startswith("%") and part not in ISO_SLICES for part in parts):
+            return None
+            
+        iso = np.datetime_as_string(times_ns.view("datetime64[ns]"), unit="s").tolist()
+        pieces = [ISO_SLICES.get(part, part) for part in parts]
+        return ["".join(text[p[0]:p[1]] if isinstance(p, tuple) else p for p in pieces) for text in iso]
+
+    def _momentum_summaries(self, columns: Dict[str, np.ndarray], rows: np.ndarray) -> List[str]:
+        """Vectorized get_momentum_summary for the given rows"""
+        def column(name: str) -> List[float]:
+            return columns[name][rows].tolist() if name in columns else [0] * len(rows)
+            
+        mom = [f"MOM: {v:+.5f}" if not pd.isna(v) else "MOM: --" for v in column("Momentum_Acceleration")]
+        wick = [f"WICK: {v:.2f}x" if not pd.isna(v) else "WICK: --" for v in column("Wick_Ratio")]
+        body = [f"BODY: {v:.0%}" if not pd.isna(v) else "BODY: --" for v in column("Body_Strength")]
+        atr = [f"ATR: {v:.5f}" if not pd.isna(v) else "ATR: --" for v in column("ATR")]
+        
+        return [f"{m} | {w} | {b} | {a}" for m, w, b, a in zip(mom, wick, body, atr)]
+
+    def _create_empty_pyramid(self, symbol: Optional[str] = None) -> Dict[str, Any]:
         """Create empty pyramid structure when no data available"""
         return {
-            "symbol": self.symbol or "Unknown",
+            "symbol": symbol or self.symbol or "Unknown",
             "style": self.pyramid_style or "Unknown",
             "structure": self.pyramid_structure,
             "generated": datetime.now().isoformat(),
@@ -319,6 +773,118 @@ class PyramidEngine:
         
         return df
 
+    # ===========================================================
+    # 🗃️ INDICATOR RESULT CACHE
+    # ===========================================================
+    def get_indicator_results(self, symbol: str, raw_data: Dict[str, pd.DataFrame], timeframe: str,
+                              custom_periods: Optional[Dict] = None, output_format: str = "points") -> tuple:
+        """(current values, chart data) for a timeframe - cached until the series changes"""
+        series = raw_data[timeframe]
+        key = (symbol, timeframe, self.data_versions.get(symbol, 0), self.get_series_revision(series),
+               self._normalize_periods(custom_periods), output_format)
+        
+        with self._indicator_lock:
+            cached = self.indicator_cache.get(key)
+            if cached is not None:
+                self.indicator_cache.move_to_end(key)
+                self.indicator_cache_stats['hits'] += 1
+                return cached
+            self.indicator_cache_stats['misses'] += 1
+        
+        # Compute outside the lock - concurrent misses on one key just compute twice.
+        # Ring frames are fresh frames over a snapshot, so indicator columns never touch the
+        # stored bars; the result is stored under the version that snapshot belongs to
+        if isinstance(series, BarRing):
+            version, df = series.versioned_frame(("time", "open", "high", "low", "close", "tick_volume"))
+            key = key[:3] + ((version,),) + key[4:]
+        else:
+            df = series.copy()
+        # Series are newest first; rolling windows and EMAs must run oldest first, the same
+        # order the streaming indicators see. Current values come from the newest (last) row,
+        # the chart formatters keep taking the newest-first frame
+        in_time_order = self.calculate_technical_indicators(df.iloc[::-1].reset_index(drop=True), custom_periods)
+        df_with_indicators = in_time_order.iloc[::-1].reset_index(drop=True)
+        if output_format == "columnar":
+            chart_data = self.get_indicator_columnar_data(df_with_indicators)
+        elif output_format == "binary":
+            chart_data = self.get_indicator_arrays(df_with_indicators)
+        else:
+            chart_data = self.get_indicator_chart_data(df_with_indicators, timeframe)
+        result = (self.get_current_indicator_values(in_time_order), chart_data)
+        
+        with self._indicator_lock:
+            self.indicator_cache[key] = result
+            self.indicator_cache.move_to_end(key)
+            while len(self.indicator_cache) > self.indicator_cache_size:
+                self.indicator_cache.popitem(last=False)
+        return result
+
+    def get_data_version(self, symbol: str) -> int:
+        """Counter bumped every time new bars are installed for a symbol"""
+        return self.data_versions.get(symbol, 0)
+
+    def get_series_revision(self, series) -> tuple:
+        """Changes with every write to one bar series, including ones between installs.
+
+        Rings are written in place by fetches, roll-ups and ticks - their write counter;
+        plain frames - newest bar time and close plus length.
+        """
+        if isinstance(series, BarRing):
+            return (series.version,)
+        if series is None or series.empty:
+            return (None,)
+        return (series["time"].iloc[0], float(series["close"].iloc[0]), len(series))
+
+    def invalidate_indicator_cache(self, symbol: Optional[str] = None):
+        """Drop cached indicator results (all symbols or one)"""
+        with self._indicator_lock:
+            for key in [k for k in self.indicator_cache if symbol is None or k[0] == symbol]:
+                del self.indicator_cache[key]
+
+    def get_indicator_cache_stats(self) -> Dict[str, Any]:
+        """Indicator cache occupancy and hit rate"""
+        hits = self.indicator_cache_stats['hits']
+        total = hits + self.indicator_cache_stats['misses']
+        return {
+            'entries': len(self.indicator_cache),
+            'max_entries': self.indicator_cache_size,
+            'hits': hits,
+            'misses': self.indicator_cache_stats['misses'],
+            'hit_rate': round(hits / total, 4) if total else 0.0
+        }
+
+    # ===========================================================
+    # 📡 STREAMING INDICATORS
+    # ===========================================================
+    def update_live_indicators(self, symbol: str, raw_data: Dict[str, pd.DataFrame]):
+        """Advance the streaming indicator state (default periods) for every timeframe"""
+        periods = self._get_periods()
+        periods_key = self._normalize_periods()
+        for tf, df in raw_data.items():
+            # Same minimum history as calculate_technical_indicators
+            if isinstance(df, pd.DataFrame) and len(df) >= 20:
+                indicator_engine.update(symbol, tf, df, periods, periods_key)
+
+    def get_live_indicator_values(self, symbol: str, timeframe: str,
+                                  custom_periods: Optional[Dict] = None) -> Dict[str, float]:
+        """Latest indicator values for the newest bar - O(1) once the series is tracked"""
+        df = self.get_bar_series(symbol).get(timeframe)
+        if isinstance(df, BarRing):
+            df = df.to_frame(("time", "high", "low", "close"))
+        if df is None or len(df) < 20:
+            return {}
+        return indicator_engine.update(symbol, timeframe, df, self._get_periods(custom_periods),
+                                       self._normalize_periods(custom_periods))
+
+    def get_live_indicator_stats(self) -> Dict[str, Any]:
+        """Streaming indicator engine counters"""
+        return indicator_engine.get_stats()
+
+    def _normalize_periods(self, custom_periods: Optional[Dict] = None) -> tuple:
+        """Hashable form of the periods actually used - unrelated request keys don't split the cache"""
+        periods = self._get_periods(custom_periods)
+        return tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(periods.items()))
+
     def _get_periods(self, custom_periods: Optional[Dict] = None) -> Dict:
         """Get indicator periods - custom if provided, otherwise defaults"""
         if not custom_periods:
@@ -475,6 +1041,46 @@ class PyramidEngine:
         
         return indicators_data
 
+    def get_indicator_arrays(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Indicator series as oldest-first float64 arrays (Bollinger bands as "bollinger.<band>")"""
+        arrays = {}
+        
+        if df.empty:
+            return arrays
+        
+        # Same keys as get_indicator_chart_data so the frontend can expand any shape
+        columns = [(col, col.lower()) for col in df.columns if col.startswith('SMA_') or col.startswith('EMA_')]
+        columns += [(col, key) for col, key in [('RSI', 'rsi'), ('MACD', 'macd'), ('MACD_Signal', 'macd_signal'),
+                                                ('Stoch_%K', 'stoch_k'), ('Stoch_%D', 'stoch_d')]
+                    if col in df.columns]
+        if all(col in df.columns for col in ['BB_Upper', 'BB_Middle', 'BB_Lower']):
+            columns += [('BB_Upper', 'bollinger.upper'), ('BB_Middle', 'bollinger.middle'), ('BB_Lower', 'bollinger.lower')]
+        
+        for col, key in columns:
+            arrays[key] = df[col].to_numpy(dtype=float)[::-1]
+        
+        if 'Support_Levels' in df.columns and 'Resistance_Levels' in df.columns:
+            times = self._epoch_ms(df['time'])
+            arrays['support_resistance'] = {
+                'support': df['Support_Levels'].iloc[0],
+                'resistance': df['Resistance_Levels'].iloc[0],
+                'time_range': {'start': int(times[0]), 'end': int(times[-1])}
+            }
+        
+        return arrays
+
+    def get_indicator_columnar_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Indicator series as flat value arrays aligned with the columnar time array (oldest first)"""
+        indicators_data = {}
+        for key, values in self.get_indicator_arrays(df).items():
+            if not isinstance(values, np.ndarray):
+                indicators_data[key] = values
+            elif key.startswith('bollinger.'):
+                indicators_data.setdefault('bollinger', {})[key.split('.', 1)[1]] = self._json_floats(values)
+            else:
+                indicators_data[key] = self._json_floats(values)
+        return indicators_data
+
     # ADDED: Support/Resistance Calculation
     def calculate_support_resistance(self, df: pd.DataFrame, lookback: int = 20) -> Dict[str, List[float]]:
         """Calculate support and resistance levels from price action"""
@@ -483,22 +1089,24 @@ class PyramidEngine:
         if len(df) < lookback * 2:
             return levels
             
-        for i in range(lookback, len(df) - lookback):
-            # Swing High detection (Resistance)
-            if all(df['high'].iloc[i] > df['high'].iloc[i-j] for j in range(1, lookback+1)) and \
-               all(df['high'].iloc[i] > df['high'].iloc[i+j] for j in range(1, lookback+1)):
-                level = float(df['high'].iloc[i])
-                # Avoid duplicate levels (within 0.1% range)
-                if not any(abs(level - existing) / existing < 0.001 for existing in levels['resistance']):
-                    levels['resistance'].append(level)
-            
-            # Swing Low detection (Support)  
-            if all(df['low'].iloc[i] < df['low'].iloc[i-j] for j in range(1, lookback+1)) and \
-               all(df['low'].iloc[i] < df['low'].iloc[i+j] for j in range(1, lookback+1)):
-                level = float(df['low'].iloc[i])
-                # Avoid duplicate levels (within 0.1% range)
-                if not any(abs(level - existing) / existing < 0.001 for existing in levels['support']):
-                    levels['support'].append(level)
+        highs = df['high'].to_numpy(dtype=float)
+        lows = df['low'].to_numpy(dtype=float)
+        n = len(df)
+        
+        # Window k covers rows k..k+lookback-1, so row i sees window i-lookback before it and i+1 after it
+        high_windows = sliding_window_view(highs, lookback).max(axis=1)
+        low_windows = sliding_window_view(lows, lookback).min(axis=1)
+        before = slice(0, n - 2 * lookback)
+        after = slice(lookback + 1, n - lookback + 1)
+        center = slice(lookback, n - lookback)
+        
+        # Swing High (Resistance) / Swing Low (Support): strictly beyond every bar on both sides
+        swing_highs = highs[center] > np.maximum(high_windows[before], high_windows[after])
+        swing_lows = lows[center] < np.minimum(low_windows[before], low_windows[after])
+        
+        # Avoid duplicate levels (within 0.1% range), first swing in frame order wins
+        levels['resistance'] = self._merge_levels(highs[center][swing_highs].tolist())
+        levels['support'] = self._merge_levels(lows[center][swing_lows].tolist())
         
         # Sort and keep strongest levels (limit to 5 each)
         levels['support'] = sorted(levels['support'])[-5:]
@@ -506,53 +1114,122 @@ class PyramidEngine:
         
         return levels
 
+    def _merge_levels(self, candidates: List[float]) -> List[float]:
+        """Keep candidates not within 0.1% of an already kept level, in candidate order"""
+        kept = []
+        kept_sorted = []
+        for level in candidates:
+            # Only the nearest kept level on each side can be within range
+            pos = bisect_left(kept_sorted, level)
+            neighbours = kept_sorted[max(pos - 1, 0):pos + 1]
+            if not any(abs(level - existing) / existing < 0.001 for existing in neighbours):
+                kept.append(level)
+                insort(kept_sorted, level)
+        return kept
+
     # ===========================================================
     # 📊 CHART DATA PREPARATION - FIXED VERSION
     # ===========================================================
-    def get_chart_data(self, data: Dict[str, pd.DataFrame], timeframe: str) -> List[Dict]:
+    def _chart_arrays(self, data: Dict[str, Any], timeframe: str) -> Optional[Dict[str, np.ndarray]]:
+        """Oldest-first time (ms) / OHLC / volume arrays - the ring's shared snapshot when it is a ring"""
+        series = data.get(timeframe)
+        if isinstance(series, BarRing):
+            if not len(series):
+                return None
+            arrays = series.views(("time", "open", "high", "low", "close", "tick_volume"))
+            arrays['volume'] = arrays.pop('tick_volume')
+            return arrays
+        
+        if series is None or series.empty:
+            return None
+        arrays = {'time': self._epoch_ms(series["time"])[::-1]}
+        arrays.update({field: series[field].to_numpy(dtype=float)[::-1] for field in ("open", "high", "low", "close")})
+        arrays['volume'] = (series["tick_volume"].to_numpy(dtype=np.int64)[::-1] if "tick_volume" in series.columns
+                            else np.zeros(len(series), dtype=np.int64))
+        return arrays
+
+    def get_chart_data(self, data: Dict[str, Any], timeframe: str) -> List[Dict]:
         """Extract chart data for line/area charts - FIXED with proper data structure"""
-        if timeframe not in data or data[timeframe].empty:
+        arrays = self._chart_arrays(data, timeframe)
+        if arrays is None:
             return []
-            
-        df = data[timeframe]
-        chart_data = []
-        
-        for _, row in df.iterrows():
-            chart_data.append({
-                'x': row["time"].timestamp() * 1000,  # JavaScript timestamp
-                'y': float(row["close"]),  # Use close price for line/area charts
-                'o': float(row["open"]),
-                'h': float(row["high"]),
-                'l': float(row["low"]),
-                'c': float(row["close"]),
-                'volume': int(row.get("tick_volume", 0))
-            })
-        
-        chart_data.reverse()  # Oldest first for charts
-        return chart_data
+        
+        # Oldest first for charts; x is a JavaScript timestamp, y the close for line/area charts
+        return [
+            {'x': float(t), 'y': c, 'o': o, 'h': h, 'l': l, 'c': c, 'volume': v}
+            for t, o, h, l, c, v in zip(arrays['time'].tolist(), arrays['open'].tolist(), arrays['high'].tolist(),
+                                        arrays['low'].tolist(), arrays['close'].tolist(), arrays['volume'].tolist())
+        ]
+
+    def get_columnar_chart_data(self, data: Dict[str, Any], timeframe: str) -> Dict[str, Any]:
+        """Chart data as one shared time array plus a flat array per OHLCV field (oldest first)"""
+        arrays = self._chart_arrays(data, timeframe)
+        if arrays is None:
+            return {'time': [], 'columns': {}}
+        
+        columns = {field: self._json_floats(arrays[field]) for field in ("open", "high", "low", "close")}
+        columns['volume'] = arrays['volume'].tolist()
+        return {'time': arrays['time'].tolist(), 'columns': columns}
+
+    def get_binary_chart_data(self, data: Dict[str, Any], timeframe: str,
+                              indicator_arrays: Dict[str, Any], header: Dict[str, Any]) -> bytes:
+        """Chart + indicator series packed as raw little-endian buffers behind a JSON header"""
+        arrays = self._chart_arrays(data, timeframe)
+        count = len(arrays['time']) if arrays is not None else 0
+        
+        if count:
+            series = [("time", "int64", arrays['time'])]
+            series += [(field, "float64", arrays[field]) for field in ("open", "high", "low", "close")]
+            series.append(("volume", "int64", arrays['volume']))
+            series += [(name, "float64", values) for name, values in indicator_arrays.items()
+                       if isinstance(values, np.ndarray)]
+        else:
+            series = []
+        
+        # Offsets are relative to the first buffer; every buffer is count * 8 bytes
+        descriptors = [{"name": name, "dtype": dtype, "offset": i * count * 8, "length": count}
+                       for i, (name, dtype, _) in enumerate(series)]
+        header_bytes = json.dumps(
+            dict(header, count=count, series=descriptors,
+                 support_resistance=indicator_arrays.get("support_resistance")),
+            separators=(",", ":")
+        ).encode("utf-8")
+        # Pad so the buffers start 8-byte aligned - typed array views require it
+        header_bytes += b" " * (-(len(BINARY_CHART_MAGIC) + 4 + len(header_bytes)) % 8)
+        
+        buffers = [np.ascontiguousarray(values, dtype="<i8" if dtype == "int64" else "<f8").tobytes()
+                   for _, dtype, values in series]
+        return b"".join([BINARY_CHART_MAGIC, struct.pack("<I", len(header_bytes)), header_bytes] + buffers)
+
+    def _epoch_ms(self, times: pd.Series) -> np.ndarray:
+        """JavaScript millisecond timestamps for a datetime column"""
+        return times.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+    def _json_floats(self, values: np.ndarray) -> List[Optional[float]]:
+        """Float array as a JSON-safe list - NaN becomes null"""
+        nan_mask = np.isnan(values)
+        if not nan_mask.any():
+            return values.tolist()
+        return [None if missing else value for value, missing in zip(values.tolist(), nan_mask.tolist())]
 
     # ===========================================================
     # 💾 DATA PERSISTENCE
     # ===========================================================
     def save_to_json(self, pyramid_data: Dict[str, Any]):
-        """Save pyramid data to JSON files"""
+        """Cache pyramid data and queue its JSON files with the snapshot writer"""
         # Update both single-symbol and multi-symbol cache
         symbol = pyramid_data.get('symbol', self.symbol)
         if symbol:
-            self.pyramid_cache[symbol] = pyramid_data
+            self.symbol_cache.put_pyramid(symbol, pyramid_data)
             
+        # Legacy single-symbol files follow the active symbol only
+        if symbol != self.current_symbol:
+            return
         self.latest_pyramid = pyramid_data
         
-        # Save to main JSON file
-        with open(self.json_filename, "w", encoding="utf-8") as f:
-            json.dump(pyramid_data, f, indent=2, ensure_ascii=False)
-            
-        # Save to dashboard data file
-        dashboard_path = os.path.join("dashboard", "data.json")
-        with open(dashboard_path, "w", encoding="utf-8") as f:
-            json.dump(pyramid_data, f, indent=2, ensure_ascii=False)
-            
-        print(f"💾 Pyramid data saved: {len(pyramid_data.get('blocks', []))} blocks")
+        # Main and dashboard files - encoded once, written off-thread when the content changed
+        snapshot_writer.submit(self.json_filename, pyramid_data)
+        snapshot_writer.submit(os.path.join("dashboard", "data.json"), pyramid_data)
 
     # ===========================================================
     # 🧠 ANALYSIS & SIGNALS
@@ -2,17 +2,525 @@
 # 💾 STORAGE LAYER - SIMPLIFIED DATA PERSISTENCE
 # ===============================================================
 
+import hashlib
 import json
 import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, List
+import numpy as np
 import config
 
+# On-disk bar columns - MT5 rate layout, time as raw server epoch seconds
+BAR_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                      ('tick_volume', '<i8'), ('spread', '<i4'), ('real_volume', '<i8')])
+
+# Mapped bar file header - count is published last, readers never see half-written records;
+# superseded is set once the series has rolled over to a newer, larger file
+MAPPED_MAGIC = b'MFZBARS1'
+MAPPED_HEADER = np.dtype([('magic', 'S8'), ('version', '<i8'), ('header_size', '<i8'), ('record_size', '<i8'),
+                          ('capacity', '<i8'), ('count', '<i8'), ('last_time', '<i8'), ('superseded', '<i8')])
+
+# Settings added for the collector, fetch and serving paths - merged under config.DEFAULT_SETTINGS
+# and the saved settings, so an older settings file keeps working. Documented in RUNTIME.md
+RUNTIME_DEFAULT_SETTINGS = {
+    # MT5 fetching
+    'incremental_fetch': True,         # fetch only bars newer than the cached ones
+    'fetch_mode': 'parallel',          # 'parallel' or 'serialized'
+    'fetch_workers': 4,
+    'mt5_calls_per_second': 20,        # global MT5 call budget, 0 disables the limit
+    'background_call_share': 0.5,      # share of the budget watchlist refreshes may burst into
+    # Collector
+    'forming_interval': None,          # forming bar poll in seconds, None falls back to fetch_interval
+    'tick_interval': 0.25,             # tick polls between bar fetches, 0 turns them off
+    'tick_publish_interval': 1.0,      # tick-only moves rebuild and publish at most this often
+    'watchlist': [],                   # other symbols kept warm behind the active one
+    'watchlist_interval': 60,
+    # Caches and bar files
+    'symbol_cache_mb': 256,
+    'bar_history': True,               # closed bars to data/bars for warm restarts
+    'mapped_bars': True,               # closed bars to shared read-only mapped files
+    # HTTP serving
+    'server_mode': 'development',      # 'development' (werkzeug) or 'production' (waitress)
+    'server_threads': 16,
+    'server_connection_limit': 100,
+    'server_channel_timeout': 120,
+}
+
+# ===============================================================
+# 📝 SNAPSHOT WRITER - BACKGROUND, DEDUPLICATED, ATOMIC JSON FILES
+# ===============================================================
+class SnapshotWriter:
+    """Writes JSON snapshots on a background thread.
+
+    submit() only records the newest payload per path, so a burst of updates costs one
+    write. Payloads are encoded compactly, hashed without their volatile keys (the build
+    timestamp) and skipped when unchanged, then written to a temp file and renamed into
+    place. Submitted payloads must not be mutated afterwards.
+    """
+    def __init__(self, coalesce_window: float = 0.5, volatile_keys: tuple = ('generated',)):
+        self.coalesce_window = coalesce_window
+        self.volatile_keys = volatile_keys
+        self._pending = {}             # path -> newest payload
+        self._hashes = {}              # path -> hash of the content last written
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # one flush at a time - stop() may flush while the thread still does
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self.stats = {'submitted': 0, 'coalesced': 0, 'written': 0, 'unchanged': 0, 'bytes': 0, 'errors': 0}
+
+    def submit(self, path: str, payload: Dict[str, Any]):
+        """Queue a payload for path - replaces one still waiting for the same path"""
+        with self._lock:
+            if path in self._pending:
+                self.stats['coalesced'] += 1
+            self._pending[path] = payload
+            self.stats['submitted'] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self):
+        """Write everything pending on the calling thread - waits for a flush already running"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            encoded = {}               # id(payload) -> (hash, bytes) - shared payloads encode once
+            for path, payload in pending.items():
+                try:
+                    if id(payload) not in encoded:
+                        encoded[id(payload)] = self._encode(payload)
+                    digest, body = encoded[id(payload)]
+                    if self._hashes.get(path) == digest:
+                        self.stats['unchanged'] += 1
+                        continue
+                    self._write_atomic(path, body)
+                    self._hashes[path] = digest
+                    self.stats['written'] += 1
+                    self.stats['bytes'] += len(body)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"❌ Error writing snapshot {path}: {e}")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer thread after it has written everything pending.
+
+        If the join times out the thread is mid-write; the final flush waits for it.
+        """
+        self._stopping = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self.flush()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait()
+            if not self._stopping:
+                time.sleep(self.coalesce_window)
+            self._wake.clear()
+            self.flush()
+
+    def _encode(self, payload: Dict[str, Any]) -> tuple:
+        """Compact UTF-8 JSON plus a content hash that ignores volatile keys"""
+        stable = {key: value for key, value in payload.items() if key not in self.volatile_keys}
+        stable_text = json.dumps(stable, separators=(',', ':'), ensure_ascii=False)
+        digest = hashlib.blake2b(stable_text.encode('utf-8'), digest_size=16).hexdigest()
+        if len(stable) == len(payload):
+            return digest, stable_text.encode('utf-8')
+        return digest, json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def _write_atomic(self, path: str, body: bytes):
+        """Temp file in the target directory, then rename over the old file"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Write counters and queue depth"""
+        with self._lock:
+            pending = len(self._pending)
+        return {**self.stats, 'pending': pending, 'coalesce_window': self.coalesce_window}
+
+# Shared by every module that persists snapshots
+snapshot_writer = SnapshotWriter()
+
+
+# ===============================================================
+# 🕯️ BAR HISTORY WRITER - BACKGROUND, COALESCED CHUNK APPENDS
+# ===============================================================
+class BarHistoryWriter:
+    """Hands closed bars to the history store on a background thread.
+
+    submit() only queues the bars, so the fetch path never waits for npz compression or a
+    month compaction. Bars queued for one series meanwhile are merged into one append;
+    a bar queued twice keeps its newest copy. Submitted arrays must not be mutated afterwards.
+    """
+    def __init__(self, append: Callable[[str, str, np.ndarray], int], coalesce_window: float = 1.0):
+        self.append = append
+        self.coalesce_window = coalesce_window
+        self._pending = {}             # (symbol, timeframe) -> bar arrays in submit order
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # one flush at a time - stop() may flush while the thread still does
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self.stats = {'submitted': 0, 'coalesced': 0, 'appends': 0, 'errors': 0, 'last_flush_ms': 0.0}
+
+    def submit(self, symbol: str, timeframe: str, bars: np.ndarray):
+        """Queue closed bars for a series - bar listener signature"""
+        if not len(bars):
+            return
+        with self._lock:
+            queued = self._pending.setdefault((symbol, timeframe), [])
+            if queued:
+                self.stats['coalesced'] += 1
+            queued.append(bars)
+            self.stats['submitted'] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="bar-history-writer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self):
+        """Append everything queued on the calling thread - waits for a flush already running"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            started = time.perf_counter()
+            for (symbol, timeframe), parts in pending.items():
+                bars = np.concatenate(parts) if len(parts) > 1 else parts[0]
+                order = np.argsort(bars['time'], kind='stable')
+                bars = bars[order]
+                bars = bars[np.r_[bars['time'][1:] != bars['time'][:-1], True]]   # newest copy wins
+                try:
+                    self.append(symbol, timeframe, bars)
+                    self.stats['appends'] += 1
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"❌ Error writing bar history for {symbol} {timeframe}: {e}")
+            if pending:
+                self.stats['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer thread after it has appended everything queued"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self.flush()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait()
+            if not self._stopping:
+                time.sleep(self.coalesce_window)
+            self._wake.clear()
+            self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Append counters and queue depth"""
+        with self._lock:
+            pending = sum(len(parts) for parts in self._pending.values())
+        return {**self.stats, 'pending': pending, 'coalesce_window': self.coalesce_window}
+
+
+# ===============================================================
+# 🔔 ALERT STORE - SQLITE, MONOTONIC IDS, INDEXED PAGINATED QUERIES
+# ===============================================================
+class AlertStore:
+    """Alerts in one SQLite table - inserts are O(log n), ids come from AUTOINCREMENT.
+
+    The alert dict is kept as JSON next to the indexed columns (symbol, status, created,
+    expires). An old alerts.json is imported once on first use and renamed.
+    """
+    STATUSES = ('active', 'triggered', 'expired', 'dismissed')
+
+    def __init__(self, db_path: str, legacy_file: Optional[str] = None):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self.compact_interval = 3600       # seconds between expired-alert sweeps
+        self._conn = None
+        self._last_compaction = 0.0
+        self._lock = threading.Lock()
+        self.compact_listeners = []        # callback(removed ids) - e.g. the alert engine's indexes
+        self.stats = {'inserted': 0, 'queries': 0, 'compacted': 0, 'migrated': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use - schema, indexes and legacy import"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")   # only takes effect on a new file
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT,
+                    status TEXT NOT NULL DEFAULT 'active',
+                    created REAL NOT NULL,
+                    expires REAL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS alerts_symbol ON alerts (symbol, id);
+                CREATE INDEX IF NOT EXISTS alerts_status ON alerts (status, id);
+                CREATE INDEX IF NOT EXISTS alerts_created ON alerts (created);
+                CREATE INDEX IF NOT EXISTS alerts_expires ON alerts (expires) WHERE expires IS NOT NULL;
+            """)
+            # Published only once the import went through - a failed one is retried on the next call
+            try:
+                self._migrate_legacy(conn)
+            except Exception:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _migrate_legacy(self, conn: sqlite3.Connection):
+        """Import alerts.json in file order and rename it, in one transaction"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read {self.legacy_file} for migration: {e}")
+            return
+        
+        with conn:
+            for alert in legacy:
+                alert = dict(alert)
+                alert['legacy_id'] = alert.pop('id', None)
+                created = _to_epoch(alert.get('created')) or time.time()
+                self._insert(conn, alert, created)
+            # A failed rename rolls the import back, so alerts are never imported twice
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        self.stats['migrated'] = len(legacy)
+        print(f"🔔 Migrated {len(legacy)} alerts from {os.path.basename(self.legacy_file)}")
+
+    def _insert(self, conn: sqlite3.Connection, alert: Dict[str, Any], created: float) -> int:
+        status = alert.get('status', 'active')
+        alert['status'] = status if status in self.STATUSES else 'active'
+        expires = _to_epoch(alert.get('expires'))
+        cursor = conn.execute(
+            "INSERT INTO alerts (symbol, status, created, expires, data) VALUES (?, ?, ?, ?, ?)",
+            (alert.get('symbol'), alert['status'], created, expires,
+             json.dumps(alert, separators=(',', ':'), ensure_ascii=False, default=str)))
+        return cursor.lastrowid
+
+    def add(self, alert: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert an alert - returns it with its id, status and created time"""
+        created = time.time()
+        alert = dict(alert)
+        alert.pop('id', None)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                alert_id = self._insert(conn, alert, created)
+            self.stats['inserted'] += 1
+            due = created - self._last_compaction >= self.compact_interval
+        if due:
+            self.compact()
+        return {**alert, 'id': alert_id, 'created': datetime.fromtimestamp(created).isoformat()}
+
+    def query(self, symbol: Optional[str] = None, status: Optional[str] = None,
+              since: Any = None, until: Any = None, before: Optional[int] = None,
+              limit: int = 50) -> Dict[str, Any]:
+        """Newest-first page of alerts; pass the returned next_before to get the following page"""
+        clauses, params = [], []
+        if symbol:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(_to_epoch(until))
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(int(before))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        # Keyset pagination on the id - stable while new alerts arrive, no OFFSET scans
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT * FROM alerts {where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)).fetchall()
+            self.stats['queries'] += 1
+        
+        alerts = [self._row_to_alert(row) for row in rows[:limit]]
+        return {
+            'alerts': alerts,
+            'next_before': alerts[-1]['id'] if len(rows) > limit else None
+        }
+
+    def get(self, alert_id: int) -> Optional[Dict[str, Any]]:
+        """One alert by id, None if unknown"""
+        with self._lock:
+            row = self._connection().execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+        return self._row_to_alert(row) if row is not None else None
+
+    def set_status(self, alert_id: int, status: str, fields: Optional[Dict[str, Any]] = None,
+                   expected: Optional[str] = None) -> bool:
+        """Change an alert's status (merging extra fields into it) - False if the id is unknown
+        or, with expected, its stored status is a different one"""
+        return self.set_status_many([(alert_id, status, fields)], expected) == [alert_id]
+
+    def set_status_many(self, changes: List[tuple], expected: Optional[str] = None) -> List[int]:
+        """(id, status, fields or None) changes in one transaction - returns the ids that were applied.
+
+        With expected, only alerts whose stored status is expected are changed.
+        """
+        for _, status, _ in changes:
+            if status not in self.STATUSES:
+                raise ValueError(f"Unknown alert status: {status}")
+        updated = []
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for alert_id, status, fields in changes:
+                    row = conn.execute("SELECT status, data FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+                    if row is None or (expected is not None and row['status'] != expected):
+                        continue
+                    data = {**json.loads(row['data']), **(fields or {}), 'status': status}
+                    conn.execute("UPDATE alerts SET status = ?, data = ? WHERE id = ?",
+                                 (status, json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str), alert_id))
+                    updated.append(alert_id)
+        return updated
+
+    def iter_alerts(self, page_size: int = 500, **filters):
+        """Every alert matching the filters, newest first, fetched a page at a time"""
+        before = None
+        while True:
+            page = self.query(before=before, limit=page_size, **filters)
+            yield from page['alerts']
+            before = page['next_before']
+            if before is None:
+                return
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Delete alerts past their expiry or marked expired, then return the pages to the OS"""
+        now = now or time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                removed = [row['id'] for row in conn.execute(
+                    "SELECT id FROM alerts WHERE expires < ? OR status = 'expired'", (now,))]
+                conn.executemany("DELETE FROM alerts WHERE id = ?", [(alert_id,) for alert_id in removed])
+            if removed:
+                conn.execute("PRAGMA incremental_vacuum")
+            self._last_compaction = now
+            self.stats['compacted'] += len(removed)
+        if removed:
+            print(f"🧹 Compacted {len(removed)} expired alerts")
+            for callback in self.compact_listeners:
+                try:
+                    callback(removed)
+                except Exception as e:
+                    print(f"⚠️ Compact listener error: {e}")
+        return len(removed)
+
+    def add_compact_listener(self, callback):
+        """Register callback(removed ids), called after every compaction that removed alerts"""
+        self.compact_listeners.append(callback)
+
+    def count(self, symbol: Optional[str] = None, status: Optional[str] = None) -> int:
+        """Alerts matching the filters - served from the indexes"""
+        clauses, params = [], []
+        if symbol:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM alerts {where}", params).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _row_to_alert(self, row: sqlite3.Row) -> Dict[str, Any]:
+        alert = json.loads(row['data'])
+        alert.update({
+            'id': row['id'],
+            'symbol': row['symbol'],
+            'status': row['status'],
+            'created': datetime.fromtimestamp(row['created']).isoformat(),
+            'expires': datetime.fromtimestamp(row['expires']).isoformat() if row['expires'] is not None else None
+        })
+        return alert
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus rows per status"""
+        with self._lock:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM alerts GROUP BY status").fetchall()
+        return {**self.stats, 'by_status': {status: total for status, total in rows}}
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Epoch seconds from a number, an ISO string or a datetime - None if empty"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
 class StorageLayer:
     def __init__(self):
         self.data_dir = "data"
         self.settings_file = os.path.join(self.data_dir, "user_settings.json")
+        
+        # Bar history - bars/{symbol}/{timeframe}/{YYYY-MM}/{first}_{last}.npz, append-only chunks
+        self.bars_dir = os.path.join(self.data_dir, "bars")
+        self.bar_chunk_limit = 48          # chunks per month before they are merged into one
+        self._last_stored = {}             # (symbol, timeframe) -> newest stored bar time
+        self._bars_lock = threading.Lock()
+        self.bar_stats = {'appends': 0, 'bars_written': 0, 'compactions': 0, 'bars_loaded': 0}
+        self._bar_disk = None              # running series/chunks/bytes totals, one directory scan on first use
+        self.bar_writer = BarHistoryWriter(self.append_bars)   # collector hands closed bars here, off the fetch path
+        
+        # Mapped bar files - mapped/{symbol}_{timeframe}.{generation}.bars, one writer (collector), any number of readers
+        self.mapped_dir = os.path.join(self.data_dir, "mapped")
+        self.mapped_initial_capacity = 4096
+        self.mapped_seed_bars = 500000     # history copied into a new mapped file
+        self._mapped_writers = {}          # series -> (generation, memmap, header, records)
+        self._mapped_readers = {}          # series -> (header, records) of the newest generation mapped
+        self._mapped_lock = threading.Lock()
+        
         self._ensure_directories()
+        
+        # Alerts - SQLite store, legacy alerts.json imported on first use
+        self.alert_store = AlertStore(os.path.join(self.data_dir, "alerts.db"),
+                                      legacy_file=os.path.join(self.data_dir, "alerts.json"))
         print("💾 Storage Layer initialized")
 
     def _ensure_directories(self):
@@ -28,13 +536,13 @@ class StorageLayer:
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
                     saved_settings = json.load(f)
-                    settings = config.DEFAULT_SETTINGS.copy()
+                    settings = {**RUNTIME_DEFAULT_SETTINGS, **config.DEFAULT_SETTINGS}
                     settings.update(saved_settings)
                     return settings
         except Exception as e:
             print(f"⚠️ Error loading settings: {e}")
         
-        return config.DEFAULT_SETTINGS.copy()
+        return {**RUNTIME_DEFAULT_SETTINGS, **config.DEFAULT_SETTINGS}
 
     def save_user_settings(self, settings: Dict[str, Any]) -> bool:
         """Save user settings to file"""
@@ -51,21 +559,10 @@ class StorageLayer:
     # 🏗️ PYRAMID DATA STORAGE - SIMPLIFIED
     # ===========================================================
     def save_pyramid_data(self, pyramid_data: Dict[str, Any]):
-        """Save pyramid data to JSON file - Simple overwrite"""
-        try:
-            symbol = pyramid_data.get('symbol', 'unknown')
-            filename = f"pyramid_{symbol}.json"
-            filepath = os.path.join(self.data_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(pyramid_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"💾 Pyramid data saved: {filename}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error saving pyramid data: {e}")
-            return False
+        """Queue pyramid data for its per-symbol file - written off-thread, only when changed"""
+        symbol = pyramid_data.get('symbol', 'unknown')
+        snapshot_writer.submit(os.path.join(self.data_dir, f"pyramid_{symbol}.json"), pyramid_data)
+        return True
 
     def load_pyramid_for_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load pyramid data for specific symbol"""
@@ -81,21 +578,364 @@ class StorageLayer:
         return None
 
     # ===========================================================
-    # 🔔 ALERTS STORAGE
+    # 🕯️ BAR HISTORY STORAGE
     # ===========================================================
-    def save_alert(self, alert_data: Dict[str, Any]):
-        """Save trading alert"""
+    def append_bars(self, symbol: str, timeframe: str, bars: np.ndarray) -> int:
+        """Append closed bars newer than the last stored one - one compressed chunk per month touched"""
         try:
-            alerts_file = os.path.join(self.data_dir, "alerts.json")
-            alerts = self.load_alerts()
+            with self._bars_lock:
+                last = self.last_stored_time(symbol, timeframe)
+                bars = np.sort(bars, order='time')
+                if last is not None:
+                    bars = bars[bars['time'] > last]
+                if not len(bars):
+                    return 0
+                
+                months = bars['time'].astype('datetime64[s]').astype('datetime64[M]')
+                for month in np.unique(months):
+                    partition = self._bar_partition(symbol, timeframe, str(month))
+                    chunk = bars[months == month]
+                    self._write_chunk(partition, chunk)
+                    if len(self._list_chunks(partition)) > self.bar_chunk_limit:
+                        self._compact_partition(partition)
+                
+                self._last_stored[(symbol, timeframe)] = int(bars['time'][-1])
+                self.bar_stats['appends'] += 1
+                self.bar_stats['bars_written'] += len(bars)
+                return len(bars)
+                
+        except Exception as e:
+            print(f"❌ Error appending bars for {symbol} {timeframe}: {e}")
+            return 0
+
+    def load_bars(self, symbol: str, timeframe: str, count: int) -> Optional[np.ndarray]:
+        """Newest `count` stored bars, oldest first, or None if there is no history"""
+        try:
+            series_dir = self._bar_partition(symbol, timeframe)
+            if not os.path.isdir(series_dir):
+                return None
             
-            alert_data['id'] = datetime.now().strftime("%Y%m%d%H%M%S")
-            alert_data['created'] = datetime.now().isoformat()
-            alerts.append(alert_data)
+            parts = []
+            loaded = 0
+            for month in sorted(os.listdir(series_dir), reverse=True):
+                month_bars = self._read_partition(os.path.join(series_dir, month))
+                parts.append(month_bars)
+                loaded += len(month_bars)
+                if loaded >= count:
+                    break
+            if not loaded:
+                return None
             
-            with open(alerts_file, 'w', encoding='utf-8') as f:
-                json.dump(alerts, f, indent=2, ensure_ascii=False)
+            bars = np.concatenate(parts[::-1])[-count:]
+            self.bar_stats['bars_loaded'] += len(bars)
+            return bars
+            
+        except Exception as e:
+            print(f"⚠️ Error loading bar history for {symbol} {timeframe}: {e}")
+            return None
+
+    def last_stored_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Raw server time of the newest stored bar - from chunk names, no file reads"""
+        key = (symbol, timeframe)
+        if key not in self._last_stored:
+            series_dir = self._bar_partition(symbol, timeframe)
+            months = sorted(os.listdir(series_dir), reverse=True) if os.path.isdir(series_dir) else []
+            last = None
+            for month in months:
+                chunks = self._list_chunks(os.path.join(series_dir, month))
+                if chunks:
+                    last = max(int(name.split('_')[1].split('.')[0]) for name in chunks)
+                    break
+            self._last_stored[key] = last
+        return self._last_stored[key]
+
+    def _bar_partition(self, symbol: str, timeframe: str, month: Optional[str] = None) -> str:
+        """Directory of a series, or of one month of it"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        path = os.path.join(self.bars_dir, safe_symbol, timeframe)
+        return os.path.join(path, month) if month else path
+
+    def _list_chunks(self, partition: str) -> List[str]:
+        if not os.path.isdir(partition):
+            return []
+        return sorted(name for name in os.listdir(partition) if name.endswith('.npz'))
+
+    def _write_chunk(self, partition: str, bars: np.ndarray):
+        """Write one chunk atomically - temp file in the same directory, then rename"""
+        os.makedirs(partition, exist_ok=True)
+        name = f"{int(bars['time'][0])}_{int(bars['time'][-1])}.npz"
+        path = os.path.join(partition, name)
+        replaced = os.path.getsize(path) if os.path.exists(path) else None
+        fd, temp_path = tempfile.mkstemp(dir=partition, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **{field: bars[field] for field in BAR_DTYPE.names})
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        if replaced is None:
+            self._count_chunk(partition, 1, os.path.getsize(path))
+        else:
+            self._count_chunk(partition, 0, os.path.getsize(path) - replaced)
+
+    def _read_partition(self, partition: str) -> np.ndarray:
+        """All bars of one month, oldest first, duplicates (interrupted compaction) dropped"""
+        chunks = []
+        for name in self._list_chunks(partition):
+            with np.load(os.path.join(partition, name)) as columns:
+                chunks.append(self._as_bar_records(columns, len(columns['time'])))
+        if not chunks:
+            return np.zeros(0, dtype=BAR_DTYPE)
+        bars = np.concatenate(chunks)
+        bars = bars[np.argsort(bars['time'], kind='stable')]
+        keep = np.r_[bars['time'][1:] != bars['time'][:-1], True]   # last write of a time wins
+        return bars[keep]
+
+    def _as_bar_records(self, columns, count: int) -> np.ndarray:
+        """Copy rate columns (MT5 rates, npz chunk) into BAR_DTYPE records"""
+        names = columns.dtype.names if hasattr(columns, 'dtype') else columns.files
+        records = np.zeros(count, dtype=BAR_DTYPE)
+        for field in BAR_DTYPE.names:
+            if field in names:
+                records[field] = columns[field]
+        return records
+
+    def _compact_partition(self, partition: str):
+        """Merge a month's chunks into one - new chunk lands before the old ones are removed"""
+        old_chunks = self._list_chunks(partition)
+        bars = self._read_partition(partition)
+        self._write_chunk(partition, bars)
+        merged = f"{int(bars['time'][0])}_{int(bars['time'][-1])}.npz"
+        for name in old_chunks:
+            if name != merged:
+                path = os.path.join(partition, name)
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._count_chunk(partition, -1, -size)
+        self.bar_stats['compactions'] += 1
+
+    def _count_chunk(self, partition: str, chunks: int, size: int):
+        """Update the running disk totals - caller holds the bars lock"""
+        if self._bar_disk is None:
+            return
+        self._bar_disk['series'].add(os.path.dirname(os.path.relpath(partition, self.bars_dir)))
+        self._bar_disk['chunks'] += chunks
+        self._bar_disk['bytes'] += size
+
+    def get_bar_history_stats(self) -> Dict[str, Any]:
+        """Stored series, chunk files and bytes on disk - running totals after one initial scan"""
+        with self._bars_lock:
+            if self._bar_disk is None:
+                self._bar_disk = {'series': set(), 'chunks': 0, 'bytes': 0}
+                for root, _, files in os.walk(self.bars_dir):
+                    for name in files:
+                        if name.endswith('.npz'):
+                            self._count_chunk(root, 1, os.path.getsize(os.path.join(root, name)))
+            disk = {'series': len(self._bar_disk['series']), 'chunks': self._bar_disk['chunks'],
+                    'bytes': self._bar_disk['bytes']}
+        return {**disk, **self.bar_stats, 'writer': self.bar_writer.get_stats(), 'mapped': self.get_mapped_stats()}
+
+    # ===========================================================
+    # 🗺️ MAPPED BAR FILES
+    # ===========================================================
+    def append_mapped_bars(self, symbol: str, timeframe: str, bars: np.ndarray) -> int:
+        """Append closed bars to the series' mapped file - writer side, collector only"""
+        try:
+            with self._mapped_lock:
+                series = self._mapped_series(symbol, timeframe)
+                count, last_time, capacity = self._mapped_writer_state(series, symbol, timeframe)
+                bars = np.sort(bars, order='time')
+                if count:
+                    bars = bars[bars['time'] > last_time]
+                if not len(bars):
+                    return 0
+                
+                # Full - roll over while no reference to the old mapping is held here
+                if count + len(bars) > capacity:
+                    self._grow_mapped_file(series, count + len(bars))
+                
+                # Records first, then the end offset - an aligned 8-byte store readers pick up whole
+                _, _, header, records = self._mapped_writers[series]
+                records[count:count + len(bars)] = self._as_bar_records(bars, len(bars))
+                header['last_time'] = int(bars['time'][-1])
+                header['count'] = count + len(bars)
+                return len(bars)
                 
+        except Exception as e:
+            print(f"❌ Error writing mapped bars for {symbol} {timeframe}: {e}")
+            return 0
+
+    def map_bars(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """Read-only zero-copy view of a series' mapped file, oldest first - safe from any process.
+
+        A file is never resized: the writer rolls over to the next generation and flags the
+        old header superseded, and the reader then maps the newest file instead.
+        """
+        series = self._mapped_series(symbol, timeframe)
+        reader = self._mapped_readers.get(series)
+        if reader is None or reader[0]['superseded'][0]:
+            # Release the superseded map - views handed out earlier keep it alive on their own
+            self._mapped_readers.pop(series, None)
+            reader = self._map_reader(series)
+            if reader is None:
+                return None
+        
+        header, records = reader
+        return records[:min(int(header['count'][0]), len(records))]
+
+    def close_mapped_bars(self):
+        """Flush and release the writer and reader mappings"""
+        with self._mapped_lock:
+            for _, mapped, _, _ in self._mapped_writers.values():
+                mapped.flush()
+            self._mapped_writers.clear()
+        self._mapped_readers.clear()
+
+    def _mapped_series(self, symbol: str, timeframe: str) -> str:
+        """File name stem of a series - its files are {stem}.{generation}.bars"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return f"{safe_symbol}_{timeframe}"
+
+    def _mapped_file(self, series: str, generation: int) -> str:
+        return os.path.join(self.mapped_dir, f"{series}.{generation}.bars")
+
+    def _mapped_generations(self, series: str) -> List[int]:
+        """Generations of a series on disk, oldest first"""
+        if not os.path.isdir(self.mapped_dir):
+            return []
+        pattern = re.compile(re.escape(series) + r'\.(\d+)\.bars')
+        return sorted(int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(self.mapped_dir)) if match)
+
+    def _map_reader(self, series: str) -> Optional[tuple]:
+        """Map the newest generation read-only - None if there is no valid file"""
+        for _ in range(3):
+            generations = self._mapped_generations(series)
+            if not generations:
+                return None
+            try:
+                mapped = np.memmap(self._mapped_file(series, generations[-1]), dtype=np.uint8, mode='r')
+            except (OSError, ValueError):
+                continue           # removed after a rollover between listing and mapping - list again
+            header = mapped[:MAPPED_HEADER.itemsize].view(MAPPED_HEADER)
+            if header['magic'][0] != MAPPED_MAGIC or header['record_size'][0] != BAR_DTYPE.itemsize:
+                print(f"⚠️ {series} is not a bar file of this version")
+                return None
+            reader = self._mapped_readers[series] = (header, mapped[MAPPED_HEADER.itemsize:].view(BAR_DTYPE))
+            return reader
+        return None
+
+    def _mapped_writer_state(self, series: str, symbol: str, timeframe: str) -> tuple:
+        """(count, last bar time, capacity) of the series' file, opening the writer on first use"""
+        _, _, header, records = self._mapped_writers.get(series) or self._open_mapped_writer(series, symbol, timeframe)
+        return int(header['count'][0]), int(header['last_time'][0]), len(records)
+
+    def _open_mapped_writer(self, series: str, symbol: str, timeframe: str) -> tuple:
+        """Map the newest generation for writing - a new series is seeded from the bar history"""
+        generations = self._mapped_generations(series)
+        if generations:
+            generation = generations[-1]
+        else:
+            seed = self.load_bars(symbol, timeframe, self.mapped_seed_bars)
+            seed = seed if seed is not None else np.zeros(0, dtype=BAR_DTYPE)
+            generation = 0
+            self._write_mapped_file(self._mapped_file(series, generation), seed,
+                                    max(self.mapped_initial_capacity, 2 * len(seed)))
+        
+        writer = self._map_writer(series, generation)
+        self._remove_superseded(series, generation)
+        return writer
+
+    def _write_mapped_file(self, path: str, records: np.ndarray, capacity: int):
+        """Complete file under a temp name, renamed into place - readers never see a partial one"""
+        header = np.zeros(1, dtype=MAPPED_HEADER)
+        header['magic'] = MAPPED_MAGIC
+        header['version'] = 1
+        header['header_size'] = MAPPED_HEADER.itemsize
+        header['record_size'] = BAR_DTYPE.itemsize
+        header['capacity'] = capacity
+        header['count'] = len(records)
+        header['last_time'] = int(records['time'][-1]) if len(records) else 0
+        
+        os.makedirs(self.mapped_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.mapped_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header.tobytes())
+                f.write(records.tobytes())
+                f.truncate(MAPPED_HEADER.itemsize + capacity * BAR_DTYPE.itemsize)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _map_writer(self, series: str, generation: int) -> tuple:
+        mapped = np.memmap(self._mapped_file(series, generation), dtype=np.uint8, mode='r+')
+        header = mapped[:MAPPED_HEADER.itemsize].view(MAPPED_HEADER)
+        records = mapped[MAPPED_HEADER.itemsize:].view(BAR_DTYPE)
+        writer = self._mapped_writers[series] = (generation, mapped, header, records)
+        return writer
+
+    def _grow_mapped_file(self, series: str, needed: int):
+        """Roll over to the next generation with at least double the capacity.
+
+        A mapped file cannot be truncated on Windows, so the committed records are copied
+        into a new, larger file. The old one is flagged superseded, its mapping dropped
+        and the file removed once no reader holds it.
+        """
+        generation, mapped, header, records = self._mapped_writers.pop(series)
+        count = int(header['count'][0])
+        self._write_mapped_file(self._mapped_file(series, generation + 1), records[:count],
+                                max(2 * len(records), needed))
+        header['superseded'] = 1
+        mapped.flush()
+        del mapped, header, records
+        
+        self._map_writer(series, generation + 1)
+        self._remove_superseded(series, generation + 1)
+
+    def _remove_superseded(self, series: str, current: int):
+        """Delete older generations - on Windows a file still mapped by a reader stays until next time"""
+        for generation in self._mapped_generations(series):
+            if generation < current:
+                try:
+                    os.remove(self._mapped_file(series, generation))
+                except OSError:
+                    pass
+
+    def get_mapped_stats(self) -> Dict[str, Any]:
+        """Current mapped files, bars and bytes on disk - superseded files not yet removed are stale"""
+        if not os.path.isdir(self.mapped_dir):
+            return {'files': 0, 'stale_files': 0, 'bars': 0, 'bytes': 0, 'writers': 0}
+        files = stale = bars = size = 0
+        for name in os.listdir(self.mapped_dir):
+            if not name.endswith('.bars'):
+                continue
+            path = os.path.join(self.mapped_dir, name)
+            try:
+                with open(path, 'rb') as f:
+                    header = np.frombuffer(f.read(MAPPED_HEADER.itemsize), dtype=MAPPED_HEADER)
+                size += os.path.getsize(path)
+            except (OSError, ValueError):
+                continue           # removed by a rollover meanwhile
+            if len(header) and header['superseded'][0]:
+                stale += 1
+            elif len(header):
+                files += 1
+                bars += int(header['count'][0])
+        return {'files': files, 'stale_files': stale, 'bars': bars, 'bytes': size, 'writers': len(self._mapped_writers)}
+
+    # ===========================================================
+    # 🔔 ALERTS STORAGE
+    # ===========================================================
+    def save_alert(self, alert_data: Dict[str, Any]):
+        """Save trading alert - sets its monotonic id and created time"""
+        try:
+            saved = self.alert_store.add(alert_data)
+            alert_data['id'] = saved['id']
+            alert_data['created'] = saved['created']
             print(f"🔔 Alert saved: {alert_data.get('message', 'Unknown')}")
             return True
             
@@ -103,17 +943,17 @@ class StorageLayer:
             print(f"❌ Error saving alert: {e}")
             return False
 
-    def load_alerts(self) -> list:
-        """Load all alerts"""
+    def load_alerts(self, limit: int = 1000, **filters) -> list:
+        """Load alerts, newest first - filters as in query_alerts"""
         try:
-            alerts_file = os.path.join(self.data_dir, "alerts.json")
-            if os.path.exists(alerts_file):
-                with open(alerts_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except:
-            pass
-        
-        return []
+            return self.alert_store.query(limit=limit, **filters)['alerts']
+        except Exception as e:
+            print(f"⚠️ Error loading alerts: {e}")
+            return []
+
+    def query_alerts(self, **filters) -> Dict[str, Any]:
+        """One page of alerts - symbol, status, since, until, before (cursor), limit"""
+        return self.alert_store.query(**filters)
 
 # Singleton instance
 storage_layer = StorageLayer()
\ No newline at end of file
@@ -0,0 +1,33 @@
+# ===============================================================
+# 🧪 TEST FIXTURES - SYNTHETIC BARS
+# ===============================================================
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+def make_bars(tf: str, count: int, end: str = "2024-03-08 16:00", seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV bars newest first, the order the connector returns them in"""
+    rng = np.random.default_rng(seed)
+    step = pd.Timedelta(minutes=config.TIMEFRAME_DURATIONS[tf])
+    times = pd.date_range(end=pd.Timestamp(end).floor(step), periods=count, freq=step)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, count))
+    open_ = np.r_[close[0] - 0.0002, close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0004, count)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0004, count)
+    df = pd.DataFrame({
+        "time": times,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "tick_volume": rng.integers(50, 500, count),
+    })
+    return df.iloc[::-1].reset_index(drop=True)
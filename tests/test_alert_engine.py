@@ -0,0 +1,182 @@
+# ===============================================================
+# 🧪 ALERT ENGINE - LEVEL INDEX BOUNDS AND ALERT LIFECYCLE
+# ===============================================================
+
+import time
+
+import numpy as np
+import pytest
+
+from alert_engine import AlertEngine, LevelIndex
+from bar_store import bar_store
+from storage_manager import AlertStore, BAR_DTYPE, storage_layer
+
+
+def make_rates(bars) -> np.ndarray:
+    """MT5-style rates from (epoch seconds, open, high, low, close) tuples"""
+    rates = np.zeros(len(bars), dtype=BAR_DTYPE)
+    for field, values in zip(('time', 'open', 'high', 'low', 'close'), zip(*bars)):
+        rates[field] = values
+    return rates
+
+
+def make_index() -> LevelIndex:
+    index = LevelIndex()
+    for alert_id, level in enumerate([1.0, 2.0, 2.0, 3.0, 4.0]):
+        index.add(level, alert_id)
+    return index
+
+
+@pytest.mark.parametrize("include_low, include_high, expected", [
+    (True, True, [1, 2, 3]),
+    (False, True, [3]),
+    (True, False, [1, 2]),
+    (False, False, []),
+])
+def test_pop_range_bounds(include_low, include_high, expected):
+    index = make_index()
+    assert index.pop_range(2.0, 3.0, include_low, include_high) == expected
+    assert len(index) == 5 - len(expected)
+    assert index.levels == sorted(index.levels)
+
+
+def test_pop_range_outside_and_open_ended():
+    index = make_index()
+    assert index.pop_range(4.5, 9.0, True, True) == []
+    assert index.pop_range(float('-inf'), 1.0, True, False) == []
+    assert index.pop_range(float('-inf'), 1.0, True, True) == [0]
+    assert index.pop_range(2.0, float('inf'), True, True) == [1, 2, 3, 4]
+    assert len(index) == 0
+
+
+def test_remove_picks_the_right_duplicate():
+    index = make_index()
+    assert index.remove(2.0, 2)
+    assert not index.remove(2.0, 2)
+    assert index.ids == [0, 1, 3, 4]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    store = AlertStore(str(tmp_path / "alerts.db"))
+    monkeypatch.setattr(storage_layer, 'alert_store', store)
+    yield AlertEngine()
+    store.close()
+
+
+def test_price_alert_fires_once_when_crossed(engine):
+    alert = engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.1, 'direction': 'above'})
+    engine.on_price('EURUSD', 1.09)
+    engine.on_price('EURUSD', 1.1)
+    engine.on_price('EURUSD', 1.09)
+    engine.on_price('EURUSD', 1.11)
+    assert [recent['id'] for recent in engine.get_recent()] == [alert['id']]
+    assert storage_layer.alert_store.get(alert['id'])['status'] == 'triggered'
+    assert engine.get_stats()['active'] == 0
+
+
+def test_dismiss_only_active_alerts(engine):
+    active = engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.2, 'direction': 'cross'})
+    fired = engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.1, 'direction': 'below'})
+    engine.on_price('EURUSD', 1.15)
+    engine.on_price('EURUSD', 1.05)
+
+    assert engine.dismiss(active['id'])['status'] == 'dismissed'
+    assert engine.get_stats()['price_levels'] == 0
+    with pytest.raises(ValueError):
+        engine.dismiss(active['id'])
+    with pytest.raises(ValueError):
+        engine.dismiss(fired['id'])
+    assert storage_layer.alert_store.get(fired['id'])['status'] == 'triggered'
+    with pytest.raises(KeyError):
+        engine.dismiss(9999)
+
+
+def test_compaction_purges_expired_alerts_from_the_indexes(engine):
+    expiring = engine.add_alert({'symbol': 'EURUSD', 'type': 'indicator', 'timeframe': 'H1',
+                                 'indicator': 'rsi', 'operator': '>', 'value': 70,
+                                 'expires': time.time() + 60})
+    kept = engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.3, 'direction': 'above'})
+    assert engine.get_stats()['thresholds'] == 1
+
+    assert storage_layer.alert_store.compact(now=time.time() + 120) == 1
+    stats = engine.get_stats()
+    assert (stats['active'], stats['thresholds'], stats['price_levels']) == (1, 0, 1)
+    assert storage_layer.alert_store.get(expiring['id']) is None
+    assert storage_layer.alert_store.get(kept['id'])['status'] == 'active'
+
+
+def test_dismiss_between_pop_and_store_keeps_the_dismissal(engine, monkeypatch):
+    alert = engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.1, 'direction': 'above'})
+    finish = engine._finish
+
+    def dismiss_then_finish(started, fired):
+        if fired:
+            engine.dismiss(alert['id'])
+        finish(started, fired)
+
+    monkeypatch.setattr(engine, '_finish', dismiss_then_finish)
+    engine.on_price('EURUSD', 1.09)
+    engine.on_price('EURUSD', 1.11)
+
+    assert storage_layer.alert_store.get(alert['id'])['status'] == 'dismissed'
+    assert engine.get_recent() == []
+    assert engine.get_stats()['triggered'] == 0
+
+
+def test_wick_through_a_level_fires_it(engine):
+    ring = bar_store.ring('WICKTEST', engine.base_tf)
+    ring.load_rates(make_rates([(0, 1.09, 1.09, 1.09, 1.09)]), offset_ms=0)
+    above = engine.add_alert({'symbol': 'WICKTEST', 'type': 'price', 'level': 1.11, 'direction': 'above'})
+    below = engine.add_alert({'symbol': 'WICKTEST', 'type': 'price', 'level': 1.08, 'direction': 'below'})
+    try:
+        engine.on_update('WICKTEST')
+        ring.update_forming(high=1.12, close=1.09)         # up through 1.11 and back within the bar
+        engine.on_update('WICKTEST')
+        assert [recent['id'] for recent in engine.get_recent()] == [above['id']]
+
+        # Already-seen highs do not fire alerts armed after them
+        late = engine.add_alert({'symbol': 'WICKTEST', 'type': 'price', 'level': 1.115, 'direction': 'above'})
+        engine.on_update('WICKTEST')
+        assert storage_layer.alert_store.get(late['id'])['status'] == 'active'
+
+        # A bar opened since the previous evaluation counts whole
+        ring.merge_rates(make_rates([(60, 1.09, 1.09, 1.07, 1.09)]), offset_ms=0)
+        engine.on_update('WICKTEST')
+        assert storage_layer.alert_store.get(below['id'])['status'] == 'triggered'
+        assert engine.get_recent()[0]['trigger_value'] == 1.07
+    finally:
+        bar_store.drop('WICKTEST')
+
+
+def test_chunked_index_matches_a_sorted_list():
+    rng = np.random.default_rng(7)
+    index = LevelIndex()
+    index.CHUNK = 4
+    reference = []
+    for alert_id in range(400):
+        level = float(rng.integers(0, 60))
+        index.add(level, alert_id)
+        reference.append((level, alert_id))
+        if alert_id % 7 == 0:
+            level, removed = reference.pop(int(rng.integers(0, len(reference))))
+            assert index.remove(level, removed)
+        if alert_id % 25 == 0:
+            low, high = sorted(float(value) for value in rng.integers(0, 60, 2))
+            expected = {removed for level, removed in reference if low < level <= high}
+            assert set(index.pop_range(low, high, False, True)) == expected
+            reference = [(level, kept) for level, kept in reference if kept not in expected]
+        assert len(index) == len(reference)
+        assert index.levels == sorted(level for level, _ in reference)
+    assert len(index.chunks) > 1
+    assert all(len(levels) <= 2 * index.CHUNK for levels, _ in index.chunks)
+    assert index.maxes == [levels[-1] for levels, _ in index.chunks]
+
+
+def test_settings_count_armed_alerts(engine):
+    engine.add_alert({'symbol': 'EURUSD', 'type': 'price', 'level': 1.2, 'direction': 'cross'})
+    engine.add_alert({'symbol': 'EURUSD', 'type': 'indicator', 'timeframe': 'H1',
+                      'indicator': 'rsi', 'operator': '<', 'value': 30})
+    settings = engine.get_settings()
+    assert settings['price_alerts'] and settings['indicator_alerts']
+    assert settings['armed'] == {'price': 1, 'indicator': 1}
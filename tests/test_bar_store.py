@@ -0,0 +1,108 @@
+# ===============================================================
+# 🧪 BAR STORE - RING WINDOW AND COMPACTION
+# ===============================================================
+
+import threading
+import time
+
+import numpy as np
+
+from bar_store import BarRing
+from storage_manager import BAR_DTYPE
+
+
+def make_rates(first: int, count: int) -> np.ndarray:
+    """MT5-style rates for minute bars first..first+count-1, close = open + 1 on even bars"""
+    rates = np.zeros(count, dtype=BAR_DTYPE)
+    minutes = np.arange(first, first + count)
+    rates['time'] = minutes * 60
+    rates['open'] = minutes.astype(float)
+    rates['close'] = minutes + (minutes % 2 == 0)
+    rates['high'] = rates['close'] + 0.5
+    rates['low'] = rates['open'] - 0.5
+    rates['tick_volume'] = minutes
+    return rates
+
+
+def test_compaction_keeps_window_and_old_views():
+    ring = BarRing(capacity=8, slack=4)
+    ring.load_rates(make_rates(0, 8), offset_ms=0)
+    before = ring.views(('time', 'close'))
+
+    # 4 bars fill the slack, the 5th moves the window to a fresh buffer
+    for minute in range(8, 13):
+        assert ring.merge_rates(make_rates(minute, 1), offset_ms=0) == 1
+    assert ring.compactions == 1
+    assert len(ring) == 8
+
+    views = ring.views()
+    assert views['time'].tolist() == [minute * 60_000 for minute in range(5, 13)]
+    assert views['tick_volume'].tolist() == list(range(5, 13))
+    assert views['dir'].tolist() == [1 if minute % 2 == 0 else 0 for minute in range(5, 13)]
+    assert ring.newest_time() == 12 * 60_000
+
+    # Views taken before the compaction still see the bars they were taken over
+    assert before['time'].tolist() == [minute * 60_000 for minute in range(8)]
+    assert not before['close'].flags.writeable
+
+
+def test_window_slides_without_compaction_inside_slack():
+    ring = BarRing(capacity=8, slack=4)
+    ring.load_rates(make_rates(0, 8), offset_ms=0)
+    ring.merge_rates(make_rates(8, 3), offset_ms=0)
+    assert ring.compactions == 0
+    assert ring.views(('time',))['time'].tolist() == [minute * 60_000 for minute in range(3, 11)]
+
+
+def test_forming_updates_write_in_place_and_bump_version():
+    ring = BarRing(capacity=8, slack=4)
+    ring.load_rates(make_rates(0, 8), offset_ms=0)
+    version = ring.version
+
+    forming = make_rates(7, 1)
+    forming['close'] = 3.0
+    assert ring.merge_rates(forming, offset_ms=0) == 0
+    assert ring.newest('close') == 3.0
+    assert ring.newest('dir') == -1
+    assert ring.version > version
+
+    frame = ring.to_frame()
+    assert frame['close'].iloc[0] == 3.0
+    assert frame['time'].iloc[0] > frame['time'].iloc[1]
+
+
+def test_readers_never_see_a_half_written_forming_bar():
+    ring = BarRing(capacity=64)
+    ring.load_rates(make_rates(0, 64), offset_ms=0)
+    stop = threading.Event()
+
+    def write():
+        price = 0.0
+        while not stop.is_set():
+            price += 1.0
+            ring.update_forming(high=price + 1, low=price - 1, close=price, tick_volume=int(price))
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        deadline = time.monotonic() + 0.5
+        reads = 0
+        while time.monotonic() < deadline:
+            # A reader takes its time over the frame while the writer keeps going
+            version, frame = ring.versioned_frame()
+            high = frame['high'].iloc[0]
+            time.sleep(0.0005)
+            close, low, volume = frame['close'].iloc[0], frame['low'].iloc[0], frame['tick_volume'].iloc[0]
+            assert high - close == 1 and close - low == 1 and volume == close
+            assert version <= ring.version
+            reads += 1
+    finally:
+        stop.set()
+        writer.join()
+    assert reads > 0
+
+    # One snapshot per write, shared by every reader until the next
+    assert ring.views()['close'] is ring.views()['close']
+    before = ring.views()['close']
+    ring.update_forming(close=-1.0)
+    assert before[-1] != -1.0 and ring.views()['close'][-1] == -1.0
@@ -0,0 +1,82 @@
+# ===============================================================
+# 🧪 INDICATOR ENGINE - STREAMING VS BATCH
+# ===============================================================
+
+import math
+
+import pytest
+
+from conftest import make_bars
+from indicator_engine import IndicatorEngine
+from pyramid_engine import PyramidEngine
+
+BATCH = PyramidEngine()
+PERIODS = BATCH._get_periods()
+PERIODS_KEY = BATCH._normalize_periods()
+
+
+def batch_values(df) -> dict:
+    """Current values the chart endpoint serves for a newest-first frame"""
+    values, _ = BATCH.get_indicator_results("EURUSD", {"H1": df}, "H1", output_format="binary")
+    return values
+
+
+def assert_chart_matches(streaming: dict, df):
+    """Streaming values equal the chart endpoint's; ATR (not served there) equals the batch ATR"""
+    streaming = dict(streaming)
+    atr = streaming.pop('atr')
+    assert_matches(streaming, batch_values(df))
+    true_range = BATCH.calculate_momentum_analysis(df.iloc[::-1].reset_index(drop=True))['ATR']
+    assert math.isclose(atr, float(true_range.iloc[-1]), rel_tol=1e-9, abs_tol=1e-12)
+
+
+def assert_matches(streaming: dict, batch: dict):
+    assert set(streaming) == set(batch)
+    for name, value in batch.items():
+        assert math.isclose(streaming[name], value, rel_tol=1e-9, abs_tol=1e-12), name
+
+
+@pytest.fixture
+def engine():
+    return IndicatorEngine()
+
+
+def test_rebuild_matches_batch(engine):
+    df = make_bars('H1', 300)
+    assert_chart_matches(engine.update("EURUSD", "H1", df, PERIODS, PERIODS_KEY), df)
+
+
+def test_forming_updates_and_closed_bars_match_batch(engine):
+    history = make_bars('H1', 320, seed=3)
+    window = 300
+    engine.update("EURUSD", "H1", history.iloc[20:20 + window].reset_index(drop=True), PERIODS, PERIODS_KEY)
+
+    for newest in range(19, -1, -1):
+        df = history.iloc[newest:newest + window].reset_index(drop=True)
+
+        # The forming bar ticks before the next fetch closes it
+        ticking = df.copy()
+        ticking.loc[0, "close"] = ticking.loc[0, "open"] + 0.0004
+        ticking.loc[0, "high"] = max(ticking.loc[0, "high"], ticking.loc[0, "close"])
+        assert_chart_matches(engine.update("EURUSD", "H1", ticking, PERIODS, PERIODS_KEY), ticking)
+        assert_chart_matches(engine.update("EURUSD", "H1", df, PERIODS, PERIODS_KEY), df)
+
+    stats = engine.get_stats()
+    assert stats['rebuilds'] == 1
+    assert stats['closed_bars'] == 20
+
+
+def test_gap_rebuilds(engine):
+    history = make_bars('H1', 320, seed=5)
+    engine.update("EURUSD", "H1", history.iloc[10:].reset_index(drop=True), PERIODS, PERIODS_KEY)
+    df = history.iloc[:300].reset_index(drop=True)
+    assert_chart_matches(engine.update("EURUSD", "H1", df, PERIODS, PERIODS_KEY), df)
+    assert engine.get_stats()['rebuilds'] == 2
+
+
+def test_chart_values_are_the_newest_bar():
+    df = make_bars('H1', 300, seed=9)
+    values, chart = BATCH.get_indicator_results("EURUSD", {"H1": df}, "H1")
+    assert math.isclose(values['sma_20'], df['close'].iloc[:20].mean(), rel_tol=1e-12)
+    newest = max(chart['sma_20'], key=lambda point: point['x'])
+    assert math.isclose(newest['y'], values['sma_20'], rel_tol=1e-12)
@@ -0,0 +1,128 @@
+# ===============================================================
+# 🧪 MT5 CONNECTOR - TICK PAGING
+# ===============================================================
+
+import numpy as np
+import pytest
+
+pytest.importorskip("MetaTrader5")
+
+import mt5_connector as connector_module
+from bar_store import BarStore
+from mt5_connector import MT5Connector
+from storage_manager import BAR_DTYPE
+
+TICK_DTYPE = np.dtype([('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+                       ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8')])
+BAR_OPEN = 1_704_067_200        # forming M1 bar, server time
+
+
+class TickFeed:
+    """copy_ticks_from / copy_ticks_range over a fixed tick tape - whole-second bounds"""
+    def __init__(self, times_msc):
+        self.ticks = np.zeros(len(times_msc), dtype=TICK_DTYPE)
+        self.ticks['time_msc'] = times_msc
+        self.ticks['time'] = self.ticks['time_msc'] // 1000
+        self.ticks['bid'] = 1.1 + np.arange(len(times_msc)) * 1e-6
+        self.calls = 0
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        self.calls += 1
+        start = int(date_from.timestamp()) * 1000
+        return self.ticks[self.ticks['time_msc'] >= start][:count]
+
+    def copy_ticks_range(self, symbol, date_from, date_to, flags):
+        self.calls += 1
+        start, end = int(date_from.timestamp()) * 1000, int(date_to.timestamp()) * 1000
+        return self.ticks[(self.ticks['time_msc'] >= start) & (self.ticks['time_msc'] <= end)]
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    connector = MT5Connector()
+    connector.bar_store = BarStore(capacity=10)
+    connector.connected = True
+    connector.tick_batch = 100
+    connector.configure_rate_limit(0)
+    monkeypatch.setattr(connector, 'detect_symbol_suffix', lambda symbol: symbol)
+
+    rates = np.zeros(1, dtype=BAR_DTYPE)
+    rates['time'] = BAR_OPEN
+    rates[['open', 'high', 'low', 'close']] = (1.1, 1.1, 1.1, 1.1)
+    connector.bar_store.ring("EURUSD", "M1").load_rates(rates, connector._offset_ms())
+    return connector
+
+
+def ingest_all(connector, feed, monkeypatch, mark, polls=10) -> int:
+    monkeypatch.setattr(connector_module.mt5, 'copy_ticks_from', feed.copy_ticks_from, raising=False)
+    monkeypatch.setattr(connector_module.mt5, 'copy_ticks_range', feed.copy_ticks_range, raising=False)
+    connector._tick_marks[("EURUSD", "M1")] = mark
+    return sum(connector.ingest_ticks("EURUSD", "M1") for _ in range(polls))
+
+
+def test_crowded_second_does_not_stall(connector, monkeypatch):
+    # 250 ticks in one second, the mark sits after the first 150 of them
+    second = (BAR_OPEN + 5) * 1000
+    times = np.r_[second + np.arange(250) * 3, (BAR_OPEN + 6) * 1000 + np.arange(20)]
+    feed = TickFeed(times)
+    applied = ingest_all(connector, feed, monkeypatch, mark=int(times[149]))
+
+    assert applied == 120
+    assert connector._tick_marks[("EURUSD", "M1")] == int(times[-1])
+    assert connector.bar_store.get("EURUSD", "M1").newest('tick_volume') == 120
+
+
+def test_crowded_second_is_paged_by_time_not_skipped(connector, monkeypatch):
+    # Far more ticks in the mark's second than a batch - the rest of it still lands, extremes included
+    second = (BAR_OPEN + 5) * 1000
+    times = np.r_[second + np.arange(500), (BAR_OPEN + 6) * 1000 + np.arange(10)]
+    feed = TickFeed(times)
+    feed.ticks['bid'][470] = 1.2
+    applied = ingest_all(connector, feed, monkeypatch, mark=int(times[450]), polls=3)
+
+    ring = connector.bar_store.get("EURUSD", "M1")
+    assert applied == 59
+    assert ring.newest('high') == 1.2
+    assert connector.tick_stats['crowded_seconds'] >= 1
+    assert connector._tick_marks[("EURUSD", "M1")] == int(times[-1])
+
+
+def test_fetch_rebases_tick_volume(connector, monkeypatch):
+    # The fetched bar already counts the ticks up to the fetch - only later ones are added
+    times = (BAR_OPEN + 5) * 1000 + np.arange(0, 40, 2)
+    feed = TickFeed(times)
+    ingest_all(connector, feed, monkeypatch, mark=int(times[4]), polls=1)
+    assert connector.bar_store.get("EURUSD", "M1").newest('tick_volume') == 15
+
+    rates = np.zeros(1, dtype=BAR_DTYPE)
+    rates['time'] = BAR_OPEN
+    rates[['open', 'high', 'low', 'close', 'tick_volume']] = (1.1, 1.1, 1.1, 1.1, 30)
+    connector.bar_store.ring("EURUSD", "M1").load_rates(rates, connector._offset_ms())
+    tick = type('Tick', (), {'time_msc': int(times[9])})
+    monkeypatch.setattr(connector_module.mt5, 'symbol_info_tick', lambda symbol: tick, raising=False)
+    connector._rebase_forming(("EURUSD", "M1"), "EURUSD")
+
+    assert connector.ingest_ticks("EURUSD", "M1") == 10
+    assert connector.bar_store.get("EURUSD", "M1").newest('tick_volume') == 40
+
+
+def test_roll_up_volume_is_counted_per_timeframe(connector):
+    store = connector.bar_store
+    for timeframe, volume in (("M5", 100), ("H1", 1000)):
+        rates = np.zeros(1, dtype=BAR_DTYPE)
+        rates['time'] = BAR_OPEN
+        rates[['open', 'high', 'low', 'close', 'tick_volume']] = (1.1, 1.1, 1.1, 1.1, volume)
+        store.ring("EURUSD", timeframe).load_rates(rates, connector._offset_ms())
+    source = store.get("EURUSD", "M1")
+    connector.roll_up_forming_bar("EURUSD", "M1")
+
+    source.update_forming(tick_volume=5)
+    connector.roll_up_forming_bar("EURUSD", "M1")
+    # H1 fetched again - its bar now counts those 5 source ticks itself
+    store.get("EURUSD", "H1").update_forming(tick_volume=1005)
+    connector._rebase_forming(("EURUSD", "H1"), "EURUSD")
+    source.update_forming(tick_volume=8)
+    connector.roll_up_forming_bar("EURUSD", "M1")
+
+    assert store.get("EURUSD", "M5").newest('tick_volume') == 108
+    assert store.get("EURUSD", "H1").newest('tick_volume') == 1008
@@ -0,0 +1,101 @@
+# ===============================================================
+# 🧪 PYRAMID ENGINE - BUILD EQUIVALENCE
+# ===============================================================
+
+from datetime import timedelta
+
+import pandas as pd
+
+import config
+from conftest import make_bars
+from pyramid_engine import PyramidEngine
+
+STRUCTURE = ['D1', 'H4', 'H1', 'M15']
+COUNTS = {'D1': 12, 'H4': 60, 'H1': 200, 'M15': 300}
+
+
+def make_engine() -> PyramidEngine:
+    engine = PyramidEngine()
+    engine.configure_pyramid("EURUSD", STRUCTURE, "daily", 0)
+    return engine
+
+
+def make_data(engine: PyramidEngine, end: str = "2024-03-08 16:00") -> dict:
+    return {
+        tf: engine.calculate_momentum_analysis(make_bars(tf, COUNTS[tf], end, seed))
+        for seed, tf in enumerate(STRUCTURE)
+    }
+
+
+def next_fetch(engine: PyramidEngine) -> tuple:
+    """Two consecutive fetches of the same history - a new M15 bar opens, the other forming bars tick"""
+    before, after = {}, {}
+    for seed, tf in enumerate(STRUCTURE):
+        bars = make_bars(tf, COUNTS[tf] + 1, "2024-03-08 16:15", seed)
+        if tf == STRUCTURE[-1]:
+            old, new = bars.iloc[1:], bars.iloc[:-1]
+        else:
+            old, new = bars.iloc[:-1].copy(), bars.iloc[:-1].copy()
+            old.loc[0, ["close", "high"]] = old.loc[0, "open"] + 0.0003
+        before[tf] = engine.calculate_momentum_analysis(old.reset_index(drop=True))
+        after[tf] = engine.calculate_momentum_analysis(new.reset_index(drop=True))
+    return before, after
+
+
+def reference_blocks(engine: PyramidEngine, data: dict) -> list:
+    """The original row-by-row builder: boolean filter per parent, iterrows per child"""
+    def block(df, row, tf, index, level):
+        return {
+            "tf": tf,
+            "time": row["time"].isoformat(),
+            "range": engine.get_time_range(row["time"], tf),
+            "O": round(row["open"], 5),
+            "H": round(row["high"], 5),
+            "L": round(row["low"], 5),
+            "C": round(row["close"], 5),
+            "volume": int(row.get("tick_volume", 0)),
+            "dir": row["Dir"],
+            "momentum_summary": engine.get_momentum_summary(df, index),
+            "children": get_children(row["time"], tf, level)
+        }
+
+    def get_children(parent_time, parent_tf, level):
+        if level + 1 >= len(STRUCTURE):
+            return []
+        child_tf = STRUCTURE[level + 1]
+        df = data[child_tf]
+        end = parent_time + timedelta(minutes=config.TIMEFRAME_DURATIONS[parent_tf])
+        children_df = df[(df["time"] >= parent_time) & (df["time"] < end)]
+        return [block(df, row, child_tf, df[df["time"] == row["time"]].index[0], level + 1)
+                for _, row in children_df.iterrows()]
+
+    base_df = data[STRUCTURE[0]].iloc[:engine.extract_count]
+    return [block(base_df, row, STRUCTURE[0], base_df[base_df["time"] == row["time"]].index[0], 0)
+            for _, row in base_df.iterrows()]
+
+
+def test_build_matches_row_by_row_reference():
+    engine = make_engine()
+    data = make_data(engine)
+    pyramid = engine.build_pyramid_json(data)
+    assert pyramid["structure"] == STRUCTURE
+    assert pyramid["blocks"] == reference_blocks(engine, data)
+
+
+def test_incremental_build_matches_cold_build():
+    engine = make_engine()
+    before, data = next_fetch(engine)
+    engine.build_pyramid_json(before)
+    warm = engine.build_pyramid_json(data)
+    assert engine.last_build_stats["reused"] > 0
+
+    cold = make_engine().build_pyramid_json(data)
+    assert warm["blocks"] == cold["blocks"]
+    assert warm["blocks"] == reference_blocks(engine, data)
+
+
+def test_empty_base_timeframe_gives_empty_pyramid():
+    engine = make_engine()
+    data = make_data(engine)
+    data['D1'] = pd.DataFrame(columns=data['D1'].columns)
+    assert engine.build_pyramid_json(data)["blocks"] == []
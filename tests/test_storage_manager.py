@@ -0,0 +1,174 @@
+# ===============================================================
+# 🧪 STORAGE LAYER - BAR HISTORY CHUNKS
+# ===============================================================
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import storage_manager
+from storage_manager import StorageLayer, SnapshotWriter, AlertStore, BAR_DTYPE
+
+
+def make_rates(first: int, count: int, step: int = 3600) -> np.ndarray:
+    """MT5-style rates every `step` seconds from epoch second `first`"""
+    rates = np.zeros(count, dtype=BAR_DTYPE)
+    rates['time'] = first + np.arange(count) * step
+    rates['open'] = np.linspace(1.1, 1.2, count)
+    rates['close'] = rates['open'] + 0.001
+    rates['high'] = rates['close'] + 0.001
+    rates['low'] = rates['open'] - 0.001
+    rates['tick_volume'] = np.arange(count) + 1
+    return rates
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return StorageLayer()
+
+
+def test_chunks_round_trip_across_months(storage):
+    # 2024-01-30 00:00 UTC, hourly for 4 days - two month partitions
+    rates = make_rates(1706572800, 96)
+    assert storage.append_bars("EURUSD", "H1", rates[:50]) == 50
+    assert storage.append_bars("EURUSD", "H1", rates[40:]) == 46   # overlap is skipped
+
+    assert np.array_equal(storage.load_bars("EURUSD", "H1", 1000), rates)
+    assert np.array_equal(storage.load_bars("EURUSD", "H1", 10), rates[-10:])
+    assert sorted(os.listdir(storage._bar_partition("EURUSD", "H1"))) == ['2024-01', '2024-02']
+
+    # A restarted process finds the newest bar from chunk names alone
+    assert StorageLayer().last_stored_time("EURUSD", "H1") == int(rates['time'][-1])
+
+
+def test_compaction_keeps_bars_and_running_totals(storage):
+    storage.bar_chunk_limit = 3
+    storage.get_bar_history_stats()          # start the running totals before any writes
+    rates = make_rates(1704067200, 40, step=300)
+    for start in range(0, 40, 5):
+        storage.append_bars("EURUSD", "M5", rates[start:start + 5])
+
+    partition = storage._bar_partition("EURUSD", "M5", "2024-01")
+    assert len(storage._list_chunks(partition)) <= storage.bar_chunk_limit
+    assert storage.bar_stats['compactions'] > 0
+    assert np.array_equal(storage.load_bars("EURUSD", "M5", 100), rates)
+
+    # Running totals match a fresh scan of the directory
+    stats = storage.get_bar_history_stats()
+    scanned = StorageLayer().get_bar_history_stats()
+    assert (stats['series'], stats['chunks'], stats['bytes']) == (scanned['series'], scanned['chunks'], scanned['bytes'])
+    assert stats['chunks'] == len(storage._list_chunks(partition))
+
+
+def test_missing_history_loads_none(storage):
+    assert storage.load_bars("GBPUSD", "H1", 10) is None
+    assert storage.last_stored_time("GBPUSD", "H1") is None
+
+
+def test_mapped_file_rolls_over_and_readers_follow(storage):
+    storage.mapped_initial_capacity = 4
+    rates = make_rates(1704067200, 40, step=60)
+    storage.append_bars("EURUSD", "M1", rates[:3])
+    assert storage.append_mapped_bars("EURUSD", "M1", rates[:6]) == 3   # seeded with the stored 3
+    
+    reader = StorageLayer()                # another process: its own reader mappings
+    first_view = reader.map_bars("EURUSD", "M1")
+    assert np.array_equal(first_view, rates[:6])
+    
+    for start in range(6, 40, 3):
+        storage.append_mapped_bars("EURUSD", "M1", rates[start:start + 3])
+        assert np.array_equal(reader.map_bars("EURUSD", "M1"), rates[:min(start + 3, 40)])
+    
+    # Several rollovers happened, only the newest generation is left and the old view still reads
+    generations = storage._mapped_generations(storage._mapped_series("EURUSD", "M1"))
+    assert len(generations) == 1 and generations[0] > 0
+    assert np.array_equal(first_view, rates[:6])
+    
+    stats = storage.get_mapped_stats()
+    assert (stats['files'], stats['stale_files'], stats['bars']) == (1, 0, 40)
+    
+    # A restarted writer continues the newest generation
+    storage.close_mapped_bars()
+    assert StorageLayer().append_mapped_bars("EURUSD", "M1", rates[35:]) == 0
+    assert np.array_equal(reader.map_bars("EURUSD", "M1"), rates)
+
+
+def test_snapshot_writer_coalesces_and_stop_writes_the_newest(tmp_path):
+    writer = SnapshotWriter(coalesce_window=0.05)
+    path = str(tmp_path / "snapshots" / "pyramid.json")
+    for version in range(20):
+        writer.submit(path, {"version": version, "generated": str(version)})
+    
+    # Join times out while the thread may still be writing - the final flush waits for it
+    writer.stop(timeout=0)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["version"] == 19
+    stats = writer.get_stats()
+    assert stats['pending'] == 0 and stats['errors'] == 0
+    assert stats['written'] < 20
+    
+    # Only the volatile build timestamp changed - nothing is rewritten
+    writer.submit(path, {"version": 19, "generated": "later"})
+    writer.flush()
+    assert writer.get_stats()['unchanged'] == 1
+    writer.stop()
+
+
+def test_alert_pages_follow_the_cursor(tmp_path):
+    store = AlertStore(str(tmp_path / "alerts.db"))
+    ids = [store.add({'symbol': 'EURUSD' if n % 3 else 'GBPUSD', 'message': f"alert {n}"})['id'] for n in range(25)]
+    assert ids == sorted(ids) and len(set(ids)) == 25
+    
+    pages = []
+    page = store.query(limit=10)
+    while True:
+        pages.append([alert['id'] for alert in page['alerts']])
+        if page['next_before'] is None:
+            break
+        # Alerts arriving mid-pagination land before the cursor and never shift later pages
+        store.add({'symbol': 'EURUSD', 'message': 'late'})
+        page = store.query(before=page['next_before'], limit=10)
+    assert [len(ids_) for ids_ in pages] == [10, 10, 5]
+    assert sum(pages, []) == ids[::-1]
+    
+    gbp = [alert['id'] for alert in store.iter_alerts(page_size=2, symbol='GBPUSD')]
+    assert gbp == [alert_id for n, alert_id in enumerate(ids) if n % 3 == 0][::-1]
+    store.close()
+
+
+def test_failed_legacy_import_is_retried(tmp_path, monkeypatch):
+    legacy = tmp_path / "alerts.json"
+    legacy.write_text(json.dumps([{'id': 7, 'symbol': 'EURUSD', 'message': 'old'}]), encoding='utf-8')
+    store = AlertStore(str(tmp_path / "alerts.db"), legacy_file=str(legacy))
+    
+    real_replace = os.replace
+    def failing_replace(src, dst):
+        raise OSError("file in use")
+    monkeypatch.setattr(storage_manager.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        store.count()
+    assert store._conn is None
+    
+    monkeypatch.setattr(storage_manager.os, 'replace', real_replace)
+    alerts = store.query()['alerts']
+    assert [(alert['legacy_id'], alert['message']) for alert in alerts] == [(7, 'old')]
+    assert not legacy.exists()
+    store.close()
+
+
+def test_bar_writer_coalesces_off_the_caller(storage):
+    writer = storage.bar_writer
+    writer.coalesce_window = 60          # nothing is written until the flush below
+    rates = make_rates(1704067200, 30)
+    writer.submit("EURUSD", "H1", rates[:20])
+    writer.submit("EURUSD", "H1", rates[15:])      # overlap - one copy of each bar lands
+    assert storage.load_bars("EURUSD", "H1", 100) is None
+    assert writer.get_stats()['pending'] == 2
+
+    writer.stop(timeout=0)
+    assert np.array_equal(storage.load_bars("EURUSD", "H1", 100), rates)
+    stats = writer.get_stats()
+    assert (stats['submitted'], stats['coalesced'], stats['appends'], stats['pending']) == (2, 1, 1, 0)
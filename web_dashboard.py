@@ -1,14 +1,39 @@
 # ===============================================================
 # WEB DASHBOARD - FLASK SERVER & API INTERFACE - DYNAMIC PERIODS
 # ===============================================================
-from flask import Flask, jsonify, render_template, send_from_directory, request
+from flask import Flask, Response, jsonify, render_template, send_from_directory, request
+from werkzeug.serving import make_server
 import threading
 import webbrowser
 import time
 import os
-from typing import Dict, Any
+import hashlib
+import json
+import queue
+import gzip
+import mimetypes
+from collections import deque, OrderedDict
+from typing import Dict, Any, Optional
 import config
 import pandas as pd
+from storage_manager import storage_layer
+from alert_engine import alert_engine
+
+# Optional: brotli compression when the package is installed, gzip otherwise
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Optional: waitress for the production serving mode
+try:
+    from waitress.server import create_server as create_waitress_server
+except ImportError:
+    create_waitress_server = None
+
+# Response types worth compressing, and the static files precompressed at startup
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/octet-stream", "application/javascript", "text/")
+PRECOMPRESS_EXTENSIONS = (".js", ".css", ".html")
 
 class WebDashboard:
     def __init__(self):
@@ -21,6 +46,31 @@ class WebDashboard:
         self.mt5_connector = None
         self.pyramid_engine = None
         self.main_launcher = None  # ADDED: Reference to main launcher
+        
+        # Server-Sent Events - per-symbol subscriber queues + replay log for Last-Event-ID
+        self.stream_lock = threading.Lock()
+        self.stream_subscribers = {}             # symbol -> set of queue.Queue
+        self.stream_history = deque(maxlen=256)  # (event_id, symbol, payload)
+        self.stream_event_id = 0
+        self.stream_heartbeat = 15               # seconds between keep-alive comments
+        self.stream_retry_ms = 3000              # client reconnect delay
+        self.stream_closed = threading.Event()
+        
+        # Response compression - compressed bytes cached per (ETag, encoding), static files precompressed
+        self.compress_min_bytes = 1024
+        self.compressed_cache = OrderedDict()
+        self.compressed_cache_size = 32
+        self.compression_stats = {'hits': 0, 'misses': 0}
+        self.compress_lock = threading.Lock()
+        self.static_assets = {}      # filename -> {mtime, mimetype, etag, identity, gzip[, br]}
+        
+        # HTTP serving - 'development' (werkzeug) or 'production' (waitress when installed)
+        self.server_mode = 'development'
+        self.server_threads = 16             # SSE streams each hold one while connected
+        self.server_connection_limit = 100
+        self.server_channel_timeout = 120    # seconds before an idle keep-alive connection is closed
+        self.server = None
+        self.server_thread = None
      
         print("Web Dashboard initialized")
 
@@ -32,6 +82,8 @@ class WebDashboard:
         self.mt5_connector = mt5_connector
         self.pyramid_engine = pyramid_engine
         self.main_launcher = main_launcher  # ADDED: Store main_launcher reference
+        # Push an SSE event whenever the engine installs new data
+        pyramid_engine.add_update_listener(self.publish_stream_event)
         print("Modules injected into Web Dashboard")
 
     # ===========================================================
@@ -45,6 +97,7 @@ class WebDashboard:
         self.app = Flask(__name__, template_folder="dashboard", static_folder="dashboard")
         self._setup_routes()
         self._create_dashboard_structure()
+        self._precompress_static_assets()
         self.setup_done = True
         print("Flask app setup complete")
 
@@ -54,11 +107,15 @@ class WebDashboard:
         # ==================== MAIN ROUTES ====================
         @self.app.route('/')
         def index():
-            return render_template('index.html')
+            return self._serve_precompressed('index.html') or render_template('index.html')
 
         @self.app.route('/<path:filename>')
         def serve_static(filename):
-            return send_from_directory('dashboard', filename)
+            return self._serve_precompressed(filename) or send_from_directory('dashboard', filename)
+
+        @self.app.after_request
+        def compress_response(response):
+            return self._compress_response(response)
 
         # ==================== API ROUTES - FIXED: SYMBOL SWITCHING ====================
         @self.app.route('/api/pyramid')
@@ -72,8 +129,22 @@ class WebDashboard:
                 # FIXED: Use multi-symbol cache instead of waiting for MT5
                 cached_pyramid = self.pyramid_engine.get_pyramid_for_symbol(pair)
                 
-                # Return cached pyramid data immediately
-                return jsonify(cached_pyramid)
+                # ?since=<version>: only blocks changed after that version, full snapshot if too far behind
+                since = request.args.get('since', type=int)
+                
+                # Return cached pyramid data immediately - 304 if the client already has this build
+                etag = self._make_etag(pair, cached_pyramid.get('generated'), since)
+                if request.if_none_match.contains_weak(etag):
+                    return self._not_modified(etag)
+                
+                if since is not None:
+                    delta = self.pyramid_engine.get_pyramid_delta(pair, since)
+                    if delta is None:
+                        delta = {**cached_pyramid, "mode": "full",
+                                 "version": self.pyramid_engine.get_data_version(pair)}
+                    return self._tag_response(jsonify(delta), etag)
+                
+                return self._tag_response(jsonify(cached_pyramid), etag)
                 
             except Exception as e:
                 return jsonify({"error": f"Pyramid API error: {str(e)}"}), 500
@@ -85,8 +156,8 @@ class WebDashboard:
                 # Get current user settings
                 pair = request.args.get('pair', 'EUR/USD').replace('/', '')
                 
-                # FIXED: Use cached data from pyramid engine multi-symbol cache
-                cached_raw_data = self.pyramid_engine.get_raw_data_for_symbol(pair)
+                # Bar rings from the multi-symbol cache - chart payloads read their shared snapshots
+                cached_raw_data = self.pyramid_engine.get_bar_series(pair)
                 
                 if not cached_raw_data:
                     return jsonify({"error": "No chart data available yet - please wait for initial load"}), 404
@@ -96,36 +167,78 @@ class WebDashboard:
                 
                 # FIXED: Extract user periods from request
                 custom_periods = self._extract_custom_periods(request)
+                
+                # Opt-in payloads: columnar JSON (shared time array + flat value arrays) or raw binary buffers
+                output_format = request.args.get('format', 'points')
+                if output_format not in ("columnar", "binary"):
+                    output_format = "points"
+                
+                # Payload changes with installs and with every in-place write to the series
+                etag = self._make_etag(pair, timeframe, self.pyramid_engine.get_data_version(pair),
+                                       self.pyramid_engine.get_series_revision(cached_raw_data[timeframe]),
+                                       self.pyramid_engine._normalize_periods(custom_periods), output_format)
+                if request.if_none_match.contains_weak(etag):
+                    return self._not_modified(etag)
              
-                chart_data = self.pyramid_engine.get_chart_data(
+                # Indicator values + chart series with DYNAMIC periods - cached until the series changes
+                real_indicator_values, indicators_data = self.pyramid_engine.get_indicator_results(
+                    pair,
                     cached_raw_data,
-                    timeframe
+                    timeframe,
+                    custom_periods,
+                    output_format
                 )
+                
+                if output_format == "binary":
+                    payload = self.pyramid_engine.get_binary_chart_data(
+                        cached_raw_data,
+                        timeframe,
+                        indicators_data,
+                        {"symbol": pair, "timeframe": timeframe, "indicators": real_indicator_values}
+                    )
+                    return self._tag_response(Response(payload, mimetype="application/octet-stream"), etag)
+                
+                if output_format == "columnar":
+                    columnar = self.pyramid_engine.get_columnar_chart_data(cached_raw_data, timeframe)
+                    return self._tag_response(jsonify({
+                        "symbol": pair,
+                        "timeframe": timeframe,
+                        "format": "columnar",
+                        "time": columnar["time"],
+                        "columns": columnar["columns"],
+                        "total_candles": len(columnar["time"]),
+                        "indicators": real_indicator_values,
+                        "indicators_data": indicators_data
+                    }), etag)
              
-                # FIXED: Calculate indicators with DYNAMIC periods
-                df_with_indicators = self.pyramid_engine.calculate_technical_indicators(
-                    cached_raw_data[timeframe].copy(),
-                    custom_periods
+                chart_data = self.pyramid_engine.get_chart_data(
+                    cached_raw_data,
+                    timeframe
                 )
 
-                # FIXED: Get REAL indicator values with dynamic periods
-                real_indicator_values = self.pyramid_engine.get_current_indicator_values(df_with_indicators)
-                
-                # FIXED: Format indicator data for chart with dynamic periods
-                indicators_data = self.pyramid_engine.get_indicator_chart_data(df_with_indicators, timeframe)
-
-                return jsonify({
+                return self._tag_response(jsonify({
                     "symbol": pair,
                     "timeframe": timeframe,
                     "data": chart_data,
                     "total_candles": len(chart_data),
                     "indicators": real_indicator_values,  # FIXED: Dynamic period values
                     "indicators_data": indicators_data    # FIXED: Dynamic period chart data
-                })
+                }), etag)
              
             except Exception as e:
                 return jsonify({"error": f"Chart error: {str(e)}"}), 500
 
+        @self.app.route('/api/stream')
+        def api_stream():
+            """Server-Sent Events: one 'update' event per data install for the pair"""
+            pair = request.args.get('pair', 'EUR/USD').replace('/', '')
+            last_event_id = request.headers.get('Last-Event-ID', type=int)
+            return Response(
+                self._stream_events(pair, last_event_id),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
         @self.app.route('/api/analysis')
         def api_analysis():
             """Get technical analysis and signals"""
@@ -146,28 +259,86 @@ class WebDashboard:
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
 
+        @self.app.route('/api/symbols')
+        def api_symbols():
+            """Prefix search over broker symbols"""
+            query = request.args.get('q', '')
+            try:
+                limit = min(max(int(request.args.get('limit', 20)), 1), 200)
+            except ValueError:
+                limit = 20
+            if not self.mt5_connector:
+                return jsonify({"query": query, "symbols": []})
+            return jsonify({
+                "query": query,
+                "symbols": self.mt5_connector.search_symbols(query, limit),
+                "total_available": len(self.mt5_connector.available_symbols)
+            })
+
         @self.app.route('/api/alerts')
         def api_alerts():
-            """Get alert settings and active alerts"""
+            """Paginated alerts, newest first - pair, status, since, until, before (cursor), limit"""
+            pair = request.args.get('pair', '').replace('/', '') or None
+            status = request.args.get('status') or None
+            try:
+                limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+                page = storage_layer.query_alerts(
+                    symbol=pair, status=status,
+                    since=request.args.get('since'), until=request.args.get('until'),
+                    before=request.args.get('before', type=int), limit=limit)
+            except ValueError as e:
+                return jsonify({"error": f"Invalid alert query: {e}"}), 400
             return jsonify({
-                "active_alerts": [],
-                "settings": {
-                    "rsi_alerts": True,
-                    "price_alerts": False,
-                    "volume_alerts": True
-                }
+                "alerts": page['alerts'],
+                "next_before": page['next_before'],
+                "recent_triggered": alert_engine.get_recent(),
+                "settings": alert_engine.get_settings()
             })
 
+        @self.app.route('/api/alerts', methods=['POST'])
+        def api_create_alert():
+            """Arm a price ({type: price, level, direction}) or indicator
+            ({type: indicator, timeframe, indicator, operator, value}) alert"""
+            spec = request.get_json(silent=True) or {}
+            if 'pair' in spec and 'symbol' not in spec:
+                spec['symbol'] = spec.pop('pair')
+            try:
+                return jsonify(alert_engine.add_alert(spec)), 201
+            except (ValueError, TypeError) as e:
+                return jsonify({"error": f"Invalid alert: {e}"}), 400
+
+        @self.app.route('/api/alerts/<int:alert_id>', methods=['DELETE'])
+        def api_dismiss_alert(alert_id):
+            """Dismiss an active alert - it stops being evaluated"""
+            try:
+                alert_engine.dismiss(alert_id)
+            except KeyError:
+                return jsonify({"error": f"Unknown alert {alert_id}"}), 404
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 409
+            return jsonify({"id": alert_id, "status": "dismissed"})
+
         @self.app.route('/api/health')
         def api_health():
             """Health check endpoint"""
             mt5_health = self.mt5_connector.health_check() if self.mt5_connector else {}
+            system_status = self.main_launcher.get_system_status() if self.main_launcher else {}
             return jsonify({
                 "status": "healthy",
                 "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
                 "symbol": self.mt5_connector.symbol if self.mt5_connector else "Unknown",
                 "pyramid_structure": self.pyramid_engine.pyramid_structure if self.pyramid_engine else [],
                 "cached_symbols": self.pyramid_engine.get_cached_symbols() if self.pyramid_engine else [],  # NEW: Show cached symbols
+                "symbol_cache": self.pyramid_engine.get_symbol_cache_stats() if self.pyramid_engine else {},
+                "indicator_cache": self.pyramid_engine.get_indicator_cache_stats() if self.pyramid_engine else {},
+                "indicator_engine": self.pyramid_engine.get_live_indicator_stats() if self.pyramid_engine else {},
+                "stream": self.get_stream_stats(),
+                "compression": self.get_compression_stats(),
+                "scheduler": system_status.get('scheduler', {}),
+                "bar_history": system_status.get('bar_history', {}),
+                "snapshots": system_status.get('snapshots', {}),
+                "alerts": system_status.get('alerts', {}),
+                "alert_engine": system_status.get('alert_engine', {}),
                 "mt5": mt5_health
             })
 
@@ -198,43 +369,12 @@ class WebDashboard:
                     utc_offset=settings.get('utc_offset', 0)
                 )
                 
-                # FIXED: Update main_launcher symbol if available
+                # Switch through the collector - it fetches and builds under its own locks and the
+                # MT5 call limit, right away instead of on its next forming poll
                 if self.main_launcher:
-                    self.main_launcher.symbol = self.mt5_connector.symbol
-                    print(f"🔄 Main launcher symbol updated to: {self.main_launcher.symbol}")
-                
-                # FIXED: Trigger immediate data fetch for new symbol
-                try:
-                    print(f"🚀 Immediate fetch triggered for: {self.mt5_connector.symbol}")
-                    raw_data = self.mt5_connector.fetch_all_timeframes(self.mt5_connector.symbol)
-                    
-                    if raw_data:
-                        # Process data through pyramid engine
-                        pyramid_data = {}
-                        for tf in raw_data:
-                            if not raw_data[tf].empty:
-                                pyramid_data[tf] = self.pyramid_engine.calculate_momentum_analysis(raw_data[tf])
-                        
-                        # Build pyramid JSON
-                        pyramid_json = self.pyramid_engine.build_pyramid_json(pyramid_data)
-                        
-                        # Save to storage
-                        self.pyramid_engine.save_to_json(pyramid_json)
-                        
-                        # FIXED: Update multi-symbol cache with new data
-                        self.pyramid_engine.update_symbol_data(
-                            self.mt5_connector.symbol, 
-                            raw_data, 
-                            pyramid_json
-                        )
-                        
-                        print(f"✅ Immediate fetch completed: {len(pyramid_json.get('blocks', []))} blocks, {len(raw_data)} TFs")
-                    else:
-                        print("❌ Immediate fetch failed - no data returned")
-                        
-                except Exception as fetch_error:
-                    print(f"⚠️ Immediate fetch failed: {fetch_error}")
-                    return jsonify({"error": f"Fetch failed: {str(fetch_error)}"}), 500
+                    if self.pyramid_engine.has_warm_data(self.mt5_connector.symbol):
+                        print(f"⚡ {self.mt5_connector.symbol} already warm - served from cache until the collector publishes")
+                    self.main_launcher.switch_symbol(self.mt5_connector.symbol)
                 
                 return jsonify({
                     "status": "success",
@@ -245,6 +385,220 @@ class WebDashboard:
             except Exception as e:
                 return jsonify({"error": f"Settings update failed: {str(e)}"}), 500
 
+    # ==================== SERVER-SENT EVENTS ====================
+    def publish_stream_event(self, symbol: str, version: int, pyramid_data: Dict[str, Any]):
+        """Queue a compact update event for every stream subscribed to the symbol"""
+        event = {
+            "symbol": symbol,
+            "version": version,
+            "generated": pyramid_data.get('generated'),
+            "blocks": len(pyramid_data.get('blocks', []))
+        }
+        # Clients on the previous version apply this directly instead of refetching
+        delta = self.pyramid_engine.get_pyramid_delta(symbol, version - 1)
+        if delta is not None:
+            event["delta"] = delta
+        payload = json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+        
+        with self.stream_lock:
+            self.stream_event_id += 1
+            event = (self.stream_event_id, symbol, payload)
+            self.stream_history.append(event)
+            subscribers = list(self.stream_subscribers.get(symbol, ()))
+        
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass  # Slow client - events only signal "refetch", dropping one is harmless
+
+    def _stream_events(self, symbol: str, last_event_id: Optional[int]):
+        """SSE generator: replay missed events, then push live ones with heartbeats"""
+        subscriber = queue.Queue(maxsize=64)
+        with self.stream_lock:
+            self.stream_subscribers.setdefault(symbol, set()).add(subscriber)
+            # Registered under the same lock as publishing - nothing falls between replay and live
+            missed = [event for event in self.stream_history
+                      if last_event_id is not None and event[0] > last_event_id and event[1] == symbol]
+        
+        try:
+            yield f"retry: {self.stream_retry_ms}\n\n"
+            for event in missed:
+                yield self._format_stream_event(event)
+            
+            while not self.stream_closed.is_set():
+                try:
+                    event = subscriber.get(timeout=self.stream_heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is None:  # Shutdown
+                    break
+                yield self._format_stream_event(event)
+        finally:
+            with self.stream_lock:
+                subscribers = self.stream_subscribers.get(symbol)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self.stream_subscribers[symbol]
+
+    def _format_stream_event(self, event: tuple) -> str:
+        """SSE wire format for one (event_id, symbol, payload) entry"""
+        event_id, _, payload = event
+        return f"id: {event_id}\nevent: update\ndata: {payload}\n\n"
+
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """Open SSE connections per symbol"""
+        with self.stream_lock:
+            return {
+                'subscribers': {symbol: len(subs) for symbol, subs in self.stream_subscribers.items()},
+                'last_event_id': self.stream_event_id
+            }
+
+    # ==================== CONDITIONAL GET (ETag / 304) ====================
+    def _make_etag(self, *parts) -> str:
+        """Stable ETag value for one payload version"""
+        return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+
+    def _not_modified(self, etag: str) -> Response:
+        """Empty 304 for a client that already holds this version"""
+        return self._tag_response(Response(status=304), etag)
+
+    def _tag_response(self, response: Response, etag: str) -> Response:
+        """Attach the ETag - no-cache makes browsers revalidate instead of reusing silently"""
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    # ==================== RESPONSE COMPRESSION ====================
+    def _negotiate_encoding(self) -> Optional[str]:
+        """Best encoding the client accepts - brotli when installed, then gzip"""
+        if brotli is not None and request.accept_encodings['br']:
+            return 'br'
+        if request.accept_encodings['gzip']:
+            return 'gzip'
+        return None
+
+    def _compress(self, data: bytes, encoding: str, best: bool = False) -> bytes:
+        """Compress - moderate levels per payload, maximum for one-off static assets"""
+        if encoding == 'br':
+            return brotli.compress(data, quality=11 if best else 5)
+        return gzip.compress(data, compresslevel=9 if best else 6)
+
+    def _compress_response(self, response: Response) -> Response:
+        """Encode API payloads above the size threshold - once per ETag, not once per client"""
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or not (response.mimetype or '').startswith(COMPRESSIBLE_MIMETYPES)):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        encoding = self._negotiate_encoding()
+        data = response.get_data()
+        if encoding is None or len(data) < self.compress_min_bytes:
+            return response
+        
+        etag, _ = response.get_etag()
+        key = (etag, encoding) if etag else None
+        compressed = None
+        if key:
+            with self.compress_lock:
+                compressed = self.compressed_cache.get(key)
+                if compressed is not None:
+                    self.compressed_cache.move_to_end(key)
+                    self.compression_stats['hits'] += 1
+        
+        if compressed is None:
+            compressed = self._compress(data, encoding)
+            if key:
+                with self.compress_lock:
+                    self.compression_stats['misses'] += 1
+                    self.compressed_cache[key] = compressed
+                    while len(self.compressed_cache) > self.compressed_cache_size:
+                        self.compressed_cache.popitem(last=False)
+        
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # Encoded bytes differ from the identity body - weak validator per RFC 9110
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _precompress_static_assets(self):
+        """Compress dashboard JS/CSS/HTML once at startup"""
+        if not os.path.isdir(self.app.static_folder):
+            return
+        for filename in os.listdir(self.app.static_folder):
+            if filename.endswith(PRECOMPRESS_EXTENSIONS):
+                self._precompress_asset(filename)
+        print(f"Precompressed {len(self.static_assets)} static assets ({'br+gzip' if brotli else 'gzip'})")
+
+    def _precompress_asset(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Identity + compressed bodies for one static file (index.html as rendered)"""
+        # Same directory send_from_directory/render_template resolve against
+        path = os.path.join(self.app.static_folder, filename)
+        try:
+            mtime = os.path.getmtime(path)
+            if filename == 'index.html':
+                with self.app.app_context():
+                    body = render_template('index.html').encode('utf-8')
+            else:
+                with open(path, 'rb') as f:
+                    body = f.read()
+        except Exception as e:
+            print(f"Precompress skipped for {filename}: {e}")
+            self.static_assets.pop(filename, None)
+            return None
+        
+        asset = {
+            'mtime': mtime,
+            'mimetype': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            'etag': hashlib.sha1(body).hexdigest()[:20],
+            'identity': body,
+            'gzip': self._compress(body, 'gzip', best=True)
+        }
+        if brotli is not None:
+            asset['br'] = self._compress(body, 'br', best=True)
+        self.static_assets[filename] = asset
+        return asset
+
+    def _serve_precompressed(self, filename: str) -> Optional[Response]:
+        """Precompressed static response - None for files that were not precompressed"""
+        asset = self.static_assets.get(filename)
+        if asset is None:
+            return None
+        
+        # Edited on disk since startup - compress the new version once
+        try:
+            if os.path.getmtime(os.path.join(self.app.static_folder, filename)) != asset['mtime']:
+                asset = self._precompress_asset(filename)
+        except OSError:
+            return None
+        if asset is None:
+            return None
+        
+        if request.if_none_match.contains_weak(asset['etag']):
+            response = Response(status=304)
+        else:
+            encoding = self._negotiate_encoding()
+            response = Response(asset[encoding] if encoding else asset['identity'], mimetype=asset['mimetype'])
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(asset['etag'], weak=True)
+        return response
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """Compression cache counters"""
+        with self.compress_lock:
+            return {
+                'encodings': ['br', 'gzip'] if brotli is not None else ['gzip'],
+                'cached_payloads': len(self.compressed_cache),
+                'static_assets': len(self.static_assets),
+                **self.compression_stats
+            }
+
     # ==================== FIXED: DYNAMIC PERIODS EXTRACTION ====================
     def _extract_custom_periods(self, request):
         """Extract custom indicator periods from request parameters"""
@@ -304,21 +658,77 @@ class WebDashboard:
     # ===========================================================
     # SERVER CONTROL
     # ===========================================================
+    def configure_server(self, settings: Dict[str, Any]):
+        """Apply serving settings: server_mode, server_threads, server_connection_limit"""
+        self.server_mode = settings.get('server_mode', 'development')
+        self.server_threads = max(1, int(settings.get('server_threads', self.server_threads)))
+        self.server_connection_limit = max(1, int(settings.get('server_connection_limit', self.server_connection_limit)))
+        self.server_channel_timeout = int(settings.get('server_channel_timeout', self.server_channel_timeout))
+
     def start_flask_server(self):
-        """Start Flask server in a separate thread"""
-        def run_flask():
-            print(f"Starting Flask server on port {self.dashboard_port}...")
-            self.app.run(
+        """Start the HTTP server in a separate thread.
+
+        production: waitress with a fixed worker pool, connection limit and idle timeout.
+        development: werkzeug's threaded server (what app.run uses), kept as a handle for shutdown.
+        Compare the two by hammering /api/pyramid and /api/chart-data/H1 from concurrent
+        keep-alive clients against a warm cache while the collector runs.
+        """
+        if self.server_mode == 'production' and create_waitress_server is None:
+            print("waitress not installed - falling back to the development server")
+        
+        if self.server_mode == 'production' and create_waitress_server is not None:
+            self.server = create_waitress_server(
+                self.app,
                 host='127.0.0.1',
                 port=self.dashboard_port,
-                use_reloader=False,
-                debug=False
+                threads=self.server_threads,
+                connection_limit=self.server_connection_limit,
+                channel_timeout=self.server_channel_timeout
             )
+            serve = self.server.run
+            label = f"waitress ({self.server_threads} threads, {self.server_connection_limit} connections)"
+        else:
+            self.server = make_server('127.0.0.1', self.dashboard_port, self.app, threaded=True)
+            serve = self.server.serve_forever
+            label = "development server"
+        
+        def run_flask():
+            print(f"Starting {label} on port {self.dashboard_port}...")
+            serve()
      
-        flask_thread = threading.Thread(target=run_flask, daemon=True)
-        flask_thread.start()
+        self.server_thread = threading.Thread(target=run_flask, daemon=True)
+        self.server_thread.start()
         print(f"Flask server thread started")
 
+    def stop_flask_server(self):
+        """Stop accepting requests, close open connections and wait for the server thread"""
+        if self.server is None:
+            return
+        
+        try:
+            if hasattr(self.server, 'shutdown'):
+                # werkzeug: stop serve_forever, then release the socket
+                self.server.shutdown()
+                self.server.server_close()
+            else:
+                # waitress: close() is the only public stop and just releases the listener.
+                # The open channels (_map) and the worker pool (task_dispatcher) are
+                # internals, checked against waitress 3.0.2 - skipped if they move
+                self.server.close()
+                channels = getattr(self.server, '_map', None)
+                for channel in list(channels.values()) if isinstance(channels, dict) else []:
+                    channel.handle_close()
+                dispatcher = getattr(self.server, 'task_dispatcher', None)
+                if dispatcher is not None and hasattr(dispatcher, 'shutdown'):
+                    dispatcher.shutdown()
+        except Exception as e:
+            print(f"Server shutdown warning: {e}")
+        
+        if self.server_thread is not None:
+            self.server_thread.join(timeout=5)
+        self.server = None
+        print("Flask server stopped")
+
     def open_browser(self):
         """Open web browser to dashboard"""
         time.sleep(3) # Give server time to start
@@ -360,6 +770,16 @@ class WebDashboard:
     def cleanup(self):
         """Cleanup dashboard resources"""
         print("Cleaning up dashboard resources...")
+        
+        # Wake every SSE generator so its connection closes
+        self.stream_closed.set()
+        with self.stream_lock:
+            subscribers = [sub for subs in self.stream_subscribers.values() for sub in subs]
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(None)
+            except queue.Full:
+                pass
 
 # Singleton instance
 web_dashboard = WebDashboard()
\ No newline at end of file